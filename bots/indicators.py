@@ -1,19 +1,332 @@
 # bots/indicators.py
 import pandas as pd
-from ta.momentum import RSIIndicator, WilliamsRIndicator, ROCIndicator, StochasticOscillator
-from ta.trend import CCIIndicator, ADXIndicator, MACD, SMAIndicator, EMAIndicator, IchimokuIndicator
+from ta.momentum import WilliamsRIndicator, ROCIndicator
+from ta.trend import CCIIndicator, ADXIndicator, SMAIndicator, IchimokuIndicator
 from ta.volatility import AverageTrueRange, BollingerBands
 from ta.volume import MFIIndicator, ChaikinMoneyFlowIndicator
 from django.core.cache import cache
 from django.conf import settings
+import hashlib
 import logging
 import statistics
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba не обязательна: без неё циклы ниже выполняются как обычный Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import talib
+except ImportError:
+    # TA-Lib не обязательна: без неё ADX, ATR, CCI и MFI считаются через ta/pandas
+    talib = None
 
 logger = logging.getLogger(__name__)
 
 # Настраиваемый таймаут кэширования для индикаторов
 INDICATOR_CACHE_TIMEOUT = getattr(settings, 'INDICATOR_CACHE_TIMEOUT', 300)
 
+# Время жизни состояния потоковых индикаторов (RSI, ATR) между тиками
+INDICATOR_STATE_TIMEOUT = getattr(settings, 'INDICATOR_STATE_TIMEOUT', 86400)
+
+# TA-Lib сглаживает первые значения иначе, чем ta, поэтому на коротких рядах результаты
+# немного расходятся; INDICATORS_USE_TALIB = False возвращает расчёт через ta.
+USE_TALIB = talib is not None and getattr(settings, 'INDICATORS_USE_TALIB', True)
+
+@njit(cache=True)
+def _ema_loop(values, alpha, min_periods):
+    """
+    Экспоненциальное сглаживание, совпадающее с pandas ewm(alpha=alpha, adjust=False, min_periods=min_periods).
+
+    Args:
+        values (np.ndarray): Ряд значений float64 (ведущие NaN пропускаются).
+        alpha (float): Коэффициент сглаживания.
+        min_periods (int): Минимальное число наблюдений для значения.
+
+    Returns:
+        np.ndarray: Сглаженный ряд, NaN до накопления min_periods наблюдений.
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 1 if weighted == weighted else 0
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = values[i]
+        is_obs = cur == cur
+        if is_obs:
+            nobs += 1
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+@njit(cache=True)
+def _rsi_loop(close, period):
+    """
+    Рассчитывает ряд RSI со сглаживанием Уайлдера (как ta.momentum.RSIIndicator).
+
+    Args:
+        close (np.ndarray): Цены закрытия float64.
+        period (int): Период RSI.
+
+    Returns:
+        np.ndarray: Ряд RSI.
+    """
+    n = close.shape[0]
+    up = np.zeros(n)
+    down = np.zeros(n)
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+    alpha = 1.0 / period
+    ema_up = _ema_loop(up, alpha, period)
+    ema_down = _ema_loop(down, alpha, period)
+    out = np.empty(n)
+    for i in range(n):
+        if ema_down[i] == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + ema_up[i] / ema_down[i])
+    return out
+
+@njit(cache=True)
+def _stoch_loop(high, low, close, window):
+    """
+    Рассчитывает ряд %K стохастического осциллятора (как ta.momentum.StochasticOscillator).
+
+    Args:
+        high (np.ndarray): Максимальные цены float64.
+        low (np.ndarray): Минимальные цены float64.
+        close (np.ndarray): Цены закрытия float64.
+        window (int): Период %K.
+
+    Returns:
+        np.ndarray: Ряд %K, NaN для первых window - 1 свечей.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        lowest = low[i]
+        highest = high[i]
+        for j in range(i - window + 1, i):
+            if low[j] < lowest:
+                lowest = low[j]
+            if high[j] > highest:
+                highest = high[j]
+        if highest > lowest:
+            out[i] = 100.0 * (close[i] - lowest) / (highest - lowest)
+    return out
+
+@njit(cache=True)
+def _atr_loop(high, low, close, period):
+    """
+    Рассчитывает ряд ATR со сглаживанием Уайлдера (как ta.volatility.AverageTrueRange).
+
+    Args:
+        high (np.ndarray): Максимальные цены float64.
+        low (np.ndarray): Минимальные цены float64.
+        close (np.ndarray): Цены закрытия float64.
+        period (int): Период ATR.
+
+    Returns:
+        np.ndarray: Ряд ATR, нули для первых period - 1 свечей.
+    """
+    n = close.shape[0]
+    tr = np.empty(n)
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    out = np.zeros(n)
+    out[period - 1] = tr[:period].mean()
+    for i in range(period, n):
+        out[i] = (out[i - 1] * (period - 1) + tr[i]) / period
+    return out
+
+def _as_array(values):
+    """
+    Приводит ряд (кортеж, список или ndarray) к непрерывному массиву float64.
+
+    Args:
+        values (Sequence[float] | np.ndarray): Ряд значений.
+
+    Returns:
+        np.ndarray: Массив float64.
+    """
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+def _talib_last(series):
+    """
+    Возвращает последнее значение ряда TA-Lib.
+
+    Args:
+        series (np.ndarray): Ряд, рассчитанный функцией TA-Lib.
+
+    Returns:
+        float: Последнее значение или None, если ряд пуст или значение ещё не определено (NaN).
+    """
+    if not series.size or np.isnan(series[-1]):
+        return None
+    return float(series[-1])
+
+def _series_hash(arr):
+    """
+    Хэш содержимого массива для ключа кэша.
+
+    Используется blake2b, а не встроенный hash(): он не зависит от PYTHONHASHSEED,
+    поэтому ключи совпадают во всех воркерах, разделяющих кэш.
+
+    Args:
+        arr (np.ndarray): Массив float64.
+
+    Returns:
+        str: Hex-дайджест байтового представления массива.
+    """
+    return hashlib.blake2b(arr.tobytes(), digest_size=16).hexdigest()
+
+def _indicator_cache_key(name, series, params, cache_token=None):
+    """
+    Формирует ключ кэша индикатора.
+
+    Args:
+        name (str): Имя индикатора.
+        series (tuple): Ряды входных данных (используются, если cache_token не передан).
+        params (tuple): Параметры расчета.
+        cache_token (str, optional): Ключ набора свечей (биржа, пара, интервал, последняя свеча).
+
+    Returns:
+        str: Ключ кэша.
+    """
+    if cache_token is not None:
+        base = cache_token
+    else:
+        base = '_'.join(str(_series_hash(_as_array(values))) for values in series)
+    return f"{name}_{base}_{'_'.join(str(param) for param in params)}"
+
+class RollingContext:
+    """
+    Общие скользящие окна по рядам свечей: средние, стандартные отклонения и экстремумы.
+
+    Окна строятся через sliding_window_view (без копирования данных) и запоминаются,
+    поэтому Bollinger, Stochastic, MA Crossover и Volume Spike одной итерации
+    используют один проход по рядам вместо отдельного для каждого индикатора.
+    Каждый метод возвращает значения только для полных окон: элемент [-1]
+    относится к последней свече, [-2] — к предыдущей. При нехватке данных
+    возвращается пустой массив.
+    """
+
+    def __init__(self, close, high=None, low=None, volume=None):
+        """
+        Args:
+            close (Sequence[float] | np.ndarray): Цены закрытия.
+            high (Sequence[float] | np.ndarray, optional): Максимальные цены.
+            low (Sequence[float] | np.ndarray, optional): Минимальные цены.
+            volume (Sequence[float] | np.ndarray, optional): Объемы.
+        """
+        self._series = {'close': _as_array(close)}
+        for field, values in (('high', high), ('low', low), ('volume', volume)):
+            if values is not None:
+                self._series[field] = _as_array(values)
+        self._memo = {}
+
+    def _rolling(self, func, field, window):
+        """
+        Считает и запоминает скользящую агрегацию.
+
+        Args:
+            func (str): Агрегация ('mean', 'std', 'max' или 'min').
+            field (str): Имя ряда.
+            window (int): Размер окна.
+
+        Returns:
+            np.ndarray: Значения по полным окнам или пустой массив, если данных меньше окна.
+        """
+        key = (func, field, window)
+        result = self._memo.get(key)
+        if result is None:
+            values = self._series[field]
+            if len(values) < window:
+                result = np.empty(0)
+            else:
+                windows = np.lib.stride_tricks.sliding_window_view(values, window)
+                if func == 'mean':
+                    result = windows.mean(axis=1)
+                elif func == 'std':
+                    # ddof=0, как в ta.volatility.BollingerBands
+                    result = windows.std(axis=1)
+                elif func == 'max':
+                    result = windows.max(axis=1)
+                else:
+                    result = windows.min(axis=1)
+            self._memo[key] = result
+        return result
+
+    def sma(self, window, field='close'):
+        """
+        Скользящее среднее.
+
+        Args:
+            window (int): Размер окна.
+            field (str): Ряд ('close', 'high', 'low' или 'volume').
+
+        Returns:
+            np.ndarray: Средние по полным окнам.
+        """
+        return self._rolling('mean', field, window)
+
+    def std(self, window, field='close'):
+        """
+        Скользящее стандартное отклонение (ddof=0).
+
+        Args:
+            window (int): Размер окна.
+            field (str): Ряд ('close', 'high', 'low' или 'volume').
+
+        Returns:
+            np.ndarray: Стандартные отклонения по полным окнам.
+        """
+        return self._rolling('std', field, window)
+
+    def max_high(self, window):
+        """
+        Скользящий максимум цен high.
+
+        Args:
+            window (int): Размер окна.
+
+        Returns:
+            np.ndarray: Максимумы по полным окнам.
+        """
+        return self._rolling('max', 'high', window)
+
+    def min_low(self, window):
+        """
+        Скользящий минимум цен low.
+
+        Args:
+            window (int): Размер окна.
+
+        Returns:
+            np.ndarray: Минимумы по полным окнам.
+        """
+        return self._rolling('min', 'low', window)
+
 def prepare_dataframe(high=None, low=None, close=None, volume=None):
     """
     Создает DataFrame из предоставленных данных.
@@ -44,55 +357,119 @@ def prepare_dataframe(high=None, low=None, close=None, volume=None):
         raise ValueError("Не предоставлены данные для создания DataFrame")
     return pd.DataFrame(data)
 
-def calculate_rsi(prices_tuple, period=14):
+def calculate_rsi(prices_tuple, period=14, cache_token=None):
     """
     Рассчитывает индекс относительной силы (RSI) на основе цен закрытия.
 
     Args:
-        prices_tuple (tuple): Кортеж цен закрытия (для кэширования).
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета RSI (по умолчанию 14).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение RSI для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"rsi_{hash(prices_tuple)}_{period}"
+    prices = _as_array(prices_tuple)
+    cache_key = _indicator_cache_key("rsi", (prices,), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"RSI извлечен из кэша: {result}")
+        logger.debug("RSI извлечен из кэша: %s", result)
         return result
 
-    prices = list(prices_tuple)
-    if not prices or len(prices) < period:
+    if not prices.size or len(prices) < period:
         logger.warning(f"Недостаточно данных для расчета RSI: требуется минимум {period} значений, получено {len(prices)}")
         return None
     try:
-        df = prepare_dataframe(close=prices)
-        rsi = RSIIndicator(df['close'], window=period).rsi()
-        result = rsi.iloc[-1] if not rsi.empty else None
+        result = _rsi_loop(prices, period)[-1]
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"RSI рассчитан: {result}")
+        logger.debug("RSI рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете RSI: {str(e)}")
         return None
 
-def calculate_cci(high_tuple, low_tuple, close_tuple, period=20):
+def _streaming_ready(timestamps, min_length):
+    """
+    Проверяет, можно ли обновлять индикатор потоково: ряд идёт от старых свечей к новым
+    и содержит текущую свечу, хотя бы одну закрытую перед ней и min_length свечей всего.
+
+    Args:
+        timestamps (np.ndarray): Время открытия свечей.
+        min_length (int): Минимальная длина ряда.
+
+    Returns:
+        bool: True, если потоковое обновление применимо.
+    """
+    return len(timestamps) >= max(min_length, 3) and timestamps[-1] > timestamps[-2] > timestamps[-3]
+
+def calculate_rsi_last(prices_tuple, timestamps, period=14, state_key=None, cache_token=None):
+    """
+    Рассчитывает RSI последней свечи с потоковым обновлением сглаживания Уайлдера.
+
+    Средние роста и падения по закрытым свечам хранятся в кэше вместе с временем последней
+    закрытой свечи. Пока закрытые свечи не меняются, считается только шаг для текущей свечи;
+    после закрытия одной свечи состояние продвигается на шаг, в остальных случаях
+    ряд пересчитывается полностью и состояние создаётся заново.
+
+    Args:
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        timestamps (np.ndarray): Время открытия свечей.
+        period (int): Период для расчета RSI (по умолчанию 14).
+        state_key (str, optional): Ключ ряда свечей (биржа, пара, интервал); без него RSI считается по всему ряду.
+        cache_token (str, optional): Ключ набора свечей для кэша при расчёте по всему ряду.
+
+    Returns:
+        float: Значение RSI для последней свечи, или None, если данных недостаточно.
+    """
+    prices = _as_array(prices_tuple)
+    timestamps = np.asarray(timestamps)
+    if state_key is None or not _streaming_ready(timestamps, period + 2) or len(prices) != len(timestamps):
+        return calculate_rsi(prices, period, cache_token)
+    state_cache_key = f"rsi_state_{state_key}_{period}"
+    state = cache.get(state_cache_key)
+    closed_ts = int(timestamps[-2])
+    if state is None or state['ts'] != closed_ts:
+        if state is not None and state['ts'] == int(timestamps[-3]):
+            diff = prices[-2] - state['close']
+            avg_gain = state['avg_gain'] + (max(diff, 0.0) - state['avg_gain']) / period
+            avg_loss = state['avg_loss'] + (max(-diff, 0.0) - state['avg_loss']) / period
+        else:
+            closed = prices[:-1]
+            diff = np.diff(closed, prepend=closed[0])
+            alpha = 1.0 / period
+            avg_gain = _ema_loop(np.maximum(diff, 0.0), alpha, period)[-1]
+            avg_loss = _ema_loop(np.maximum(-diff, 0.0), alpha, period)[-1]
+            if np.isnan(avg_gain) or np.isnan(avg_loss):
+                return calculate_rsi(prices, period, cache_token)
+        state = {'ts': closed_ts, 'close': float(prices[-2]), 'avg_gain': float(avg_gain), 'avg_loss': float(avg_loss)}
+        cache.set(state_cache_key, state, timeout=INDICATOR_STATE_TIMEOUT)
+        logger.debug("Состояние RSI обновлено: %s", state)
+
+    diff = prices[-1] - state['close']
+    avg_gain = state['avg_gain'] + (max(diff, 0.0) - state['avg_gain']) / period
+    avg_loss = state['avg_loss'] + (max(-diff, 0.0) - state['avg_loss']) / period
+    result = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    logger.debug("RSI (потоковый) рассчитан: %s", result)
+    return result
+
+def calculate_cci(high_tuple, low_tuple, close_tuple, period=20, cache_token=None):
     """
     Рассчитывает индекс товарного канала (CCI).
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета CCI (по умолчанию 20).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение CCI для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"cci_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{period}"
+    cache_key = _indicator_cache_key("cci", (high_tuple, low_tuple, close_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"CCI извлечен из кэша: {result}")
+        logger.debug("CCI извлечен из кэша: %s", result)
         return result
 
     high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -100,34 +477,39 @@ def calculate_cci(high_tuple, low_tuple, close_tuple, period=20):
         logger.warning(f"Недостаточно данных для расчета CCI: требуется минимум {period} значений, получено {len(high)}")
         return None
     try:
-        df = prepare_dataframe(high=high, low=low, close=close)
-        cci = CCIIndicator(df['high'], df['low'], df['close'], window=period).cci()
-        result = cci.iloc[-1] if not cci.empty else None
+        result = None
+        if USE_TALIB:
+            result = _talib_last(talib.CCI(_as_array(high), _as_array(low), _as_array(close), timeperiod=period))
+        if result is None:
+            df = prepare_dataframe(high=high, low=low, close=close)
+            cci = CCIIndicator(df['high'], df['low'], df['close'], window=period).cci()
+            result = cci.iloc[-1] if not cci.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"CCI рассчитан: {result}")
+        logger.debug("CCI рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете CCI: {str(e)}")
         return None
 
-def calculate_mfi(high_tuple, low_tuple, close_tuple, volume_tuple, period=14):
+def calculate_mfi(high_tuple, low_tuple, close_tuple, volume_tuple, period=14, cache_token=None):
     """
     Рассчитывает индекс денежного потока (MFI).
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
-        volume_tuple (tuple): Кортеж объемов.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        volume_tuple (tuple | np.ndarray): Ряд объемов.
         period (int): Период для расчета MFI (по умолчанию 14).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение MFI для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"mfi_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{hash(volume_tuple)}_{period}"
+    cache_key = _indicator_cache_key("mfi", (high_tuple, low_tuple, close_tuple, volume_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"MFI извлечен из кэша: {result}")
+        logger.debug("MFI извлечен из кэша: %s", result)
         return result
 
     high, low, close, volume = list(high_tuple), list(low_tuple), list(close_tuple), list(volume_tuple)
@@ -135,33 +517,40 @@ def calculate_mfi(high_tuple, low_tuple, close_tuple, volume_tuple, period=14):
         logger.warning(f"Недостаточно данных для расчета MFI: требуется минимум {period} значений, получено {len(high)}")
         return None
     try:
-        df = prepare_dataframe(high=high, low=low, close=close, volume=volume)
-        mfi = MFIIndicator(df['high'], df['low'], df['close'], df['volume'], window=period).money_flow_index()
-        result = mfi.iloc[-1] if not mfi.empty else None
+        result = None
+        if USE_TALIB:
+            result = _talib_last(talib.MFI(
+                _as_array(high), _as_array(low), _as_array(close), _as_array(volume), timeperiod=period
+            ))
+        if result is None:
+            df = prepare_dataframe(high=high, low=low, close=close, volume=volume)
+            mfi = MFIIndicator(df['high'], df['low'], df['close'], df['volume'], window=period).money_flow_index()
+            result = mfi.iloc[-1] if not mfi.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"MFI рассчитан: {result}")
+        logger.debug("MFI рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете MFI: {str(e)}")
         return None
 
-def calculate_adx(high_tuple, low_tuple, close_tuple, period=14):
+def calculate_adx(high_tuple, low_tuple, close_tuple, period=14, cache_token=None):
     """
     Рассчитывает средний индекс направленного движения (ADX).
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета ADX (по умолчанию 14).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение ADX для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"adx_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{period}"
+    cache_key = _indicator_cache_key("adx", (high_tuple, low_tuple, close_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"ADX извлечен из кэша: {result}")
+        logger.debug("ADX извлечен из кэша: %s", result)
         return result
 
     high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -169,33 +558,38 @@ def calculate_adx(high_tuple, low_tuple, close_tuple, period=14):
         logger.warning(f"Недостаточно данных для расчета ADX: требуется минимум {period} значений, получено {len(high)}")
         return None
     try:
-        df = prepare_dataframe(high=high, low=low, close=close)
-        adx = ADXIndicator(df['high'], df['low'], df['close'], window=period).adx()
-        result = adx.iloc[-1] if not adx.empty else None
+        result = None
+        if USE_TALIB:
+            result = _talib_last(talib.ADX(_as_array(high), _as_array(low), _as_array(close), timeperiod=period))
+        if result is None:
+            df = prepare_dataframe(high=high, low=low, close=close)
+            adx = ADXIndicator(df['high'], df['low'], df['close'], window=period).adx()
+            result = adx.iloc[-1] if not adx.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"ADX рассчитан: {result}")
+        logger.debug("ADX рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете ADX: {str(e)}")
         return None
 
-def calculate_atr(high_tuple, low_tuple, close_tuple, period=14):
+def calculate_atr(high_tuple, low_tuple, close_tuple, period=14, cache_token=None):
     """
     Рассчитывает средний истинный диапазон (ATR).
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета ATR (по умолчанию 14).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение ATR для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"atr_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{period}"
+    cache_key = _indicator_cache_key("atr", (high_tuple, low_tuple, close_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"ATR извлечен из кэша: {result}")
+        logger.debug("ATR извлечен из кэша: %s", result)
         return result
 
     high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -203,33 +597,83 @@ def calculate_atr(high_tuple, low_tuple, close_tuple, period=14):
         logger.warning(f"Недостаточно данных для расчета ATR: требуется минимум {period} значений, получено {len(high)}")
         return None
     try:
-        df = prepare_dataframe(high=high, low=low, close=close)
-        atr = AverageTrueRange(df['high'], df['low'], df['close'], window=period).average_true_range()
-        result = atr.iloc[-1] if not atr.empty else None
+        result = None
+        if USE_TALIB:
+            result = _talib_last(talib.ATR(_as_array(high), _as_array(low), _as_array(close), timeperiod=period))
+        if result is None:
+            df = prepare_dataframe(high=high, low=low, close=close)
+            atr = AverageTrueRange(df['high'], df['low'], df['close'], window=period).average_true_range()
+            result = atr.iloc[-1] if not atr.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"ATR рассчитан: {result}")
+        logger.debug("ATR рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете ATR: {str(e)}")
         return None
 
-def calculate_williams_r(high_tuple, low_tuple, close_tuple, period=14):
+def calculate_atr_last(high_tuple, low_tuple, close_tuple, timestamps, period=14, state_key=None, cache_token=None):
+    """
+    Рассчитывает ATR последней свечи с потоковым обновлением сглаживания Уайлдера.
+
+    Хранит в кэше ATR и цену закрытия последней закрытой свечи; обновление устроено
+    так же, как в calculate_rsi_last.
+
+    Args:
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        timestamps (np.ndarray): Время открытия свечей.
+        period (int): Период для расчета ATR (по умолчанию 14).
+        state_key (str, optional): Ключ ряда свечей (биржа, пара, интервал); без него ATR считается по всему ряду.
+        cache_token (str, optional): Ключ набора свечей для кэша при расчёте по всему ряду.
+
+    Returns:
+        float: Значение ATR для последней свечи, или None, если данных недостаточно.
+    """
+    high, low, close = _as_array(high_tuple), _as_array(low_tuple), _as_array(close_tuple)
+    timestamps = np.asarray(timestamps)
+    if state_key is None or not _streaming_ready(timestamps, period + 1) or not (
+        len(high) == len(low) == len(close) == len(timestamps)
+    ):
+        return calculate_atr(high, low, close, period, cache_token)
+    state_cache_key = f"atr_state_{state_key}_{period}"
+    state = cache.get(state_cache_key)
+    closed_ts = int(timestamps[-2])
+    if state is None or state['ts'] != closed_ts:
+        if state is not None and state['ts'] == int(timestamps[-3]):
+            prev_close = state['close']
+            true_range = max(high[-2] - low[-2], abs(high[-2] - prev_close), abs(low[-2] - prev_close))
+            atr = (state['atr'] * (period - 1) + true_range) / period
+        else:
+            atr = _atr_loop(high[:-1], low[:-1], close[:-1], period)[-1]
+        state = {'ts': closed_ts, 'close': float(close[-2]), 'atr': float(atr)}
+        cache.set(state_cache_key, state, timeout=INDICATOR_STATE_TIMEOUT)
+        logger.debug("Состояние ATR обновлено: %s", state)
+
+    prev_close = state['close']
+    true_range = max(high[-1] - low[-1], abs(high[-1] - prev_close), abs(low[-1] - prev_close))
+    result = (state['atr'] * (period - 1) + true_range) / period
+    logger.debug("ATR (потоковый) рассчитан: %s", result)
+    return result
+
+def calculate_williams_r(high_tuple, low_tuple, close_tuple, period=14, cache_token=None):
     """
     Рассчитывает индикатор Williams %R.
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета Williams %R (по умолчанию 14).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение Williams %R для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"williams_r_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{period}"
+    cache_key = _indicator_cache_key("williams_r", (high_tuple, low_tuple, close_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Williams %R извлечен из кэша: {result}")
+        logger.debug("Williams %%R извлечен из кэша: %s", result)
         return result
 
     high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -241,27 +685,28 @@ def calculate_williams_r(high_tuple, low_tuple, close_tuple, period=14):
         williams_r = WilliamsRIndicator(df['high'], df['low'], df['close'], window=period).williams_r()
         result = williams_r.iloc[-1] if not williams_r.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Williams %R рассчитан: {result}")
+        logger.debug("Williams %%R рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете Williams %R: {str(e)}")
         return None
 
-def calculate_roc(prices_tuple, period=12):
+def calculate_roc(prices_tuple, period=12, cache_token=None):
     """
     Рассчитывает скорость изменения (ROC).
 
     Args:
-        prices_tuple (tuple): Кортеж цен закрытия.
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета ROC (по умолчанию 12).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение ROC для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"roc_{hash(prices_tuple)}_{period}"
+    cache_key = _indicator_cache_key("roc", (prices_tuple,), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"ROC извлечен из кэша: {result}")
+        logger.debug("ROC извлечен из кэша: %s", result)
         return result
 
     prices = list(prices_tuple)
@@ -273,65 +718,88 @@ def calculate_roc(prices_tuple, period=12):
         roc = ROCIndicator(df['close'], window=period).roc()
         result = roc.iloc[-1] if not roc.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"ROC рассчитан: {result}")
+        logger.debug("ROC рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете ROC: {str(e)}")
         return None
 
-def calculate_macd(close_tuple, fast_period=12, slow_period=26, signal_period=9):
+def calculate_macd(close_tuple, fast_period=12, slow_period=26, signal_period=9, cache_token=None):
     """
     Рассчитывает MACD (Moving Average Convergence Divergence).
 
     Args:
-        close_tuple (tuple): Кортеж цен закрытия.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         fast_period (int): Период быстрой EMA (по умолчанию 12).
         slow_period (int): Период медленной EMA (по умолчанию 26).
         signal_period (int): Период сигнальной линии (по умолчанию 9).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (MACD, Signal, Histogram) для последней свечи, или (None, None, None), если данных недостаточно.
     """
-    cache_key = f"macd_{hash(close_tuple)}_{fast_period}_{slow_period}_{signal_period}"
+    macd_line, signal_line, histogram = calculate_macd_series(close_tuple, fast_period, slow_period, signal_period, cache_token)
+    if macd_line is None:
+        return None, None, None
+    return macd_line[-1], signal_line[-1], histogram[-1]
+
+def calculate_macd_series(close_tuple, fast_period=12, slow_period=26, signal_period=9, cache_token=None):
+    """
+    Рассчитывает полные ряды MACD, сигнальной линии и гистограммы.
+
+    Позволяет проверять пересечения по двум последним значениям за один расчет,
+    без повторного вычисления EMA по срезу closes[:-1].
+
+    Args:
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        fast_period (int): Период быстрой EMA (по умолчанию 12).
+        slow_period (int): Период медленной EMA (по умолчанию 26).
+        signal_period (int): Период сигнальной линии (по умолчанию 9).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
+
+    Returns:
+        tuple: (MACD, Signal, Histogram) в виде numpy-массивов, или (None, None, None), если данных недостаточно.
+    """
+    close = _as_array(close_tuple)
+    cache_key = _indicator_cache_key("macd_series", (close,), (fast_period, slow_period, signal_period), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"MACD извлечен из кэша: {result}")
+        logger.debug("MACD series извлечены из кэша")
         return result
 
-    close = list(close_tuple)
-    if not close or len(close) < slow_period:
+    if not close.size or len(close) < slow_period:
         logger.warning(f"Недостаточно данных для расчета MACD: требуется минимум {slow_period} значений, получено {len(close)}")
         return None, None, None
     try:
-        df = prepare_dataframe(close=close)
-        macd = MACD(df['close'], window_fast=fast_period, window_slow=slow_period, window_sign=signal_period)
-        result = (
-            macd.macd().iloc[-1] if not macd.macd().empty else None,
-            macd.macd_signal().iloc[-1] if not macd.macd_signal().empty else None,
-            macd.macd_diff().iloc[-1] if not macd.macd_diff().empty else None
-        )
+        # EMA c span=N соответствует alpha=2/(N+1), как в ta.trend.MACD
+        ema_fast = _ema_loop(close, 2.0 / (fast_period + 1), fast_period)
+        ema_slow = _ema_loop(close, 2.0 / (slow_period + 1), slow_period)
+        macd_line = ema_fast - ema_slow
+        signal_line = _ema_loop(macd_line, 2.0 / (signal_period + 1), signal_period)
+        result = (macd_line, signal_line, macd_line - signal_line)
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"MACD рассчитан: {result}")
+        logger.debug("MACD series рассчитаны: MACD=%s, Signal=%s", result[0][-1], result[1][-1])
         return result
     except Exception as e:
-        logger.error(f"Ошибка при расчете MACD: {str(e)}")
+        logger.error(f"Ошибка при расчете MACD series: {str(e)}")
         return None, None, None
 
-def calculate_sma(prices_tuple, period=20):
+def calculate_sma(prices_tuple, period=20, cache_token=None):
     """
     Рассчитывает простую скользящую среднюю (SMA).
 
     Args:
-        prices_tuple (tuple): Кортеж цен закрытия.
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета SMA (по умолчанию 20).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение SMA для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"sma_{hash(prices_tuple)}_{period}"
+    cache_key = _indicator_cache_key("sma", (prices_tuple,), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"SMA извлечен из кэша: {result}")
+        logger.debug("SMA извлечен из кэша: %s", result)
         return result
 
     prices = list(prices_tuple)
@@ -343,60 +811,78 @@ def calculate_sma(prices_tuple, period=20):
         sma = SMAIndicator(df['close'], window=period).sma_indicator()
         result = sma.iloc[-1] if not sma.empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"SMA рассчитан: {result}")
+        logger.debug("SMA рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете SMA: {str(e)}")
         return None
 
-def calculate_ema(prices_tuple, period=20):
+def calculate_ema(prices_tuple, period=20, cache_token=None):
     """
     Рассчитывает экспоненциальную скользящую среднюю (EMA).
 
     Args:
-        prices_tuple (tuple): Кортеж цен закрытия.
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета EMA (по умолчанию 20).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение EMA для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"ema_{hash(prices_tuple)}_{period}"
+    prices = _as_array(prices_tuple)
+    cache_key = _indicator_cache_key("ema", (prices,), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"EMA извлечен из кэша: {result}")
+        logger.debug("EMA извлечен из кэша: %s", result)
         return result
 
-    prices = list(prices_tuple)
-    if not prices or len(prices) < period:
+    if not prices.size or len(prices) < period:
         logger.warning(f"Недостаточно данных для расчета EMA: требуется минимум {period} значений, получено {len(prices)}")
         return None
     try:
-        df = prepare_dataframe(close=prices)
-        ema = EMAIndicator(df['close'], window=period).ema_indicator()
-        result = ema.iloc[-1] if not ema.empty else None
+        result = _ema_loop(prices, 2.0 / (period + 1), period)[-1]
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"EMA рассчитан: {result}")
+        logger.debug("EMA рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете EMA: {str(e)}")
         return None
 
-def calculate_bollinger_bands(prices_tuple, period=20, dev=2):
+def calculate_bollinger_bands(prices_tuple, period=20, dev=2, cache_token=None):
     """
     Рассчитывает полосы Боллинджера.
 
     Args:
-        prices_tuple (tuple): Кортеж цен закрытия.
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (int): Период для расчета (по умолчанию 20).
         dev (float): Количество стандартных отклонений (по умолчанию 2).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (Upper Band, Lower Band, Middle Band) для последней свечи, или (None, None, None), если данных недостаточно.
     """
-    cache_key = f"bollinger_bands_{hash(prices_tuple)}_{period}_{dev}"
+    upper, lower, middle = calculate_bollinger_bands_series(prices_tuple, period, dev, cache_token)
+    if upper is None:
+        return None, None, None
+    return upper[-1], lower[-1], middle[-1]
+
+def calculate_bollinger_bands_series(prices_tuple, period=20, dev=2, cache_token=None):
+    """
+    Рассчитывает полные ряды полос Боллинджера.
+
+    Args:
+        prices_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        period (int): Период для расчета (по умолчанию 20).
+        dev (float): Количество стандартных отклонений (по умолчанию 2).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
+
+    Returns:
+        tuple: (Upper Band, Lower Band, Middle Band) в виде numpy-массивов, или (None, None, None), если данных недостаточно.
+    """
+    cache_key = _indicator_cache_key("bollinger_bands_series", (prices_tuple,), (period, dev), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Bollinger Bands извлечены из кэша: {result}")
+        logger.debug("Bollinger Bands series извлечены из кэша")
         return result
 
     prices = list(prices_tuple)
@@ -407,73 +893,73 @@ def calculate_bollinger_bands(prices_tuple, period=20, dev=2):
         df = prepare_dataframe(close=prices)
         bb = BollingerBands(df['close'], window=period, window_dev=dev)
         result = (
-            bb.bollinger_hband().iloc[-1] if not bb.bollinger_hband().empty else None,
-            bb.bollinger_lband().iloc[-1] if not bb.bollinger_lband().empty else None,
-            bb.bollinger_mavg().iloc[-1] if not bb.bollinger_mavg().empty else None
+            bb.bollinger_hband().to_numpy(),
+            bb.bollinger_lband().to_numpy(),
+            bb.bollinger_mavg().to_numpy()
         )
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Bollinger Bands рассчитаны: {result}")
+        logger.debug("Bollinger Bands series рассчитаны: Upper=%s, Lower=%s", result[0][-1], result[1][-1])
         return result
     except Exception as e:
-        logger.error(f"Ошибка при расчете Bollinger Bands: {str(e)}")
+        logger.error(f"Ошибка при расчете Bollinger Bands series: {str(e)}")
         return None, None, None
 
-def calculate_stochastic(high_tuple, low_tuple, close_tuple, k_period=14, d_period=3):
+def calculate_stochastic(high_tuple, low_tuple, close_tuple, k_period=14, d_period=3, cache_token=None):
     """
     Рассчитывает стохастический осциллятор.
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         k_period (int): Период для %K (по умолчанию 14).
         d_period (int): Период для %D (по умолчанию 3).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (%K, %D) для последней свечи, или (None, None), если данных недостаточно.
     """
-    cache_key = f"stochastic_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{k_period}_{d_period}"
+    high, low, close = _as_array(high_tuple), _as_array(low_tuple), _as_array(close_tuple)
+    cache_key = _indicator_cache_key("stochastic", (high, low, close), (k_period, d_period), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Stochastic извлечен из кэша: {result}")
+        logger.debug("Stochastic извлечен из кэша: %s", result)
         return result
 
-    high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
-    if not all([high, low, close]) or len(high) < k_period:
+    if not (high.size and low.size and close.size) or len(high) < k_period:
         logger.warning(f"Недостаточно данных для расчета Stochastic: требуется минимум {k_period} значений, получено {len(high)}")
         return None, None
     try:
-        df = prepare_dataframe(high=high, low=low, close=close)
-        stoch = StochasticOscillator(df['high'], df['low'], df['close'], window=k_period, smooth_window=d_period)
-        result = (
-            stoch.stoch().iloc[-1] if not stoch.stoch().empty else None,
-            stoch.stoch_signal().iloc[-1] if not stoch.stoch_signal().empty else None
-        )
+        stoch_k = _stoch_loop(high, low, close, k_period)
+        # %D — простое среднее последних d_period значений %K (NaN, пока их меньше)
+        stoch_d = stoch_k[-d_period:].mean() if len(stoch_k) >= d_period else np.nan
+        result = (stoch_k[-1], stoch_d)
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Stochastic рассчитан: {result}")
+        logger.debug("Stochastic рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете Stochastic: {str(e)}")
         return None, None
 
-def calculate_chaikin_oscillator(high_tuple, low_tuple, close_tuple, volume_tuple, period=10):
+def calculate_chaikin_oscillator(high_tuple, low_tuple, close_tuple, volume_tuple, period=10, cache_token=None):
     """
     Рассчитывает осциллятор Чайкина.
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
-        volume_tuple (tuple): Кортеж объемов.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        volume_tuple (tuple | np.ndarray): Ряд объемов.
         period (int): Период для расчета (по умолчанию 10).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         float: Значение Chaikin Money Flow для последней свечи, или None, если данных недостаточно.
     """
-    cache_key = f"chaikin_oscillator_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{hash(volume_tuple)}_{period}"
+    cache_key = _indicator_cache_key("chaikin_oscillator", (high_tuple, low_tuple, close_tuple, volume_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Chaikin Oscillator извлечен из кэша: {result}")
+        logger.debug("Chaikin Oscillator извлечен из кэша: %s", result)
         return result
 
     high, low, close, volume = list(high_tuple), list(low_tuple), list(close_tuple), list(volume_tuple)
@@ -485,31 +971,55 @@ def calculate_chaikin_oscillator(high_tuple, low_tuple, close_tuple, volume_tupl
         cmf = ChaikinMoneyFlowIndicator(df['high'], df['low'], df['close'], df['volume'], window=period)
         result = cmf.chaikin_money_flow().iloc[-1] if not cmf.chaikin_money_flow().empty else None
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Chaikin Oscillator рассчитан: {result}")
+        logger.debug("Chaikin Oscillator рассчитан: %s", result)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете Chaikin Oscillator: {str(e)}")
         return None
 
-def calculate_ichimoku(high_tuple, low_tuple, close_tuple, tenkan_period=9, kijun_period=26, senkou_period=52):
+def calculate_ichimoku(high_tuple, low_tuple, close_tuple, tenkan_period=9, kijun_period=26, senkou_period=52, cache_token=None):
     """
     Рассчитывает индикатор Облака Ишимоку.
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         tenkan_period (int): Период Tenkan-sen (по умолчанию 9).
         kijun_period (int): Период Kijun-sen (по умолчанию 26).
         senkou_period (int): Период Senkou Span (по умолчанию 52).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (Senkou Span A, Senkou Span B, Kijun-sen, Tenkan-sen) для последней свечи, или (None, None, None, None), если данных недостаточно.
     """
-    cache_key = f"ichimoku_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{tenkan_period}_{kijun_period}_{senkou_period}"
+    series = calculate_ichimoku_series(
+        high_tuple, low_tuple, close_tuple, tenkan_period, kijun_period, senkou_period, cache_token
+    )
+    if series[0] is None:
+        return None, None, None, None
+    return tuple(values[-1] for values in series)
+
+def calculate_ichimoku_series(high_tuple, low_tuple, close_tuple, tenkan_period=9, kijun_period=26, senkou_period=52, cache_token=None):
+    """
+    Рассчитывает полные ряды линий Облака Ишимоку.
+
+    Args:
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
+        tenkan_period (int): Период Tenkan-sen (по умолчанию 9).
+        kijun_period (int): Период Kijun-sen (по умолчанию 26).
+        senkou_period (int): Период Senkou Span (по умолчанию 52).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
+
+    Returns:
+        tuple: (Senkou Span A, Senkou Span B, Kijun-sen, Tenkan-sen) в виде numpy-массивов, или (None, None, None, None), если данных недостаточно.
+    """
+    cache_key = _indicator_cache_key("ichimoku_series", (high_tuple, low_tuple, close_tuple), (tenkan_period, kijun_period, senkou_period), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Ichimoku извлечен из кэша: {result}")
+        logger.debug("Ichimoku series извлечены из кэша")
         return result
 
     high, low, close = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -520,33 +1030,34 @@ def calculate_ichimoku(high_tuple, low_tuple, close_tuple, tenkan_period=9, kiju
         df = prepare_dataframe(high=high, low=low, close=close)
         ichimoku = IchimokuIndicator(df['high'], df['low'], window1=tenkan_period, window2=kijun_period, window3=senkou_period)
         result = (
-            ichimoku.ichimoku_a().iloc[-1] if not ichimoku.ichimoku_a().empty else None,
-            ichimoku.ichimoku_b().iloc[-1] if not ichimoku.ichimoku_b().empty else None,
-            ichimoku.ichimoku_base_line().iloc[-1] if not ichimoku.ichimoku_base_line().empty else None,
-            ichimoku.ichimoku_conversion_line().iloc[-1] if not ichimoku.ichimoku_conversion_line().empty else None
+            ichimoku.ichimoku_a().to_numpy(),
+            ichimoku.ichimoku_b().to_numpy(),
+            ichimoku.ichimoku_base_line().to_numpy(),
+            ichimoku.ichimoku_conversion_line().to_numpy()
         )
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Ichimoku рассчитан: {result}")
+        logger.debug("Ichimoku series рассчитаны: Senkou A=%s, Senkou B=%s", result[0][-1], result[1][-1])
         return result
     except Exception as e:
-        logger.error(f"Ошибка при расчете Ichimoku: {str(e)}")
+        logger.error(f"Ошибка при расчете Ichimoku series: {str(e)}")
         return None, None, None, None
 
-def calculate_volume_spike(volume_tuple, lookback=10):
+def calculate_volume_spike(volume_tuple, lookback=10, cache_token=None):
     """
     Рассчитывает, есть ли резкий рост объема (Volume Spike).
 
     Args:
-        volume_tuple (tuple): Кортеж объемов.
+        volume_tuple (tuple | np.ndarray): Ряд объемов.
         lookback (int): Период для расчета среднего объема (по умолчанию 10).
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (current_volume, avg_volume) для последней свечи, или (None, None), если данных недостаточно.
     """
-    cache_key = f"volume_spike_{hash(volume_tuple)}_{lookback}"
+    cache_key = _indicator_cache_key("volume_spike", (volume_tuple,), (lookback,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Volume Spike извлечен из кэша: {result}")
+        logger.debug("Volume Spike извлечен из кэша: %s", result)
         return result
 
     volumes = list(volume_tuple)
@@ -558,75 +1069,68 @@ def calculate_volume_spike(volume_tuple, lookback=10):
         current_volume = volumes[-1]
         result = (current_volume, avg_volume)
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Volume Spike рассчитан: current={current_volume}, avg={avg_volume}")
+        logger.debug("Volume Spike рассчитан: current=%s, avg=%s", current_volume, avg_volume)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете Volume Spike: {str(e)}")
         return None, None
 
-def calculate_ma_crossover(close_tuple, short_period=10, long_period=20, ma_type='sma'):
+def calculate_ma_crossover(close_tuple, short_period=10, long_period=20, ma_type='sma', cache_token=None):
     """
     Рассчитывает пересечение двух скользящих средних (MA Crossover).
 
     Args:
-        close_tuple (tuple): Кортеж цен закрытия.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         short_period (int): Период короткой MA (по умолчанию 10).
         long_period (int): Период длинной MA (по умолчанию 20).
         ma_type (str): Тип скользящей средней ('sma' или 'ema', по умолчанию 'sma').
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (short_ma, long_ma, prev_short_ma, prev_long_ma) для последней свечи, или (None, None, None, None), если данных недостаточно.
     """
-    cache_key = f"ma_crossover_{hash(close_tuple)}_{short_period}_{long_period}_{ma_type}"
+    closes = _as_array(close_tuple)
+    cache_key = _indicator_cache_key("ma_crossover", (closes,), (short_period, long_period, ma_type), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"MA Crossover извлечен из кэша: {result}")
+        logger.debug("MA Crossover извлечен из кэша: %s", result)
         return result
 
-    closes = list(close_tuple)
-    if not closes or len(closes) < long_period + 1:
+    if not closes.size or len(closes) < long_period + 1:
         logger.warning(f"Недостаточно данных для расчета MA Crossover: требуется минимум {long_period + 1} значений, получено {len(closes)}")
         return None, None, None, None
     try:
-        df = prepare_dataframe(close=closes)
-        
-        # Выбираем тип скользящей средней
+        # Выбираем тип скользящей средней; нужны только два последних значения каждой MA
         if ma_type == 'sma':
-            ShortMAIndicator = SMAIndicator
-            LongMAIndicator = SMAIndicator
+            short_ma, prev_short_ma = closes[-short_period:].mean(), closes[-short_period - 1:-1].mean()
+            long_ma, prev_long_ma = closes[-long_period:].mean(), closes[-long_period - 1:-1].mean()
         elif ma_type == 'ema':
-            ShortMAIndicator = EMAIndicator
-            LongMAIndicator = EMAIndicator
+            short_ma_series = _ema_loop(closes, 2.0 / (short_period + 1), short_period)
+            long_ma_series = _ema_loop(closes, 2.0 / (long_period + 1), long_period)
+            short_ma, prev_short_ma = short_ma_series[-1], short_ma_series[-2]
+            long_ma, prev_long_ma = long_ma_series[-1], long_ma_series[-2]
         else:
             logger.error(f"Неподдерживаемый тип скользящей средней: {ma_type}")
             return None, None, None, None
 
-        # Рассчитываем короткую и длинную скользящие средние
-        short_ma_series = ShortMAIndicator(df['close'], window=short_period).sma_indicator() if ma_type == 'sma' else ShortMAIndicator(df['close'], window=short_period).ema_indicator()
-        long_ma_series = LongMAIndicator(df['close'], window=long_period).sma_indicator() if ma_type == 'sma' else LongMAIndicator(df['close'], window=long_period).ema_indicator()
-
-        short_ma = short_ma_series.iloc[-1] if not short_ma_series.empty else None
-        long_ma = long_ma_series.iloc[-1] if not long_ma_series.empty else None
-        prev_short_ma = short_ma_series.iloc[-2] if len(short_ma_series) >= 2 else None
-        prev_long_ma = long_ma_series.iloc[-2] if len(long_ma_series) >= 2 else None
-
         result = (short_ma, long_ma, prev_short_ma, prev_long_ma)
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"MA Crossover рассчитан (тип {ma_type}): short_ma={short_ma}, long_ma={long_ma}, prev_short_ma={prev_short_ma}, prev_long_ma={prev_long_ma}")
+        logger.debug("MA Crossover рассчитан (тип %s): short_ma=%s, long_ma=%s, prev_short_ma=%s, prev_long_ma=%s", ma_type, short_ma, long_ma, prev_short_ma, prev_long_ma)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете MA Crossover: {str(e)}")
         return None, None, None, None
 
-def calculate_pivot_points(high_tuple, low_tuple, close_tuple, period='D'):
+def calculate_pivot_points(high_tuple, low_tuple, close_tuple, period='D', cache_token=None):
     """
     Рассчитывает уровни Pivot Points (точки разворота) на основе указанного периода.
 
     Args:
-        high_tuple (tuple): Кортеж максимальных цен.
-        low_tuple (tuple): Кортеж минимальных цен.
-        close_tuple (tuple): Кортеж цен закрытия.
+        high_tuple (tuple | np.ndarray): Ряд максимальных цен.
+        low_tuple (tuple | np.ndarray): Ряд минимальных цен.
+        close_tuple (tuple | np.ndarray): Ряд цен закрытия.
         period (str): Период для расчета ('1h', '4h', 'D', 'W', 'M', по умолчанию 'D').
+        cache_token (str, optional): Ключ набора свечей; если указан, кэш индексируется по нему вместо хэша рядов.
 
     Returns:
         tuple: (pivot, r1, s1) для последней свечи, или (None, None, None), если данных недостаточно.
@@ -641,10 +1145,10 @@ def calculate_pivot_points(high_tuple, low_tuple, close_tuple, period='D'):
     }
     lookback = period_map.get(period, 24)  # По умолчанию дневной период
 
-    cache_key = f"pivot_points_{hash(high_tuple)}_{hash(low_tuple)}_{hash(close_tuple)}_{period}"
+    cache_key = _indicator_cache_key("pivot_points", (high_tuple, low_tuple, close_tuple), (period,), cache_token)
     result = cache.get(cache_key)
     if result is not None:
-        logger.debug(f"Pivot Points извлечены из кэша: {result}")
+        logger.debug("Pivot Points извлечены из кэша: %s", result)
         return result
 
     highs, lows, closes = list(high_tuple), list(low_tuple), list(close_tuple)
@@ -667,7 +1171,7 @@ def calculate_pivot_points(high_tuple, low_tuple, close_tuple, period='D'):
 
         result = (pivot, r1, s1)
         cache.set(cache_key, result, timeout=INDICATOR_CACHE_TIMEOUT)
-        logger.debug(f"Pivot Points рассчитаны для периода {period}: pivot={pivot}, r1={r1}, s1={s1}")
+        logger.debug("Pivot Points рассчитаны для периода %s: pivot=%s, r1=%s, s1=%s", period, pivot, r1, s1)
         return result
     except Exception as e:
         logger.error(f"Ошибка при расчете Pivot Points: {str(e)}")
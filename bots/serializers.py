@@ -5,10 +5,14 @@ from .utils import ExchangeAPI
 from django.db import IntegrityError
 from django.core.cache import cache
 from django.conf import settings  # Добавляем импорт для настроек
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Пул для независимых запросов к бирже при валидации: выполняются одновременно, а не по очереди
+_EXCHANGE_CHECK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='exchange-check')
+
 class APIKeySerializer(serializers.ModelSerializer):
     """
     Сериализатор для API-ключей.
@@ -38,16 +42,13 @@ class APIKeySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("API-секрет не может быть пустым.")
 
         try:
-            ExchangeAPI.validate_api_key(
-                exchange=data['exchange'],
-                api_key=data['api_key'],
-                api_secret=data['api_secret']
-            )
-            ExchangeAPI.check_api_key_permissions(
-                exchange=data['exchange'],
-                api_key=data['api_key'],
-                api_secret=data['api_secret']
-            )
+            # Проверка ключа и его прав — два независимых запроса: ждём оба одновременно
+            checks = [
+                _EXCHANGE_CHECK_POOL.submit(check, data['exchange'], data['api_key'], data['api_secret'])
+                for check in (ExchangeAPI.validate_api_key, ExchangeAPI.check_api_key_permissions)
+            ]
+            for check in checks:
+                check.result()
             logger.info(f"API-ключ для {data['exchange']} успешно валидирован для пользователя {user.username} (ID: {user.id})")
         except Exception as e:
             logger.error(f"Ошибка проверки API-ключа для {data['exchange']} пользователя {user.username} (ID: {user.id}): {str(e)}")
@@ -59,6 +60,10 @@ class BotSettingsSerializer(serializers.ModelSerializer):
     """
     Сериализатор для настроек бота.
     """
+    # Поле модели ограничено choices ('1m', '1h', ...); объявлено явно, чтобы validate_signal_interval
+    # принимал и остальные форматы интервала (например, '1 минута')
+    signal_interval = serializers.CharField(max_length=20, required=False)
+
     class Meta:
         model = BotSettings
         fields = [
@@ -69,6 +74,19 @@ class BotSettingsSerializer(serializers.ModelSerializer):
             'combined_signals', 'trailing_stop_percentage', 'dca_interval'
         ]
 
+    def _initial_settings(self):
+        """
+        Исходные данные настроек. Вложенный сериализатор (поле settings в BotSerializer)
+        не получает initial_data, поэтому данные берутся из соответствующего поля родителя.
+
+        Returns:
+            dict: Переданные настройки.
+        """
+        if hasattr(self, 'initial_data'):
+            return self.initial_data
+        parent_data = getattr(self.parent, 'initial_data', None) or {}
+        return parent_data.get(self.field_name) or {}
+
     def validate_signal_type(self, value):
         """
         Проверяет, что тип сигнала соответствует допустимым значениям.
@@ -89,7 +107,7 @@ class BotSettingsSerializer(serializers.ModelSerializer):
             logger.error("signal_params не является словарем")
             raise serializers.ValidationError("signal_params должен быть словарем.")
 
-        signal_type = self.initial_data.get('signal_type') or (self.instance.signal_type if self.instance else None)
+        signal_type = self._initial_settings().get('signal_type') or (self.instance.signal_type if self.instance else None)
         if signal_type in ['rsi', 'cci', 'mfi']:
             required_fields = ['period', 'threshold']
             for field in required_fields:
@@ -617,7 +635,8 @@ class BotSerializer(serializers.ModelSerializer):
             settings_data = validated_data.pop('settings')
             api_key = APIKey.objects.get(pk=api_key_id)
             bot = Bot.objects.create(api_key=api_key, **validated_data)
-            BotSettings.objects.create(bot=bot, **settings_data)
+            # Строку настроек со значениями по умолчанию создаёт сигнал post_save бота
+            BotSettings.objects.update_or_create(bot=bot, defaults=settings_data)
             logger.info(f"Бот с ID {bot.id} успешно создан для пользователя {bot.api_key.user.username} (ID: {bot.api_key.user.id})")
             return bot
         except IntegrityError:
@@ -1,41 +1,697 @@
 # bots/strategies.py
+import asyncio
 import requests
 import hmac
 import hashlib
 import logging
-import json
 import time
+import orjson
 from django.conf import settings
 from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
 from .indicators import (
-    calculate_rsi, calculate_cci, calculate_mfi,
-    calculate_macd, calculate_bollinger_bands, calculate_stochastic,
-    calculate_adx, calculate_atr, calculate_ichimoku,
-    calculate_volume_spike, calculate_ma_crossover, calculate_pivot_points
+    calculate_rsi_last, calculate_cci, calculate_mfi,
+    calculate_macd_series, calculate_adx, calculate_atr_last, calculate_ichimoku_series,
+    calculate_ma_crossover, calculate_pivot_points, RollingContext
 )
 from .models import Bot, BotSettings, BotPosition
-from .utils import get_bybit_server_time, ExchangeAPI, safe_float
+from .utils import (
+    get_bybit_server_time, reset_bybit_time_offset, ExchangeAPI, safe_float, okx_inst_id,
+    ttl_peek, ttl_put, ttl_get,
+)
+from .streams import PriceFeed, get_order_stream, release_order_stream
 from celery import shared_task
-from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection
 import math
+from decimal import Decimal, ROUND_FLOOR
+import socket
 import statistics
 import numpy as np
+import threading
+from collections import OrderedDict
+
+try:
+    import httpx
+    import h2  # noqa: F401 — нужен httpx для HTTP/2
+except ImportError:
+    # httpx[http2] не обязателен: без него используется requests.Session (HTTP/1.1)
+    httpx = None
 
 logger = logging.getLogger(__name__)
 
+# Хосты API бирж: у каждого свой пул соединений, чтобы медленная биржа не занимала соединения остальных
+_EXCHANGE_HOSTS = (
+    'https://api.bybit.com',
+    'https://api.binance.com',
+    'https://fapi.binance.com',
+    'https://www.okx.com',
+)
+
+# Размеры пулов и keep-alive; переопределяются через settings.HTTP_POOL_LIMITS
+_HTTP_POOL_LIMITS = {
+    'pool_connections': len(_EXCHANGE_HOSTS) * 8,
+    'pool_maxsize': 128,
+    'keepalive_idle': 30,
+    **getattr(settings, 'HTTP_POOL_LIMITS', {}),
+}
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter с TCP keep-alive на сокетах пула, чтобы простаивающие соединения
+    к бирже не закрывались промежуточными узлами между итерациями стратегий.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, _HTTP_POOL_LIMITS['keepalive_idle']))
+        kwargs['socket_options'] = socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+def _make_http_adapter():
+    """
+    Создаёт адаптер с размерами пула из _HTTP_POOL_LIMITS и повторами временных ошибок шлюза.
+
+    Returns:
+        _KeepAliveAdapter: Новый адаптер.
+    """
+    return _KeepAliveAdapter(
+        pool_connections=_HTTP_POOL_LIMITS['pool_connections'],
+        pool_maxsize=_HTTP_POOL_LIMITS['pool_maxsize'],
+        # Повторы только для идемпотентных методов (urllib3 не повторяет POST) и временных ошибок шлюза
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False),
+    )
+
+# Общая HTTP-сессия: пул соединений и keep-alive к API бирж вместо нового TCP+TLS на каждый запрос
+_HTTP = requests.Session()
+_HTTP.mount('https://', _make_http_adapter())
+_HTTP.mount('http://', _make_http_adapter())
+for _host in _EXCHANGE_HOSTS:
+    _HTTP.mount(_host, _make_http_adapter())
+_HTTP.headers.update({'User-Agent': 'tgnew-trading-bot', 'Connection': 'keep-alive'})
+
+# HTTP/2 (HTTP2_ENABLED и установленный httpx[http2]): параллельные запросы к бирже
+# мультиплексируются в одном TCP-соединении вместо отдельного соединения пула на каждый
+_HTTP_IS_HTTPX = httpx is not None and getattr(settings, 'HTTP2_ENABLED', False)
+if _HTTP_IS_HTTPX:
+    _HTTP = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=_HTTP_POOL_LIMITS['pool_maxsize'],
+            max_keepalive_connections=_HTTP_POOL_LIMITS['pool_connections'],
+            keepalive_expiry=_HTTP_POOL_LIMITS['keepalive_idle'],
+        ),
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        headers={'User-Agent': 'tgnew-trading-bot'},
+    )
+# Сетевые ошибки общего клиента, какой бы из них ни использовался
+_HTTP_ERRORS = (requests.RequestException, httpx.HTTPError) if httpx is not None else (requests.RequestException,)
+
+
+def _http_post(url, headers, body):
+    """
+    Отправляет POST с готовым телом через общий HTTP-клиент.
+
+    Args:
+        url (str): URL запроса.
+        headers (dict): Заголовки.
+        body (str | bytes): Тело запроса (JSON).
+
+    Returns:
+        Ответ requests.Response или httpx.Response.
+    """
+    if _HTTP_IS_HTTPX:
+        return _HTTP.post(url, headers=headers, content=body, timeout=10)
+    return _HTTP.post(url, headers=headers, data=body, timeout=10)
+
+# Цены из WebSocket-потоков тикеров; без PRICE_FEED_ENABLED цена берётся только через REST
+_PRICE_FEED = PriceFeed(max_age=getattr(settings, 'PRICE_FEED_MAX_AGE', 2.0)) if getattr(settings, 'PRICE_FEED_ENABLED', False) else None
+
+# Исполнения ордеров Bybit из приватного WebSocket-потока; REST-опрос остаётся сверкой раз в ORDER_RECONCILE_INTERVAL секунд
+_ORDER_STREAM_ENABLED = getattr(settings, 'ORDER_STREAM_ENABLED', False)
+ORDER_RECONCILE_INTERVAL = getattr(settings, 'ORDER_RECONCILE_INTERVAL', 30)
+
+# Пул для одновременного выполнения итераций нескольких ботов (execute_strategies);
+# отдельный от _IO_POOL, чтобы итерации не занимали потоки своих же параллельных запросов
+_STRATEGY_POOL = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'STRATEGY_BATCH_WORKERS', 16), thread_name_prefix='strategy-tick'
+)
+
+# Связи бота, которые читает стратегия: загружаются одним запросом с JOIN вместо запроса на каждую
+BOT_RELATED_FIELDS = ('api_key__user', 'settings', 'user', 'position')
+
+# Неизменные части подписываемых строк OKX (метод + путь), заранее закодированные в байты
+_OKX_PENDING_SIGN_PREFIX = b"GET/api/v5/trade/orders-pending"
+_OKX_CANCEL_SIGN_PREFIX = b"POST/api/v5/trade/cancel-order"
+
+# Поля позиции, которые меняет стратегия при исполнении ордеров
+_POSITION_FIELDS = ['position', 'avg_price', 'sell_order_id', 'buy_orders', 'position_opened', 'highest_price']
+# Поля, которые меняются при открытии или наращивании позиции покупкой
+_OPEN_POSITION_FIELDS = ['position', 'avg_price', 'position_opened', 'buy_orders']
+
+# Время жизни параметров инструмента в локальном кэше процесса (utils.ttl_get)
+LOCAL_CACHE_TTL = getattr(settings, 'STRATEGY_LOCAL_CACHE_TTL', 60)
+# Время жизни списка параметров инструментов биржи (в кэше Django и в памяти процесса)
+EXCHANGE_FILTERS_TTL = 3600
+
+# Пул потоков для параллельных запросов к бирже в пределах одной итерации стратегии
+_IO_POOL = ThreadPoolExecutor(max_workers=getattr(settings, 'STRATEGY_IO_WORKERS', 8), thread_name_prefix='strategy-io')
+
+def _klines_to_columns(klines):
+    """
+    Раскладывает свечи [timestamp, open, high, low, close, volume, ...] в колоночный вид.
+
+    Строки конвертируются одним векторным присваиванием; при нечисловых или неполных
+    данных используется поэлементный safe_float. Результат компактнее списка строк
+    и кэшируется вместо него, так что разбор выполняется один раз на загрузку свечей.
+
+    Args:
+        klines (list): Список свечей.
+
+    Returns:
+        tuple: (timestamps int64 формы (N,), prices float64 формы (5, N)) с рядами
+            open, high, low, close, volume в строках prices.
+    """
+    n = len(klines)
+    timestamps, prices = np.empty(n, dtype=np.int64), np.empty((5, n), dtype=np.float64)
+    try:
+        arr = np.asarray(klines, dtype=object)
+        prices[:] = arr[:, 1:6].T
+        timestamps[:] = arr[:, 0]
+    except (ValueError, TypeError, IndexError):
+        for i, kline in enumerate(klines):
+            timestamps[i] = int(safe_float(kline[0]))
+            for j in range(5):
+                prices[j, i] = safe_float(kline[j + 1])
+    return timestamps, prices
+
+# Обработчики сигналов: принимают стратегию, ряды свечей и параметры сигнала, возвращают bool.
+def _rsi_handler(strategy, candles, params):
+    period = params.get('period', 14)
+    threshold = params.get('threshold', 30)
+    rsi = calculate_rsi_last(
+        candles['close'], candles['timestamp'], period, state_key=candles['series'], cache_token=candles['token']
+    )
+    if rsi is None:
+        logger.warning(f"RSI не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("RSI: %s, Порог: %s, Интервал: %s", rsi, threshold, strategy.signal_interval)
+    return rsi < threshold
+
+def _cci_handler(strategy, candles, params):
+    period = params.get('period', 20)
+    threshold = params.get('threshold', -100)
+    cci = calculate_cci(candles['high'], candles['low'], candles['close'], period, cache_token=candles['token'])
+    if cci is None:
+        logger.warning(f"CCI не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("CCI: %s, Порог: %s", cci, threshold)
+    return cci < threshold
+
+def _mfi_handler(strategy, candles, params):
+    period = params.get('period', 14)
+    threshold = params.get('threshold', 20)
+    mfi = calculate_mfi(candles['high'], candles['low'], candles['close'], candles['volume'], period, cache_token=candles['token'])
+    if mfi is None:
+        logger.warning(f"MFI не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("MFI: %s, Порог: %s", mfi, threshold)
+    return mfi < threshold
+
+def _macd_handler(strategy, candles, params):
+    fast_period = params.get('fast_period', 12)
+    slow_period = params.get('slow_period', 26)
+    signal_period = params.get('signal_period', 9)
+    condition = params.get('condition', 'crossover')
+    macd_series, signal_series, _ = calculate_macd_series(
+        candles['close'], fast_period, slow_period, signal_period, cache_token=candles['token']
+    )
+    if macd_series is None or signal_series is None:
+        logger.warning(f"MACD не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    if len(macd_series) < 2:
+        logger.warning(f"Недостаточно данных для проверки MACD crossover для бота {strategy.bot_id}")
+        return False
+    macd_line, signal_line = macd_series[-1], signal_series[-1]
+    prev_macd_line, prev_signal_line = macd_series[-2], signal_series[-2]
+    logger.debug("MACD: %s, Signal: %s, Prev MACD: %s, Prev Signal: %s", macd_line, signal_line, prev_macd_line, prev_signal_line)
+    if condition == 'crossover':
+        return macd_line > signal_line and prev_macd_line <= prev_signal_line
+    elif condition == 'crossunder':
+        return macd_line < signal_line and prev_macd_line >= prev_signal_line
+    return False
+
+def _bollinger_bands_handler(strategy, candles, params):
+    period = params.get('period', 20)
+    dev = params.get('dev', 2)
+    closes = candles['close']
+    rolling = candles['rolling']
+    middle_series = rolling.sma(period)
+    if not middle_series.size:
+        logger.warning(f"Bollinger Bands не рассчитаны для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    deviation = dev * rolling.std(period)[-1]
+    upper, lower = middle_series[-1] + deviation, middle_series[-1] - deviation
+    logger.debug("Bollinger Bands: Upper=%s, Lower=%s, Price=%s", upper, lower, closes[-1])
+    return closes[-1] < lower
+
+def _stochastic_handler(strategy, candles, params):
+    k_period = params.get('k_period', 14)
+    threshold = params.get('threshold', 20)
+    rolling = candles['rolling']
+    lowest, highest = rolling.min_low(k_period), rolling.max_high(k_period)
+    if not lowest.size:
+        logger.warning(f"Stochastic не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    price_range = highest[-1] - lowest[-1]
+    k = 100 * (candles['close'][-1] - lowest[-1]) / price_range if price_range > 0 else np.nan
+    logger.debug("Stochastic %%K: %s, Порог: %s", k, threshold)
+    return k < threshold
+
+def _price_handler(strategy, candles, params):
+    current_price = strategy.get_current_price()
+    target_price = params.get('target_price')
+    logger.debug("Current price: %s, Target price: %s", current_price, target_price)
+    return current_price <= target_price if current_price and target_price else False
+
+def _volume_spike_handler(strategy, candles, params):
+    lookback = params.get('lookback', 10)
+    threshold = params.get('threshold', 2)
+    # Среднее за lookback свечей перед текущей — предпоследнее полное окно
+    avg_volumes = candles['rolling'].sma(lookback, field='volume')
+    if avg_volumes.size < 2:
+        logger.warning(f"Volume Spike не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    current_volume, avg_volume = candles['volume'][-1], avg_volumes[-2]
+    logger.debug("Volume Spike: Current=%s, Avg=%s, Порог=%s", current_volume, avg_volume, threshold)
+    return current_volume > avg_volume * threshold
+
+def _ma_crossover_handler(strategy, candles, params):
+    short_period = params.get('short_period', 10)
+    long_period = params.get('long_period', 20)
+    if strategy.ma_crossover_type == 'sma':
+        rolling = candles['rolling']
+        short_series, long_series = rolling.sma(short_period), rolling.sma(long_period)
+        if short_series.size < 2 or long_series.size < 2:
+            short_ma = long_ma = prev_short_ma = prev_long_ma = None
+        else:
+            short_ma, prev_short_ma = short_series[-1], short_series[-2]
+            long_ma, prev_long_ma = long_series[-1], long_series[-2]
+    else:
+        short_ma, long_ma, prev_short_ma, prev_long_ma = calculate_ma_crossover(
+            candles['close'], short_period, long_period, ma_type=strategy.ma_crossover_type,
+            cache_token=candles['token']
+        )
+    if any(v is None for v in [short_ma, long_ma, prev_short_ma, prev_long_ma]):
+        logger.warning(f"MA Crossover не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("MA Crossover: Short=%s, Long=%s, Prev Short=%s, Prev Long=%s", short_ma, long_ma, prev_short_ma, prev_long_ma)
+    return short_ma > long_ma and prev_short_ma <= prev_long_ma
+
+def _pivot_points_handler(strategy, candles, params):
+    closes = candles['close']
+    pivot, r1, s1 = calculate_pivot_points(
+        candles['high'], candles['low'], closes, period=strategy.pivot_points_period,
+        cache_token=candles['token']
+    )
+    if any(v is None for v in [pivot, r1, s1]):
+        logger.warning(f"Pivot Points не рассчитаны для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    current_price = closes[-1]
+    condition = params.get('condition', 'above_resistance')
+    logger.debug("Pivot Points: Pivot=%s, R1=%s, S1=%s, Price=%s, Condition=%s", pivot, r1, s1, current_price, condition)
+    return current_price > r1 if condition == 'above_resistance' else current_price < s1
+
+def _adx_handler(strategy, candles, params):
+    period = params.get('period', 14)
+    threshold = params.get('threshold', 25)
+    adx = calculate_adx(candles['high'], candles['low'], candles['close'], period, cache_token=candles['token'])
+    if adx is None:
+        logger.warning(f"ADX не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("ADX: %s, Порог: %s", adx, threshold)
+    return adx > threshold
+
+def _atr_handler(strategy, candles, params):
+    period = params.get('period', 14)
+    threshold = params.get('threshold', 1.0)
+    atr = calculate_atr_last(
+        candles['high'], candles['low'], candles['close'], candles['timestamp'], period,
+        state_key=candles['series'], cache_token=candles['token']
+    )
+    if atr is None:
+        logger.warning(f"ATR не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    logger.debug("ATR: %s, Порог: %s", atr, threshold)
+    return atr > threshold
+
+def _ichimoku_handler(strategy, candles, params):
+    tenkan_period = params.get('tenkan_period', 9)
+    kijun_period = params.get('kijun_period', 26)
+    senkou_period = params.get('senkou_period', 52)
+    condition = params.get('condition', 'above_cloud')
+    closes = candles['close']
+    senkou_a, senkou_b, kijun, tenkan = calculate_ichimoku_series(
+        candles['high'], candles['low'], closes, tenkan_period, kijun_period, senkou_period,
+        cache_token=candles['token']
+    )
+    if any(v is None for v in [senkou_a, senkou_b]):
+        logger.warning(f"Ichimoku не рассчитан для бота {strategy.bot_id}, недостаточно данных")
+        return False
+    current_price = closes[-1]
+    # Границы облака по всему ряду: годятся и для условий на несколько последних свечей
+    cloud_top = np.maximum(senkou_a, senkou_b)
+    cloud_bottom = np.minimum(senkou_a, senkou_b)
+    logger.debug("Ichimoku: Senkou A=%s, Senkou B=%s, Price=%s, Condition=%s", senkou_a[-1], senkou_b[-1], current_price, condition)
+    if condition == 'above_cloud':
+        return current_price > cloud_top[-1]
+    elif condition == 'below_cloud':
+        return current_price < cloud_bottom[-1]
+    return False
+
+# Таблица диспетчеризации сигналов, строится один раз при импорте модуля
+_SIGNAL_HANDLERS = {
+    'rsi': _rsi_handler,
+    'cci': _cci_handler,
+    'mfi': _mfi_handler,
+    'macd': _macd_handler,
+    'bollinger_bands': _bollinger_bands_handler,
+    'stochastic': _stochastic_handler,
+    'price': _price_handler,
+    'volume_spike': _volume_spike_handler,
+    'ma_crossover': _ma_crossover_handler,
+    'pivot_points': _pivot_points_handler,
+    'adx': _adx_handler,
+    'atr': _atr_handler,
+    'ichimoku': _ichimoku_handler,
+}
+
+
+class _BybitAdapter:
+    """
+    Запросы рыночных данных Bybit (публичные эндпоинты v5).
+    """
+    def fetch_price(self, trading_pair, category, session):
+        """
+        Получает последнюю цену.
+
+        Args:
+            trading_pair (str): Символ без разделителя (например, 'BTCUSDT').
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            float: Последняя цена или None в случае ошибки API.
+        """
+        url = f"https://api.bybit.com/v5/market/tickers?category={category}&symbol={trading_pair}"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if data['retCode'] != 0:
+            logger.error(f"Ошибка получения цены на Bybit для {trading_pair}: {data['retMsg']}")
+            return None
+        return safe_float(data['result']['list'][0]['lastPrice'])
+
+    def fetch_instrument(self, trading_pair, category, session):
+        """
+        Получает параметры инструмента.
+
+        Args:
+            trading_pair (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision' или None в случае ошибки API.
+        """
+        url = f"https://api.bybit.com/v5/market/instruments-info?category={category}&symbol={trading_pair}"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if data['retCode'] != 0 or not data['result']['list']:
+            logger.error(f"Ошибка получения параметров инструмента на Bybit для {trading_pair}: {data['retMsg']}")
+            return None
+        return self._instrument_info(data['result']['list'][0])
+
+    def fetch_instruments(self, category, session):
+        """
+        Получает параметры всех инструментов категории (постранично, до 1000 за запрос).
+
+        Args:
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Параметры инструментов по символу или None в случае ошибки API.
+        """
+        instruments = {}
+        params = {"category": category, "limit": 1000}
+        while True:
+            response = session.get("https://api.bybit.com/v5/market/instruments-info", params=params, timeout=10)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            if data['retCode'] != 0:
+                logger.error(f"Ошибка получения списка инструментов на Bybit: {data['retMsg']}")
+                return None
+            instruments.update(
+                (instrument['symbol'], self._instrument_info(instrument)) for instrument in data['result']['list']
+            )
+            cursor = data['result'].get('nextPageCursor')
+            if not cursor:
+                return instruments
+            params["cursor"] = cursor
+
+    @staticmethod
+    def _instrument_info(instrument):
+        """
+        Извлекает параметры из записи instruments-info.
+
+        Args:
+            instrument (dict): Запись инструмента Bybit.
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision'.
+        """
+        lot_size_filter = instrument['lotSizeFilter']
+        return {
+            'tick_size': safe_float(instrument['priceFilter']['tickSize']),
+            'min_order_size': safe_float(lot_size_filter['minOrderQty']),
+            # У фьючерсов Bybit нет basePrecision, шаг объёма задаётся qtyStep
+            'base_precision': safe_float(lot_size_filter.get('basePrecision') or lot_size_filter.get('qtyStep')),
+        }
+
+
+class _BinanceAdapter:
+    """
+    Запросы рыночных данных Binance (spot API v3 и USDⓈ-M futures API v1).
+    """
+    def fetch_price(self, trading_pair, category, session):
+        """
+        Получает последнюю цену.
+
+        Args:
+            trading_pair (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            float: Последняя цена.
+        """
+        url = "https://api.binance.com/api/v3/ticker/price" if category == 'spot' else "https://fapi.binance.com/fapi/v1/ticker/price"
+        response = session.get(url, params={"symbol": trading_pair}, timeout=10)
+        response.raise_for_status()
+        return safe_float(orjson.loads(response.content)['price'])
+
+    def fetch_instrument(self, trading_pair, category, session):
+        """
+        Получает параметры инструмента.
+
+        Args:
+            trading_pair (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision' или None, если пара не найдена.
+        """
+        url = "https://api.binance.com/api/v3/exchangeInfo" if category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
+        # Запрос по одному символу вместо полной exchangeInfo
+        response = session.get(url, params={"symbol": trading_pair}, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        symbol = {s['symbol']: s for s in data.get('symbols', [])}.get(trading_pair)
+        if symbol is None:
+            logger.error(f"Торговая пара {trading_pair} не найдена на Binance")
+            return None
+        return self._instrument_info(symbol)
+
+    def fetch_instruments(self, category, session):
+        """
+        Получает параметры всех инструментов из полной exchangeInfo.
+
+        Args:
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Параметры инструментов по символу.
+        """
+        url = "https://api.binance.com/api/v3/exchangeInfo" if category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        return {symbol['symbol']: self._instrument_info(symbol) for symbol in data.get('symbols', [])}
+
+    @staticmethod
+    def _instrument_info(symbol):
+        """
+        Извлекает параметры из фильтров символа exchangeInfo.
+
+        Args:
+            symbol (dict): Запись символа Binance.
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision'.
+        """
+        filters = {filt['filterType']: filt for filt in symbol['filters']}
+        return {
+            'tick_size': safe_float(filters['PRICE_FILTER']['tickSize']),
+            'min_order_size': safe_float(filters['LOT_SIZE']['minQty']),
+            'base_precision': safe_float(filters['LOT_SIZE']['stepSize']),
+        }
+
+
+class _OKXAdapter:
+    """
+    Запросы рыночных данных OKX (API v5).
+    """
+    def fetch_price(self, trading_pair, category, session):
+        """
+        Получает последнюю цену.
+
+        Args:
+            trading_pair (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            float: Последняя цена или None в случае ошибки API.
+        """
+        url = f"https://www.okx.com/api/v5/market/ticker?instId={okx_inst_id(trading_pair, category)}"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if data['code'] != '0':
+            logger.error(f"Ошибка получения цены на OKX для {trading_pair}: {data['msg']}")
+            return None
+        return safe_float(data['data'][0]['last'])
+
+    def fetch_instrument(self, trading_pair, category, session):
+        """
+        Получает параметры инструмента.
+
+        Args:
+            trading_pair (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision' или None в случае ошибки.
+        """
+        inst_id = okx_inst_id(trading_pair, category)
+        # Фильтр instId: биржа возвращает один инструмент вместо всего списка
+        url = f"https://www.okx.com/api/v5/public/instruments?instType={'SPOT' if category == 'spot' else 'SWAP'}&instId={inst_id}"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if data['code'] != '0':
+            logger.error(f"Ошибка получения параметров инструмента на OKX для {trading_pair}: {data['msg']}")
+            return None
+        instrument = next((i for i in data['data'] if i['instId'] == inst_id), None)
+        if instrument is None:
+            logger.error(f"Торговая пара {trading_pair} не найдена на OKX")
+            return None
+        return self._instrument_info(instrument)
+
+    def fetch_instruments(self, category, session):
+        """
+        Получает параметры всех инструментов категории.
+
+        Символы приводятся к виду без разделителей и суффикса SWAP ('BTC-USDT-SWAP' -> 'BTCUSDT'),
+        как торговая пара хранится в боте.
+
+        Args:
+            category (str): Категория ('spot' или 'linear').
+            session: Общий HTTP-клиент (requests.Session или httpx.Client).
+
+        Returns:
+            dict: Параметры инструментов по символу или None в случае ошибки API.
+        """
+        url = f"https://www.okx.com/api/v5/public/instruments?instType={'SPOT' if category == 'spot' else 'SWAP'}"
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if data['code'] != '0':
+            logger.error(f"Ошибка получения списка инструментов на OKX: {data['msg']}")
+            return None
+        return {
+            instrument['instId'].replace('-SWAP', '').replace('-', ''): self._instrument_info(instrument)
+            for instrument in data['data']
+        }
+
+    @staticmethod
+    def _instrument_info(instrument):
+        """
+        Извлекает параметры из записи инструмента.
+
+        Args:
+            instrument (dict): Запись инструмента OKX.
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision'.
+        """
+        return {
+            'tick_size': safe_float(instrument['tickSz']),
+            'min_order_size': safe_float(instrument['minSz']),
+            'base_precision': safe_float(instrument['lotSz']),
+        }
+
+
+# Адаптеры бирж для рыночных данных, выбираются один раз в TradingStrategy.__init__
+_ADAPTERS = {
+    'bybit': _BybitAdapter(),
+    'binance': _BinanceAdapter(),
+    'okx': _OKXAdapter(),
+}
+
+
 class TradingStrategy:
-    def __init__(self, bot):
+    def __init__(self, bot, position_obj=None):
         """
         Инициализирует стратегию торговли с использованием данных бота.
 
         Args:
             bot (Bot): Экземпляр модели Bot.
+            position_obj (BotPosition, optional): Заранее загруженная позиция бота. Если не передана,
+                берётся bot.position (без запроса, если бот загружен с select_related('position')),
+                а при её отсутствии создаётся.
         """
         self.bot = bot
+        self.bot_id = bot.id
         self.exchange = bot.api_key.exchange.lower()
         decrypted_keys = bot.api_key.get_decrypted_keys()
         self.api_key = decrypted_keys['api_key']
         self.api_secret = decrypted_keys['api_secret']
+        # HMAC с уже обработанным ключом живёт вместе со стратегией: на каждую подпись копируется состояние
+        self._hmac_template = hmac.new(self.api_secret.encode('utf-8'), None, hashlib.sha256)
+        self._order_stream = (
+            get_order_stream(bot.api_key_id, self.api_key, self.api_secret, self.bot_id)
+            if _ORDER_STREAM_ENABLED and self.exchange == 'bybit' else None
+        )
         self.settings = bot.settings
         self.take_profit = self.settings.take_profit / 100
         self.stop_loss = (self.settings.stop_loss / 100) if self.settings.stop_loss else None
@@ -54,38 +710,116 @@ class TradingStrategy:
         self.signal_interval = self.settings.signal_interval
         self.combined_signals = self.settings.combined_signals or []
         self.combined_strategies = self.settings.combined_strategies or []
-        self.position_obj, _ = BotPosition.objects.get_or_create(bot=bot)
+        self.ma_crossover_type = self.settings.ma_crossover_type
+        self.pivot_points_period = self.settings.pivot_points_period
+        self._load_position(position_obj)
+        self.recv_window = getattr(settings, 'API_RECV_WINDOW', 10000)
+        self._recv_window_str = str(self.recv_window)
+        # Часть подписи Bybit после времени (ключ + окно) не меняется: кодируем её один раз
+        self._bybit_sign_infix = (self.api_key + self._recv_window_str).encode('utf-8')
+        # Неизменные заголовки подписанных запросов; на каждый запрос добавляются только время и подпись
+        self._base_headers = {
+            'bybit': {"X-BAPI-API-KEY": self.api_key, "X-BAPI-RECV-WINDOW": self._recv_window_str},
+            'binance': {"X-MBX-APIKEY": self.api_key},
+            'okx': {"OK-ACCESS-KEY": self.api_key, "OK-ACCESS-PASSPHRASE": ""},
+        }.get(self.exchange, {})
+        self.category = 'linear' if self.bot.strategy == 'futures' else 'spot'
+        # Нормализованная пара и общая часть ключей кэша рыночных данных
+        self._trading_pair_norm = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
+        # instId OKX ('BTC-USDT', для фьючерсов 'BTC-USDT-SWAP'); пара в боте может храниться и без "/"
+        self._symbol_okx = okx_inst_id(self._trading_pair_norm, self.category)
+        # Символ для пакетных запросов ExchangeAPI: OKX принимает только instId
+        self._exchange_symbol = self._symbol_okx if self.exchange == 'okx' else self._trading_pair_norm
+        self._ck = f"{self.exchange}_{self._trading_pair_norm}_{self.category}"
+        self._adapter = _ADAPTERS.get(self.exchange)
+        self._symbol_info_cache = None
+        # Свечи и разобранные ряды в пределах одной итерации, ключ — (interval, limit)
+        self._klines_cache = {}
+        self._candles_cache = {}
+        # Объёмы ордеров сетки по уровням и шаг объёма, считаются один раз за итерацию
+        self._qty_ladder = None
+        self._qty_step = None
+        logger.debug("Инициализирована стратегия для бота %s (пользователь %s): exchange=%s, trading_pair=%s, category=%s",
+                     bot.id, bot.api_key.user.username, self.exchange, bot.trading_pair, self.category)
+
+    def _load_position(self, position_obj=None):
+        """
+        Загружает состояние позиции бота в атрибуты стратегии.
+
+        Args:
+            position_obj (BotPosition, optional): Заранее загруженная позиция; если не передана,
+                берётся bot.position, а при её отсутствии создаётся.
+        """
+        if position_obj is None:
+            try:
+                position_obj = self.bot.position
+            except BotPosition.DoesNotExist:
+                position_obj, _ = BotPosition.objects.get_or_create(bot=self.bot)
+        self.position_obj = position_obj
         self.position = self.position_obj.position
         self.avg_price = self.position_obj.avg_price
         self.sell_order_id = self.position_obj.sell_order_id
         self.buy_orders = self.position_obj.buy_orders if self.position_obj.buy_orders else []
         self.position_opened = self.position_obj.position_opened
         self.highest_price = self.position_obj.highest_price or self.avg_price
-        self.recv_window = getattr(settings, 'API_RECV_WINDOW', 10000)
-        self.category = 'linear' if self.bot.strategy == 'futures' else 'spot'
-        logger.debug("Инициализирована стратегия для бота %s (пользователь %s): exchange=%s, trading_pair=%s, category=%s",
-                     bot.id, bot.api_key.user.username, self.exchange, bot.trading_pair, self.category)
+
+    def rebind(self, bot):
+        """
+        Привязывает стратегию из кэша к свежезагруженному боту и перечитывает позицию.
+
+        Используется, когда настройки и ключи бота не менялись с момента создания стратегии.
+
+        Args:
+            bot (Bot): Экземпляр модели Bot, загруженный на этой итерации.
+        """
+        self.bot = bot
+        self.settings = bot.settings
+        self._load_position()
+        self._reset_tick_cache()
+
+    def _reset_tick_cache(self):
+        """
+        Сбрасывает данные, действительные в пределах одной итерации: свечи, параметры инструмента, объёмы сетки.
+        """
+        self._klines_cache.clear()
+        self._candles_cache.clear()
+        self._symbol_info_cache = None
+        self._qty_ladder = None
+        self._qty_step = None
+
+    def _save_position(self, fields):
+        """
+        Записывает в БД только указанные поля позиции одним UPDATE через QuerySet.update(),
+        минуя Model.save() (сигналов у BotPosition нет). Значения берутся из self.position_obj.
+
+        Args:
+            fields (list): Имена изменённых полей BotPosition.
+        """
+        BotPosition.objects.filter(pk=self.position_obj.pk).update(
+            **{field: getattr(self.position_obj, field) for field in fields}
+        )
 
     def execute(self):
         """
         Выполняет одну итерацию стратегии торговли.
         """
         logger.info("Выполнение стратегии для бота %s, trade_mode=%s, combined_strategies=%s",
-                    self.bot.id, self.bot.trade_mode, self.combined_strategies)
+                    self.bot_id, self.bot.trade_mode, self.combined_strategies)
+        self._reset_tick_cache()
         try:
+            # Баланс и рыночные данные запрашиваем параллельно
+            balance_data = self.prefetch_market_data()
+
             # Проверяем баланс и маржу для фьючерсов
-            balance_data = ExchangeAPI.get_balance(
-                self.exchange, self.api_key, self.api_secret, category=self.category
-            )
             if self.category == 'futures':
                 margin_ratio = balance_data.get('margin_data', {}).get('margin_ratio', 0)
                 available_balance = balance_data.get('available_balance', 0)
                 if margin_ratio > 0.9:
-                    logger.warning(f"Высокий коэффициент маржи: {margin_ratio}. Остановка бота {self.bot.id}")
+                    logger.warning("Высокий коэффициент маржи: %s. Остановка бота %s", margin_ratio, self.bot_id)
                     self.stop_bot()
                     return
                 if available_balance <= 0:
-                    logger.warning(f"Недостаточно средств для торговли фьючерсами: {available_balance}. Остановка бота {self.bot.id}")
+                    logger.warning("Недостаточно средств для торговли фьючерсами: %s. Остановка бота %s", available_balance, self.bot_id)
                     self.stop_bot()
                     return
 
@@ -103,13 +837,58 @@ class TradingStrategy:
 
             # Проверяем, нужно ли остановить бота после сделок
             if self.stop_after_deals and self.bot.deals_completed >= self.stop_after_deals:
-                logger.info(f"Бот {self.bot.id} остановлен после завершения {self.bot.deals_completed} сделок")
+                logger.info("Бот %s остановлен после завершения %s сделок", self.bot_id, self.bot.deals_completed)
                 self.stop_bot()
 
         except Exception as e:
-            logger.error("Ошибка при выполнении стратегии для бота %s: %s", self.bot.id, str(e), exc_info=True)
+            logger.error("Ошибка при выполнении стратегии для бота %s: %s", self.bot_id, str(e), exc_info=True)
             raise
 
+    def prefetch_market_data(self):
+        """
+        Параллельно запрашивает баланс, свечи, текущую цену и параметры инструмента.
+
+        Свечи, цена и параметры инструмента попадают в кэш и переиспользуются стратегией,
+        поэтому итерация ждёт самый медленный запрос, а не сумму всех.
+
+        Returns:
+            dict: Данные баланса от ExchangeAPI.get_balance.
+
+        Raises:
+            Exception: Ошибка получения баланса пробрасывается как при последовательном вызове.
+        """
+        balance_future = _IO_POOL.submit(
+            ExchangeAPI.get_balance, self.exchange, self.api_key, self.api_secret, category=self.category
+        )
+        # Одним обращением к кэшу проверяем, какие данные уже есть
+        klines_key = f"klines_{self._ck}_{self.signal_interval}_100"
+        price_key = f"price_{self._ck}"
+        symbol_info_key = f"symbol_info_{self._ck}"
+        self._symbol_info_cache = ttl_peek(symbol_info_key)
+        keys = [klines_key, price_key]
+        if self._symbol_info_cache is None:
+            keys.append(symbol_info_key)
+        cached = cache.get_many(keys)
+        if isinstance(cached.get(klines_key), tuple):
+            self._klines_cache[(self.signal_interval, 100)] = cached[klines_key]
+        if cached.get(symbol_info_key):
+            self._symbol_info_cache = cached[symbol_info_key]
+            ttl_put(symbol_info_key, cached[symbol_info_key], LOCAL_CACHE_TTL)
+
+        market_futures = []
+        if klines_key not in cached:
+            market_futures.append(_IO_POOL.submit(self.get_klines, self.signal_interval, 100))
+        if price_key not in cached:
+            market_futures.append(_IO_POOL.submit(self.get_current_price))
+        if self._symbol_info_cache is None:
+            market_futures.append(_IO_POOL.submit(self._symbol_info))
+        for future in market_futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("Ошибка предварительной загрузки рыночных данных для бота %s: %s", self.bot.id, str(e))
+        return balance_future.result()
+
     def run_strategy(self):
         """
         Выполняет выбранную стратегию торговли.
@@ -143,85 +922,26 @@ class TradingStrategy:
 
     def check_combined_signal(self):
         """
-        Проверяет комбинацию сигналов.
+        Проверяет комбинацию сигналов, останавливаясь на первом несработавшем.
 
         Returns:
             bool: True, если все сигналы сработали, иначе False.
         """
-        signals = self.settings.combined_signals  # Например, [{'type': 'rsi', 'threshold': 30}, {'type': 'macd', 'condition': 'crossover'}]
-        results = []
-        klines = self.get_klines(self.signal_interval, limit=100)
-        if not klines:
-            logger.warning(f"Не удалось получить свечи для проверки комбинированных сигналов для бота {self.bot.id}")
+        signals = self.combined_signals  # Например, [{'type': 'rsi', 'threshold': 30}, {'type': 'macd', 'condition': 'crossover'}]
+        candles = self.get_candles(self.signal_interval, limit=100)
+        if not candles:
+            logger.warning("Не удалось получить свечи для проверки комбинированных сигналов для бота %s", self.bot_id)
             return False
 
-        closes = [safe_float(kline[4]) for kline in klines]
-        highs = [safe_float(kline[2]) for kline in klines]
-        lows = [safe_float(kline[3]) for kline in klines]
-        volumes = [safe_float(kline[5]) for kline in klines]
-
         for signal in signals:
             signal_type = signal.get('type')
-            if signal_type == 'rsi':
-                period = signal.get('period', 14)
-                threshold = signal.get('threshold', 30)
-                rsi = calculate_rsi(tuple(closes), period)
-                if rsi is None:
-                    logger.warning(f"RSI не рассчитан для бота {self.bot.id}, недостаточно данных")
-                    results.append(False)
-                    continue
-                results.append(rsi < threshold)
-                logger.debug(f"Комбинированный сигнал RSI для бота {self.bot.id}: RSI={rsi}, threshold={threshold}, result={rsi < threshold}")
-            elif signal_type == 'macd':
-                fast_period = signal.get('fast_period', 12)
-                slow_period = signal.get('slow_period', 26)
-                signal_period = signal.get('signal_period', 9)
-                condition = signal.get('condition', 'crossover')
-                macd, signal_line, _ = calculate_macd(tuple(closes), fast_period, slow_period, signal_period)
-                if macd is None or signal_line is None:
-                    logger.warning(f"MACD не рассчитан для бота {self.bot.id}, недостаточно данных")
-                    results.append(False)
-                    continue
-                if len(closes) < 2:
-                    logger.warning(f"Недостаточно данных для проверки MACD crossover для бота {self.bot.id}")
-                    results.append(False)
-                    continue
-                prev_macd, prev_signal_line, _ = calculate_macd(tuple(closes[:-1]), fast_period, slow_period, signal_period)
-                crossover = macd > signal_line and prev_macd <= prev_signal_line
-                result = crossover if condition == 'crossover' else False
-                results.append(result)
-                logger.debug(f"Комбинированный сигнал MACD для бота {self.bot.id}: MACD={macd}, Signal={signal_line}, crossover={crossover}")
-            elif signal_type == 'ma_crossover':
-                short_period = signal.get('short_period', 10)
-                long_period = signal.get('long_period', 20)
-                short_ma, long_ma, prev_short_ma, prev_long_ma = calculate_ma_crossover(
-                    tuple(closes), short_period, long_period, ma_type=self.settings.ma_crossover_type
-                )
-                if any(v is None for v in [short_ma, long_ma, prev_short_ma, prev_long_ma]):
-                    logger.warning(f"MA Crossover не рассчитан для бота {self.bot.id}, недостаточно данных")
-                    results.append(False)
-                    continue
-                logger.debug(f"Комбинированный сигнал MA Crossover для бота {self.bot.id}: Short={short_ma}, Long={long_ma}, Prev Short={prev_short_ma}, Prev Long={prev_long_ma}")
-                results.append(short_ma > long_ma and prev_short_ma <= prev_long_ma)
-            elif signal_type == 'pivot_points':
-                pivot, r1, s1 = calculate_pivot_points(
-                    tuple(highs), tuple(lows), tuple(closes), period=self.settings.pivot_points_period
-                )
-                if any(v is None for v in [pivot, r1, s1]):
-                    logger.warning(f"Pivot Points не рассчитаны для бота {self.bot.id}, недостаточно данных")
-                    results.append(False)
-                    continue
-                current_price = closes[-1]
-                condition = signal.get('condition', 'above_resistance')
-                logger.debug(f"Комбинированный сигнал Pivot Points для бота {self.bot.id}: Pivot={pivot}, R1={r1}, S1={s1}, Price={current_price}, Condition={condition}")
-                results.append(current_price > r1 if condition == 'above_resistance' else current_price < s1)
-            else:
-                # Для других типов сигналов используем check_single_signal
-                result = self.check_single_signal(signal_type, signal)
-                results.append(result)
-                logger.debug(f"Комбинированный сигнал {signal_type} для бота {self.bot.id}: result={result}")
+            result = self.evaluate_signal(signal_type, signal, candles)
+            logger.debug("Комбинированный сигнал %s для бота %s: result=%s", signal_type, self.bot_id, result)
+            # Сигналы объединяются по И: остальные индикаторы после первого отказа не считаем
+            if not result:
+                return False
 
-        return all(results)
+        return True
 
     def check_single_signal(self, signal_type, signal_params):
         """
@@ -234,186 +954,111 @@ class TradingStrategy:
         Returns:
             bool: True, если сигнал сработал, иначе False.
         """
-        klines = self.get_klines(self.signal_interval, limit=100)
-        if not klines:
-            logger.warning(f"Не удалось получить свечи для проверки сигнала для бота {self.bot.id}")
+        candles = self.get_candles(self.signal_interval, limit=100)
+        if not candles:
+            logger.warning("Не удалось получить свечи для проверки сигнала для бота %s", self.bot_id)
             return False
+        return self.evaluate_signal(signal_type, signal_params, candles)
 
-        highs = [safe_float(kline[2]) for kline in klines]
-        lows = [safe_float(kline[3]) for kline in klines]
-        closes = [safe_float(kline[4]) for kline in klines]
-        volumes = [safe_float(kline[5]) for kline in klines]
-
-        if signal_type == 'rsi':
-            period = signal_params.get('period', 14)
-            threshold = signal_params.get('threshold', 30)
-            rsi = calculate_rsi(tuple(closes), period)
-            if rsi is None:
-                logger.warning(f"RSI не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"RSI: {rsi}, Порог: {threshold}, Интервал: {self.signal_interval}")
-            return rsi < threshold
-        elif signal_type == 'cci':
-            period = signal_params.get('period', 20)
-            threshold = signal_params.get('threshold', -100)
-            cci = calculate_cci(tuple(highs), tuple(lows), tuple(closes), period)
-            if cci is None:
-                logger.warning(f"CCI не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"CCI: {cci}, Порог: {threshold}")
-            return cci < threshold
-        elif signal_type == 'mfi':
-            period = signal_params.get('period', 14)
-            threshold = signal_params.get('threshold', 20)
-            mfi = calculate_mfi(tuple(highs), tuple(lows), tuple(closes), tuple(volumes), period)
-            if mfi is None:
-                logger.warning(f"MFI не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"MFI: {mfi}, Порог: {threshold}")
-            return mfi < threshold
-        elif signal_type == 'macd':
-            fast_period = signal_params.get('fast_period', 12)
-            slow_period = signal_params.get('slow_period', 26)
-            signal_period = signal_params.get('signal_period', 9)
-            condition = signal_params.get('condition', 'crossover')
-            macd_line, signal_line, _ = calculate_macd(tuple(closes), fast_period, slow_period, signal_period)
-            if macd_line is None or signal_line is None:
-                logger.warning(f"MACD не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            prev_macd_line, prev_signal_line, _ = calculate_macd(tuple(closes[:-1]), fast_period, slow_period, signal_period)
-            if prev_macd_line is None or prev_signal_line is None:
-                logger.warning(f"Недостаточно данных для проверки MACD crossover для бота {self.bot.id}")
-                return False
-            logger.debug(f"MACD: {macd_line}, Signal: {signal_line}, Prev MACD: {prev_macd_line}, Prev Signal: {prev_signal_line}")
-            if condition == 'crossover':
-                return macd_line > signal_line and prev_macd_line <= prev_signal_line
-            elif condition == 'crossunder':
-                return macd_line < signal_line and prev_macd_line >= prev_signal_line
-            return False
-        elif signal_type == 'bollinger_bands':
-            period = signal_params.get('period', 20)
-            dev = signal_params.get('dev', 2)
-            upper, lower, _ = calculate_bollinger_bands(tuple(closes), period, dev)
-            if upper is None or lower is None:
-                logger.warning(f"Bollinger Bands не рассчитаны для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"Bollinger Bands: Upper={upper}, Lower={lower}, Price={closes[-1]}")
-            return closes[-1] < lower
-        elif signal_type == 'stochastic':
-            k_period = signal_params.get('k_period', 14)
-            d_period = signal_params.get('d_period', 3)
-            threshold = signal_params.get('threshold', 20)
-            k, _ = calculate_stochastic(tuple(highs), tuple(lows), tuple(closes), k_period, d_period)
-            if k is None:
-                logger.warning(f"Stochastic не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"Stochastic %K: {k}, Порог: {threshold}")
-            return k < threshold
-        elif signal_type == 'price':
-            current_price = self.get_current_price()
-            target_price = signal_params.get('target_price')
-            logger.debug(f"Current price: {current_price}, Target price: {target_price}")
-            return current_price <= target_price if current_price and target_price else False
-        elif signal_type == 'volume_spike':
-            lookback = signal_params.get('lookback', 10)
-            threshold = signal_params.get('threshold', 2)
-            current_volume, avg_volume = calculate_volume_spike(tuple(volumes), lookback)
-            if current_volume is None or avg_volume is None:
-                logger.warning(f"Volume Spike не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"Volume Spike: Current={current_volume}, Avg={avg_volume}, Порог={threshold}")
-            return current_volume > avg_volume * threshold
-        elif signal_type == 'ma_crossover':
-            short_period = signal_params.get('short_period', 10)
-            long_period = signal_params.get('long_period', 20)
-            short_ma, long_ma, prev_short_ma, prev_long_ma = calculate_ma_crossover(
-                tuple(closes), short_period, long_period, ma_type=self.settings.ma_crossover_type
-            )
-            if any(v is None for v in [short_ma, long_ma, prev_short_ma, prev_long_ma]):
-                logger.warning(f"MA Crossover не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"MA Crossover: Short={short_ma}, Long={long_ma}, Prev Short={prev_short_ma}, Prev Long={prev_long_ma}")
-            return short_ma > long_ma and prev_short_ma <= prev_long_ma
-        elif signal_type == 'pivot_points':
-            pivot, r1, s1 = calculate_pivot_points(
-                tuple(highs), tuple(lows), tuple(closes), period=self.settings.pivot_points_period
-            )
-            if any(v is None for v in [pivot, r1, s1]):
-                logger.warning(f"Pivot Points не рассчитаны для бота {self.bot.id}, недостаточно данных")
-                return False
-            current_price = closes[-1]
-            condition = signal_params.get('condition', 'above_resistance')
-            logger.debug(f"Pivot Points: Pivot={pivot}, R1={r1}, S1={s1}, Price={current_price}, Condition={condition}")
-            return current_price > r1 if condition == 'above_resistance' else current_price < s1
-        elif signal_type == 'adx':
-            period = signal_params.get('period', 14)
-            threshold = signal_params.get('threshold', 25)
-            adx = calculate_adx(tuple(highs), tuple(lows), tuple(closes), period)
-            if adx is None:
-                logger.warning(f"ADX не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"ADX: {adx}, Порог: {threshold}")
-            return adx > threshold
-        elif signal_type == 'atr':
-            period = signal_params.get('period', 14)
-            threshold = signal_params.get('threshold', 1.0)
-            atr = calculate_atr(tuple(highs), tuple(lows), tuple(closes), period)
-            if atr is None:
-                logger.warning(f"ATR не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            logger.debug(f"ATR: {atr}, Порог: {threshold}")
-            return atr > threshold
-        elif signal_type == 'ichimoku':
-            tenkan_period = signal_params.get('tenkan_period', 9)
-            kijun_period = signal_params.get('kijun_period', 26)
-            senkou_period = signal_params.get('senkou_period', 52)
-            condition = signal_params.get('condition', 'above_cloud')
-            senkou_a, senkou_b, kijun, tenkan = calculate_ichimoku(
-                tuple(highs), tuple(lows), tuple(closes), tenkan_period, kijun_period, senkou_period
-            )
-            if any(v is None for v in [senkou_a, senkou_b]):
-                logger.warning(f"Ichimoku не рассчитан для бота {self.bot.id}, недостаточно данных")
-                return False
-            current_price = closes[-1]
-            cloud_top = max(senkou_a, senkou_b)
-            cloud_bottom = min(senkou_a, senkou_b)
-            logger.debug(f"Ichimoku: Senkou A={senkou_a}, Senkou B={senkou_b}, Price={current_price}, Condition={condition}")
-            if condition == 'above_cloud':
-                return current_price > cloud_top
-            elif condition == 'below_cloud':
-                return current_price < cloud_bottom
-            return False
-        else:
-            logger.warning(f"Неизвестный тип сигнала для бота {self.bot.id}: {signal_type}")
+    def evaluate_signal(self, signal_type, signal_params, candles):
+        """
+        Вычисляет сигнал по таблице обработчиков _SIGNAL_HANDLERS.
+
+        Args:
+            signal_type (str): Тип сигнала.
+            signal_params (dict): Параметры сигнала.
+            candles (dict): Ряды свечей ('high', 'low', 'close', 'volume').
+
+        Returns:
+            bool: True, если сигнал сработал, иначе False.
+        """
+        handler = _SIGNAL_HANDLERS.get(signal_type)
+        if handler is None:
+            logger.warning("Неизвестный тип сигнала для бота %s: %s", self.bot_id, signal_type)
             return False
+        return bool(handler(self, candles, signal_params))
+
+    def get_candles(self, interval, limit=100):
+        """
+        Получает свечи и раскладывает их на ряды цен и объемов.
+
+        Args:
+            interval (str): Интервал свечей.
+            limit (int): Количество свечей.
+
+        Returns:
+            dict: Массивы numpy по ключам 'timestamp', 'open', 'high', 'low', 'close', 'volume'
+                строки 'token' (кэш индикаторов) и 'series' (состояние потоковых индикаторов), 'rolling' (RollingContext), или None, если свечей нет.
+        """
+        candles = self._candles_cache.get((interval, limit))
+        if candles is not None:
+            return candles
+        columns = self.get_klines(interval, limit=limit)
+        if columns is None:
+            return None
+        timestamps, prices = columns
+        candles = {
+            'timestamp': timestamps,
+            'open': prices[0],
+            'high': prices[1],
+            'low': prices[2],
+            'close': prices[3],
+            'volume': prices[4],
+        }
+        # Общие скользящие окна для Bollinger, Stochastic, SMA-пересечения и Volume Spike
+        candles['rolling'] = RollingContext(candles['close'], candles['high'], candles['low'], candles['volume'])
+        # Ключ ряда для состояния потоковых индикаторов (RSI, ATR): не зависит от обновлений свечей
+        candles['series'] = f"{self._ck}_{interval}_{len(timestamps)}"
+        # Токен набора свечей для кэша индикаторов: меняется с новой свечой и с каждым обновлением текущей
+        newest = int(candles['timestamp'].argmax())
+        candles['token'] = (
+            f"{self._ck}_{interval}_{len(timestamps)}_{candles['timestamp'][newest]}_"
+            f"{candles['open'][newest]}_{candles['high'][newest]}_{candles['low'][newest]}_"
+            f"{candles['close'][newest]}_{candles['volume'][newest]}"
+        )
+        self._candles_cache[(interval, limit)] = candles
+        return candles
 
     def get_klines(self, interval, limit=100):
         """
         Получает исторические свечи для расчёта индикаторов, с поддержкой разных бирж и категорий.
 
+        Свечи переводятся в колоночный вид сразу после загрузки и в таком виде кэшируются.
+
         Args:
             interval (str): Интервал свечей (например, '1h', '1d').
             limit (int): Количество свечей.
 
         Returns:
-            list: Список свечей или None в случае ошибки.
+            tuple: (timestamps, prices) в формате _klines_to_columns или None, если свечей нет или произошла ошибка.
         """
-        cache_key = f"klines_{self.bot.trading_pair}_{interval}_{limit}_{self.category}"
-        klines = cache.get(cache_key)
-        if klines is not None:
-            logger.debug(f"Свечи для {self.bot.trading_pair} извлечены из кэша для бота {self.bot.id}")
+        columns = self._klines_cache.get((interval, limit))
+        if columns is not None:
+            return columns
+        cache_key = f"klines_{self._ck}_{interval}_{limit}"
+        columns = cache.get(cache_key)
+        if columns is not None:
+            logger.debug("Свечи для %s извлечены из кэша для бота %s", self.bot.trading_pair, self.bot_id)
+            if isinstance(columns, list):
+                # Запись старого формата (список свечей), оставшаяся в кэше
+                columns = _klines_to_columns(columns) if columns else None
         else:
-            trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
+            trading_pair = self._trading_pair_norm
             try:
                 klines = ExchangeAPI.get_klines(
                     self.exchange, trading_pair, interval, limit, category=self.category
                 )
-                cache.set(cache_key, klines, timeout=settings.KLINES_CACHE_TIMEOUT)
-                logger.debug(f"Свечи для {trading_pair} закэшированы на {settings.KLINES_CACHE_TIMEOUT} секунд")
             except Exception as e:
-                logger.error(f"Ошибка получения свечей для {self.exchange} для бота {self.bot.id}: {str(e)}")
+                logger.error(f"Ошибка получения свечей для {self.exchange} для бота {self.bot_id}: {str(e)}")
                 return None
-        return klines
+            if not klines:
+                return None
+            columns = _klines_to_columns(klines)
+            cache.set(cache_key, columns, timeout=settings.KLINES_CACHE_TIMEOUT)
+            logger.debug("Свечи для %s закэшированы на %s секунд", trading_pair, settings.KLINES_CACHE_TIMEOUT)
+        if columns is not None:
+            self._klines_cache[(interval, limit)] = columns
+        return columns
 
     def get_current_price(self, category=None):
         """
@@ -426,122 +1071,172 @@ class TradingStrategy:
             float: Текущая цена или None в случае ошибки.
         """
         category = category or self.category
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
+        trading_pair = self._trading_pair_norm
         if not trading_pair:
             logger.error(f"Торговая пара не указана для бота {self.bot.id}")
             return None
+        if _PRICE_FEED is not None:
+            price = _PRICE_FEED.get_price(self.exchange, trading_pair, category)
+            if price:
+                logger.debug("Текущая цена для %s (%s) из потока: %s", trading_pair, category, price)
+                return price
         cache_key = f"price_{self.exchange}_{trading_pair}_{category}"
         price = cache.get(cache_key)
         if price is not None:
-            logger.debug(f"Текущая цена для {trading_pair} ({category}) извлечена из кэша: {price}")
+            logger.debug("Текущая цена для %s (%s) извлечена из кэша: %s", trading_pair, category, price)
             return price
 
-        try:
-            if self.exchange == 'bybit':
-                url = f"https://api.bybit.com/v5/market/tickers?category={category}&symbol={trading_pair}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['retCode'] == 0:
-                    price = safe_float(data['result']['list'][0]['lastPrice'])
-                else:
-                    logger.error(f"Ошибка получения цены на Bybit для {trading_pair}: {data['retMsg']}")
-                    return None
-            elif self.exchange == 'binance':
-                url = "https://api.binance.com/api/v3/ticker/price" if category == 'spot' else "https://fapi.binance.com/fapi/v1/ticker/price"
-                params = {"symbol": trading_pair}
-                response = requests.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                price = safe_float(data['price'])
-            elif self.exchange == 'okx':
-                url = f"https://www.okx.com/api/v5/market/ticker?instId={trading_pair.replace('/', '-')}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['code'] == '0':
-                    price = safe_float(data['data'][0]['last'])
-                else:
-                    logger.error(f"Ошибка получения цены на OKX для {trading_pair}: {data['msg']}")
-                    return None
-            else:
-                logger.error(f"Биржа {self.exchange} не поддерживается для получения цены")
-                return None
+        if self._adapter is None:
+            logger.error(f"Биржа {self.exchange} не поддерживается для получения цены")
+            return None
 
+        try:
+            price = self._adapter.fetch_price(trading_pair, category, _HTTP)
             if price:
                 cache.set(cache_key, price, timeout=settings.PRICE_CACHE_TIMEOUT)
-                logger.debug(f"Текущая цена для {trading_pair} ({category}): {price}, закэширована на {settings.PRICE_CACHE_TIMEOUT} секунд")
+                logger.debug("Текущая цена для %s (%s): %s, закэширована на %s секунд", trading_pair, category, price, settings.PRICE_CACHE_TIMEOUT)
             return price
-        except requests.RequestException as e:
+        except _HTTP_ERRORS as e:
             logger.error(f"Ошибка запроса цены для {trading_pair} на {self.exchange}: {str(e)}")
             return None
 
-    def get_price_precision(self):
+    def get_current_prices(self, categories):
         """
-        Получает точность цены для торговой пары.
+        Получает текущие цены пары в нескольких категориях.
+
+        Кэш проверяется одним запросом, недостающие цены запрашиваются у биржи параллельно,
+        так что задержка равна самому медленному запросу, а не их сумме.
+
+        Args:
+            categories (Iterable[str]): Категории ('spot', 'linear').
 
         Returns:
-            float: Значение tick size.
+            dict: Цена по категории (None в случае ошибки).
+        """
+        prices = {}
+        if _PRICE_FEED is not None and self._trading_pair_norm:
+            for category in categories:
+                prices[category] = _PRICE_FEED.get_price(self.exchange, self._trading_pair_norm, category)
+        keys = {
+            category: f"price_{self.exchange}_{self._trading_pair_norm}_{category}"
+            for category in categories if not prices.get(category)
+        }
+        cached = cache.get_many(list(keys.values())) if self._trading_pair_norm and keys else {}
+        prices.update((category, cached.get(key)) for category, key in keys.items())
+        futures = {
+            category: _IO_POOL.submit(self.get_current_price, category=category)
+            for category, price in prices.items() if price is None
+        }
+        for category, future in futures.items():
+            prices[category] = future.result()
+        return prices
+
+    @classmethod
+    def _load_exchange_filters(cls, exchange, category):
         """
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
-        cache_key = f"tick_size_{self.exchange}_{trading_pair}_{self.category}"
-        tick_size = cache.get(cache_key)
-        if tick_size is not None:
-            logger.debug(f"Tick size для {trading_pair} извлечён из кэша: {tick_size}")
-            return tick_size
+        Возвращает параметры всех инструментов биржи и категории.
+
+        Список загружается одним запросом и кэшируется на час, поэтому промах кэша по новой
+        паре не требует обращения к бирже, а полная exchangeInfo Binance разбирается раз в час.
+        Поверх кэша Django словарь хранится в памяти процесса, чтобы не загружать его из Redis
+        целиком при каждом промахе по паре.
+
+        Args:
+            exchange (str): Биржа.
+            category (str): Категория ('spot' или 'linear').
+
+        Returns:
+            dict: Словарь {символ: {'tick_size', 'min_order_size', 'base_precision'}} или None в случае ошибки.
+        """
+        adapter = _ADAPTERS.get(exchange)
+        if adapter is None:
+            return None
+        cache_key = f"exchange_filters_{exchange}_{category}"
+        return ttl_get(cache_key, EXCHANGE_FILTERS_TTL, lambda: cls._fetch_exchange_filters(adapter, exchange, category, cache_key))
+
+    @staticmethod
+    def _fetch_exchange_filters(adapter, exchange, category, cache_key):
+        """
+        Загружает параметры инструментов из кэша Django или одним запросом к бирже.
+
+        Returns:
+            dict: Словарь параметров по символам или None в случае ошибки.
+        """
+        filters = cache.get(cache_key)
+        if filters is None:
+            try:
+                filters = adapter.fetch_instruments(category, _HTTP)
+            except _HTTP_ERRORS as e:
+                logger.error(f"Ошибка загрузки списка инструментов {exchange} ({category}): {str(e)}")
+                return None
+            except (KeyError, IndexError, TypeError) as e:
+                logger.error(f"Некорректный ответ со списком инструментов {exchange} ({category}): {str(e)}")
+                return None
+            if filters:
+                cache.set(cache_key, filters, timeout=EXCHANGE_FILTERS_TTL)
+                logger.debug("Параметры %s инструментов %s (%s) закэшированы", len(filters), exchange, category)
+        return filters
+
+    def _symbol_info(self):
+        """
+        Получает параметры инструмента (tick size, минимальный размер ордера, шаг объёма) одним запросом.
+
+        Значение хранится в локальном кэше процесса LOCAL_CACHE_TTL секунд, поэтому новые
+        экземпляры стратегии не обращаются за ним к Redis на каждой итерации.
+
+        Returns:
+            dict: Словарь с ключами 'tick_size', 'min_order_size', 'base_precision' или None в случае ошибки.
+        """
+        if self._symbol_info_cache is None:
+            self._symbol_info_cache = ttl_get(f"symbol_info_{self._ck}", LOCAL_CACHE_TTL, self._load_symbol_info)
+        return self._symbol_info_cache
+
+    def _load_symbol_info(self):
+        """
+        Загружает параметры инструмента из кэша Django или с биржи.
+
+        Returns:
+            dict: Параметры инструмента или None в случае ошибки.
+        """
+        trading_pair = self._trading_pair_norm
+        cache_key = f"symbol_info_{self._ck}"
+        info = cache.get(cache_key)
+        if info is not None:
+            logger.debug("Параметры инструмента %s извлечены из кэша: %s", trading_pair, info)
+            return info
+
+        if self._adapter is None:
+            logger.error(f"Биржа {self.exchange} не поддерживается для получения параметров инструмента")
+            return None
 
         try:
-            if self.exchange == 'bybit':
-                url = f"https://api.bybit.com/v5/market/instruments-info?category={self.category}&symbol={trading_pair}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['retCode'] == 0:
-                    tick_size = safe_float(data['result']['list'][0]['priceFilter']['tickSize'])
-                else:
-                    logger.error(f"Ошибка получения tick size на Bybit для {trading_pair}: {data['retMsg']}")
-                    return 0.0001
-            elif self.exchange == 'binance':
-                url = "https://api.binance.com/api/v3/exchangeInfo" if self.category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                for symbol in data['symbols']:
-                    if symbol['symbol'] == trading_pair:
-                        for filt in symbol['filters']:
-                            if filt['filterType'] == 'PRICE_FILTER':
-                                tick_size = safe_float(filt['tickSize'])
-                                break
-                        break
-                else:
-                    logger.error(f"Торговая пара {trading_pair} не найдена на Binance")
-                    return 0.0001
-            elif self.exchange == 'okx':
-                url = f"https://www.okx.com/api/v5/public/instruments?instType={'SPOT' if self.category == 'spot' else 'SWAP'}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['code'] == '0':
-                    for instrument in data['data']:
-                        if instrument['instId'] == trading_pair.replace('/', '-'):
-                            tick_size = safe_float(instrument['tickSz'])
-                            break
-                    else:
-                        logger.error(f"Торговая пара {trading_pair} не найдена на OKX")
-                        return 0.0001
-                else:
-                    logger.error(f"Ошибка получения tick size на OKX для {trading_pair}: {data['msg']}")
-                    return 0.0001
-            else:
-                logger.error(f"Биржа {self.exchange} не поддерживается для получения tick size")
-                return 0.0001
+            filters = self._load_exchange_filters(self.exchange, self.category)
+            info = filters.get(trading_pair) if filters else None
+            if info is None:
+                # Пары нет в общем списке (например, только что добавлена): запрашиваем её отдельно
+                info = self._adapter.fetch_instrument(trading_pair, self.category, _HTTP)
+            if info is None:
+                return None
 
-            cache.set(cache_key, tick_size, timeout=3600)
-            logger.debug(f"Tick size для {trading_pair} закэширован: {tick_size}")
-            return tick_size
-        except requests.RequestException as e:
-            logger.error(f"Ошибка запроса tick size для {trading_pair} на {self.exchange}: {str(e)}")
-            return 0.0001
+            cache.set(cache_key, info, timeout=3600)
+            logger.debug("Параметры инструмента %s закэшированы: %s", trading_pair, info)
+            return info
+        except _HTTP_ERRORS as e:
+            logger.error(f"Ошибка запроса параметров инструмента для {trading_pair} на {self.exchange}: {str(e)}")
+            return None
+        except (KeyError, IndexError, TypeError) as e:
+            logger.error(f"Некорректный ответ с параметрами инструмента для {trading_pair} на {self.exchange}: {str(e)}")
+            return None
+
+    def get_price_precision(self):
+        """
+        Получает точность цены для торговой пары.
+
+        Returns:
+            float: Значение tick size.
+        """
+        info = self._symbol_info()
+        return info['tick_size'] if info and info['tick_size'] else 0.0001
 
     def get_min_order_size(self):
         """
@@ -550,69 +1245,68 @@ class TradingStrategy:
         Returns:
             float: Минимальный размер ордера.
         """
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
-        cache_key = f"min_order_size_{self.exchange}_{trading_pair}_{self.category}"
-        min_order_size = cache.get(cache_key)
-        if min_order_size is not None:
-            logger.debug(f"Минимальный размер ордера для {trading_pair} извлечён из кэша: {min_order_size}")
-            return min_order_size
+        info = self._symbol_info()
+        return info['min_order_size'] if info and info['min_order_size'] else 0.001
 
-        try:
-            if self.exchange == 'bybit':
-                url = f"https://api.bybit.com/v5/market/instruments-info?category={self.category}&symbol={trading_pair}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['retCode'] == 0:
-                    min_order_size = safe_float(data['result']['list'][0]['lotSizeFilter']['minOrderQty'])
-                else:
-                    logger.error(f"Ошибка получения min order size на Bybit для {trading_pair}: {data['retMsg']}")
-                    return 0.001
-            elif self.exchange == 'binance':
-                url = "https://api.binance.com/api/v3/exchangeInfo" if self.category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                for symbol in data['symbols']:
-                    if symbol['symbol'] == trading_pair:
-                        for filt in symbol['filters']:
-                            if filt['filterType'] == 'LOT_SIZE':
-                                min_order_size = safe_float(filt['minQty'])
-                                break
-                        break
-                else:
-                    logger.error(f"Торговая пара {trading_pair} не найдена на Binance")
-                    return 0.001
-            elif self.exchange == 'okx':
-                url = f"https://www.okx.com/api/v5/public/instruments?instType={'SPOT' if self.category == 'spot' else 'SWAP'}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['code'] == '0':
-                    for instrument in data['data']:
-                        if instrument['instId'] == trading_pair.replace('/', '-'):
-                            min_order_size = safe_float(instrument['minSz'])
-                            break
-                    else:
-                        logger.error(f"Торговая пара {trading_pair} не найдена на OKX")
-                        return 0.001
-                else:
-                    logger.error(f"Ошибка получения min order size на OKX для {trading_pair}: {data['msg']}")
-                    return 0.001
-            else:
-                logger.error(f"Биржа {self.exchange} не поддерживается для получения min order size")
-                return 0.001
+    def get_base_precision(self):
+        """
+        Получает шаг объёма ордера для торговой пары.
+
+        Returns:
+            float: Шаг объёма.
+        """
+        info = self._symbol_info()
+        return info['base_precision'] if info and info['base_precision'] else 0.001
+
+    def get_qty_step(self):
+        """
+        Возвращает шаг объёма вместе с обратной величиной и числом знаков после запятой.
+
+        Значения считаются один раз за итерацию, чтобы округление объёма сводилось к умножению.
 
-            cache.set(cache_key, min_order_size, timeout=3600)
-            logger.debug(f"Минимальный размер ордера для {trading_pair} закэширован: {min_order_size}")
-            return min_order_size
-        except requests.RequestException as e:
-            logger.error(f"Ошибка запроса min order size для {trading_pair} на {self.exchange}: {str(e)}")
-            return 0.001
+        Returns:
+            tuple: (шаг, 1 / шаг, число знаков после запятой).
+        """
+        if self._qty_step is None:
+            step = self.get_base_precision()
+            decimals = max(0, -Decimal(str(step)).normalize().as_tuple().exponent)
+            # Множитель чуть больше 1 / шаг: погрешность float (0.3 / 0.1 = 2.999...) не уводит частное на шаг вниз
+            self._qty_step = (step, (1.0 / step) * (1 + 1e-12), decimals)
+        return self._qty_step
+
+    def floor_qty(self, qty):
+        """
+        Округляет объём вниз до шага объёма инструмента.
+
+        Args:
+            qty (float): Объём.
+
+        Returns:
+            float: Объём, кратный шагу.
+        """
+        step, inv_step, decimals = self.get_qty_step()
+        return round(math.floor(qty * inv_step) * step, decimals)
+
+    def _sign(self, message):
+        """
+        Подписывает строку HMAC-SHA256 секретным ключом API.
+
+        Args:
+            message (str | bytes): Строка для подписи; байты подписываются без перекодирования.
+
+        Returns:
+            str: Подпись в hex.
+        """
+        mac = self._hmac_template.copy()
+        mac.update(message if isinstance(message, bytes) else message.encode('utf-8'))
+        return mac.hexdigest()
 
     def round_price(self, price, tick_size):
         """
-        Округляет цену до ближайшего значения, кратного tick_size.
+        Округляет цену вниз до значения, кратного tick_size.
+
+        Дробный шаг считается в Decimal: двоичное деление (например, 0.3 / 0.1 = 2.9999...)
+        занижало цену на тик или давало цену вне сетки шага, и биржа отклоняла ордер.
 
         Args:
             price (float): Цена для округления.
@@ -621,9 +1315,12 @@ class TradingStrategy:
         Returns:
             float: Округлённая цена.
         """
-        return math.floor(price / tick_size) * tick_size
+        if float(tick_size).is_integer():
+            return math.floor(price / tick_size) * tick_size
+        tick = Decimal(repr(tick_size))
+        return float((Decimal(repr(price)) / tick).to_integral_value(rounding=ROUND_FLOOR) * tick)
 
-    def place_order(self, side, price, qty, category=None):
+    def place_order(self, side, price, qty, category=None, precision=None):
         """
         Размещает ордер на бирже.
 
@@ -632,13 +1329,14 @@ class TradingStrategy:
             price (float): Цена ордера.
             qty (float): Количество.
             category (str, optional): Категория ('spot' или 'linear'). По умолчанию берётся из self.category.
+            precision (float, optional): Tick size, если вызывающий уже получил его; иначе запрашивается.
 
         Returns:
             dict: Результат выполнения ордера.
         """
         category = category or self.category
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
-        precision = self.get_price_precision()
+        trading_pair = self._trading_pair_norm
+        precision = precision or self.get_price_precision()
         formatted_price = self.round_price(price, precision)
         try:
             if self.exchange == 'bybit':
@@ -682,12 +1380,52 @@ class TradingStrategy:
                     leverage=self.bot.leverage if category == 'linear' else None,
                     margin_type=self.bot.margin_type if category == 'linear' else None
                 )
-            logger.info(f"Размещён ордер: bot_id={self.bot.id}, side={side}, price={formatted_price}, qty={qty}, order_id={result['orderId']}")
+            logger.info("Размещён ордер: bot_id=%s, side=%s, price=%s, qty=%s, order_id=%s", self.bot.id, side, formatted_price, qty, result['orderId'])
             return result
         except Exception as e:
             logger.error(f"Ошибка при размещении ордера для бота {self.bot.id} (side={side}, price={formatted_price}, qty={qty}): {str(e)}")
             raise
 
+    def place_buy_orders(self, legs, precision):
+        """
+        Размещает ордера покупки сетки.
+
+        Сначала используется пакетный эндпоинт биржи (один запрос на пакет вместо запроса на ордер);
+        если для биржи и категории его нет, ордера отправляются параллельно по одному.
+
+        Args:
+            legs (list): Пары (цена, количество).
+            precision (float): Tick size.
+
+        Returns:
+            list: ID ордера для каждой пары или None, если ордер не размещён.
+        """
+        if not legs:
+            return []
+        orders = [{'side': 'buy', 'price': self.round_price(price, precision), 'qty': qty} for price, qty in legs]
+        try:
+            results = ExchangeAPI.create_orders_batch(
+                self.exchange, self.api_key, self.api_secret, self._exchange_symbol, orders,
+                category=self.category, margin_type=self.bot.margin_type if self.category == 'linear' else None
+            )
+        except Exception as e:
+            # Результат запроса неизвестен: повтор по одному мог бы задвоить ордера, сетка дозаполнится на следующей итерации
+            logger.error(f"Ошибка пакетного размещения ордеров покупки для бота {self.bot.id}: {str(e)}")
+            return [None] * len(legs)
+        if results is not None:
+            return [result['orderId'] if result else None for result in results]
+
+        # Ордера отправляются параллельно: итерация ждёт самый медленный ответ биржи, а не сумму
+        futures = [_IO_POOL.submit(self.place_order, 'buy', price, qty, precision=precision) for price, qty in legs]
+        order_ids = []
+        for future in futures:
+            try:
+                order_ids.append(future.result()['orderId'])
+            except Exception as e:
+                logger.error(f"Ошибка при размещении ордера покупки для бота {self.bot.id}: {str(e)}")
+                order_ids.append(None)
+        return order_ids
+
     def run_advanced_grid(self):
         """
         Реализует стратегию сетки ордеров с учётом сигналов и тейк-профита.
@@ -695,7 +1433,7 @@ class TradingStrategy:
         logger.info("Запуск стратегии order_grid для бота %s, trading_pair=%s", self.bot.id, self.bot.trading_pair)
         try:
             if not self.check_signal():
-                logger.info(f"Сигнал не сработал для бота {self.bot.id}, ожидаем")
+                logger.info("Сигнал не сработал для бота %s, ожидаем", self.bot.id)
                 return
 
             current_price = self.get_current_price()
@@ -708,23 +1446,25 @@ class TradingStrategy:
                 self.place_sell_order()
 
             if not self.position_opened and len(self.buy_orders) < self.grid_orders:
-                buy_levels = self.calculate_buy_levels(current_price)
+                precision = self.get_price_precision()
+                buy_levels = self.calculate_buy_levels(current_price, precision)
                 min_order_size = self.get_min_order_size()
-                for i, buy_price in enumerate(buy_levels[:self.grid_orders - len(self.buy_orders)]):
-                    qty = self.calculate_quantity(i)
+                legs = []
+                for buy_price, qty in zip(buy_levels[:self.grid_orders - len(self.buy_orders)], self.quantity_ladder()):
                     if qty < min_order_size:
-                        logger.warning(f"Объём {qty} меньше минимального {min_order_size} для бота {self.bot.id}, пропускаем ордер")
+                        logger.warning("Объём %s меньше минимального %s для бота %s, пропускаем ордер", qty, min_order_size, self.bot.id)
                         continue
-                    try:
-                        result = self.place_order('buy', buy_price, qty)
-                        order_id = result['orderId']
-                        self.buy_orders.append(order_id)
-                        self.position_obj.buy_orders = self.buy_orders
-                        self.position_obj.save()
-                        logger.info(f"Размещён ордер на покупку: bot_id={self.bot.id}, price={buy_price}, qty={qty}, order_id={order_id}")
-                    except Exception as e:
-                        logger.error(f"Ошибка при размещении ордера покупки для бота {self.bot.id}: {str(e)}")
+                    legs.append((buy_price, qty))
+                placed = False
+                for (buy_price, qty), order_id in zip(legs, self.place_buy_orders(legs, precision)):
+                    if order_id is None:
                         continue
+                    self.buy_orders.append(order_id)
+                    placed = True
+                    logger.info("Размещён ордер на покупку: bot_id=%s, price=%s, qty=%s, order_id=%s", self.bot.id, buy_price, qty, order_id)
+                if placed:
+                    self.position_obj.buy_orders = self.buy_orders
+                    self._save_position(['buy_orders'])
 
             if self.grid_follow and self.position_opened:
                 self.adjust_grid(current_price)
@@ -749,15 +1489,15 @@ class TradingStrategy:
             qty = base_qty * (1 + self.martingale) ** len(self.buy_orders)
             min_order_size = self.get_min_order_size()
             if qty < min_order_size:
-                logger.warning(f"Объём {qty} меньше минимального {min_order_size} для бота {self.bot.id}, увеличиваем до минимального")
+                logger.warning("Объём %s меньше минимального %s для бота %s, увеличиваем до минимального", qty, min_order_size, self.bot.id)
                 qty = min_order_size
             precision = self.get_price_precision()
             formatted_price = self.round_price(current_price, precision)
-            result = self.place_order('buy', formatted_price, qty)
-            self.update_position(formatted_price, qty)
+            result = self.place_order('buy', formatted_price, qty, precision=precision)
+            self.update_position(formatted_price, qty, save=False)
             self.buy_orders.append(result['orderId'])
             self.position_obj.buy_orders = self.buy_orders
-            self.position_obj.save()
+            self._save_position(_OPEN_POSITION_FIELDS)
             logger.info("Мартингейл: размещён ордер на покупку: bot_id=%s, price=%s, qty=%s", self.bot.id, formatted_price, qty)
         except Exception as e:
             logger.error("Ошибка в run_martingale для бота %s: %s", self.bot.id, str(e), exc_info=True)
@@ -779,21 +1519,21 @@ class TradingStrategy:
             cache_key = f"dca_last_execution_{self.bot.id}"
             last_execution = cache.get(cache_key)
             if last_execution and (time.time() - last_execution) < (self.dca_interval * 60):
-                logger.info(f"DCA: слишком рано для нового ордера, bot_id={self.bot.id}")
+                logger.info("DCA: слишком рано для нового ордера, bot_id=%s", self.bot.id)
                 return
 
             base_qty = safe_float(self.bot.additional_settings.get('base_quantity', 0.1))
             min_order_size = self.get_min_order_size()
             if base_qty < min_order_size:
-                logger.warning(f"Объём {base_qty} меньше минимального {min_order_size} для бота {self.bot.id}, увеличиваем до минимального")
+                logger.warning("Объём %s меньше минимального %s для бота %s, увеличиваем до минимального", base_qty, min_order_size, self.bot.id)
                 base_qty = min_order_size
             precision = self.get_price_precision()
             formatted_price = self.round_price(current_price, precision)
-            result = self.place_order('buy', formatted_price, base_qty)
-            self.update_position(formatted_price, base_qty)
+            result = self.place_order('buy', formatted_price, base_qty, precision=precision)
+            self.update_position(formatted_price, base_qty, save=False)
             self.buy_orders.append(result['orderId'])
             self.position_obj.buy_orders = self.buy_orders
-            self.position_obj.save()
+            self._save_position(_OPEN_POSITION_FIELDS)
             cache.set(cache_key, time.time(), timeout=self.dca_interval * 60)
             logger.info("DCA: размещён ордер на покупку: bot_id=%s, price=%s, qty=%s", self.bot.id, formatted_price, base_qty)
         except Exception as e:
@@ -816,18 +1556,18 @@ class TradingStrategy:
                     base_qty = safe_float(self.bot.additional_settings.get('base_quantity', 0.1))
                     min_order_size = self.get_min_order_size()
                     if base_qty < min_order_size:
-                        logger.warning(f"Объём {base_qty} меньше минимального {min_order_size} для бота {self.bot.id}, увеличиваем до минимального")
+                        logger.warning("Объём %s меньше минимального %s для бота %s, увеличиваем до минимального", base_qty, min_order_size, self.bot.id)
                         base_qty = min_order_size
                     result = self.place_order('buy', current_price, base_qty)
-                    self.update_position(current_price, base_qty)
+                    self.update_position(current_price, base_qty, save=False)
                     self.highest_price = current_price
                     self.position_opened = True
                     self.buy_orders.append(result['orderId'])
                     self.position_obj.highest_price = self.highest_price
                     self.position_obj.position_opened = self.position_opened
                     self.position_obj.buy_orders = self.buy_orders
-                    self.position_obj.save()
-                    logger.info(f"Trailing Stop: открыта позиция: bot_id={self.bot.id}, price={current_price}, qty={base_qty}")
+                    self._save_position(_OPEN_POSITION_FIELDS + ['highest_price'])
+                    logger.info("Trailing Stop: открыта позиция: bot_id=%s, price=%s, qty=%s", self.bot.id, current_price, base_qty)
                 return
 
             # Проверяем trailing stop
@@ -841,10 +1581,10 @@ class TradingStrategy:
                     result = self.place_order('sell', current_price, self.position)
                     profit = (current_price - self.avg_price) * self.position
                     self.close_position(profit=profit)
-                    logger.info(f"Trailing Stop сработал: позиция закрыта: bot_id={self.bot.id}, price={current_price}, profit={profit}")
+                    logger.info("Trailing Stop сработал: позиция закрыта: bot_id=%s, price=%s, profit=%s", self.bot.id, current_price, profit)
                 else:
-                    self.position_obj.save()
-                    logger.debug(f"Trailing Stop: текущая цена={current_price}, stop_price={stop_price}, highest_price={self.highest_price}")
+                    self._save_position(['highest_price'])
+                    logger.debug("Trailing Stop: текущая цена=%s, stop_price=%s, highest_price=%s", current_price, stop_price, self.highest_price)
 
         except Exception as e:
             logger.error("Ошибка в run_trailing_stop для бота %s: %s", self.bot.id, str(e), exc_info=True)
@@ -856,8 +1596,9 @@ class TradingStrategy:
         """
         logger.info("Запуск стратегии arbitrage для бота %s", self.bot.id)
         try:
-            spot_price = self.get_current_price(category='spot')
-            futures_price = self.get_current_price(category='linear')
+            # Цены спота и фьючерсов: одно обращение к кэшу и параллельные запросы к бирже
+            prices = self.get_current_prices(('spot', 'linear'))
+            spot_price, futures_price = prices['spot'], prices['linear']
             if not spot_price or not futures_price:
                 raise ValueError(f"Cannot fetch prices for {self.bot.trading_pair} on {self.exchange}")
 
@@ -866,29 +1607,29 @@ class TradingStrategy:
             base_qty = safe_float(self.bot.additional_settings.get('base_quantity', 0.1))
             min_order_size = self.get_min_order_size()
             if base_qty < min_order_size:
-                logger.warning(f"Объём {base_qty} меньше минимального {min_order_size} для бота {self.bot.id}, увеличиваем до минимального")
+                logger.warning("Объём %s меньше минимального %s для бота %s, увеличиваем до минимального", base_qty, min_order_size, self.bot.id)
                 base_qty = min_order_size
 
             if spread > threshold:
                 # Покупаем на споте, продаём на фьючерсах
                 spot_result = self.place_order('buy', spot_price, base_qty, category='spot')
                 futures_result = self.place_order('sell', futures_price, base_qty, category='linear')
-                self.update_position(spot_price, base_qty)
+                self.update_position(spot_price, base_qty, save=False)
                 self.buy_orders.append(spot_result['orderId'])
                 self.position_obj.buy_orders = self.buy_orders
-                self.position_obj.save()
-                logger.info(f"Arbitrage: buy spot at {spot_price}, sell futures at {futures_price}, bot_id={self.bot.id}")
+                self._save_position(_OPEN_POSITION_FIELDS)
+                logger.info("Arbitrage: buy spot at %s, sell futures at %s, bot_id=%s", spot_price, futures_price, self.bot.id)
             elif spread < -threshold:
                 # Продаём на споте, покупаем на фьючерсах
                 spot_result = self.place_order('sell', spot_price, base_qty, category='spot')
                 futures_result = self.place_order('buy', futures_price, base_qty, category='linear')
-                self.update_position(futures_price, base_qty)
+                self.update_position(futures_price, base_qty, save=False)
                 self.buy_orders.append(futures_result['orderId'])
                 self.position_obj.buy_orders = self.buy_orders
-                self.position_obj.save()
-                logger.info(f"Arbitrage: sell spot at {spot_price}, buy futures at {futures_price}, bot_id={self.bot.id}")
+                self._save_position(_OPEN_POSITION_FIELDS)
+                logger.info("Arbitrage: sell spot at %s, buy futures at %s, bot_id=%s", spot_price, futures_price, self.bot.id)
             else:
-                logger.info(f"Arbitrage: спред {spread:.4f} ниже порога {threshold}, bot_id={self.bot.id}")
+                logger.info("Arbitrage: спред %.4f ниже порога %s, bot_id=%s", spread, threshold, self.bot.id)
         except Exception as e:
             logger.error("Ошибка в run_arbitrage для бота %s: %s", self.bot.id, str(e), exc_info=True)
             raise
@@ -897,7 +1638,7 @@ class TradingStrategy:
         """
         Заглушка для пользовательской стратегии.
         """
-        logger.warning(f"Custom strategy is not implemented for bot {self.bot.id}")
+        logger.warning("Custom strategy is not implemented for bot %s", self.bot.id)
         raise NotImplementedError("Custom strategy is not implemented yet.")
 
     def check_stop_loss(self):
@@ -917,7 +1658,7 @@ class TradingStrategy:
                 result = self.place_order('sell', current_price, self.position)
                 loss = (current_price - self.avg_price) * self.position
                 self.close_position(profit=loss)
-                logger.info(f"Stop Loss сработал: позиция закрыта: bot_id={self.bot.id}, price={current_price}, loss={loss}")
+                logger.info("Stop Loss сработал: позиция закрыта: bot_id=%s, price=%s, loss=%s", self.bot.id, current_price, loss)
             except Exception as e:
                 logger.error(f"Ошибка при срабатывании Stop Loss для бота {self.bot.id}: {str(e)}")
                 raise
@@ -925,6 +1666,8 @@ class TradingStrategy:
     def place_sell_order(self):
         """
         Размещает ордер на продажу с учётом тейк-профита.
+
+        Если ордер на продажу уже открыт, новый не размещается и запрос к бирже не выполняется.
         """
         if self.position <= 0 or self.sell_order_id:
             return
@@ -935,11 +1678,11 @@ class TradingStrategy:
             sell_price = self.avg_price * (1 + self.take_profit)
             precision = self.get_price_precision()
             formatted_price = self.round_price(sell_price, precision)
-            result = self.place_order('sell', formatted_price, self.position)
+            result = self.place_order('sell', formatted_price, self.position, precision=precision)
             self.sell_order_id = result['orderId']
             self.position_obj.sell_order_id = self.sell_order_id
-            self.position_obj.save()
-            logger.info(f"Размещён ордер на продажу: bot_id={self.bot.id}, price={formatted_price}, qty={self.position}")
+            self._save_position(['sell_order_id'])
+            logger.info("Размещён ордер на продажу: bot_id=%s, price=%s, qty=%s", self.bot.id, formatted_price, self.position)
         except Exception as e:
             logger.error(f"Ошибка при размещении ордера продажи для бота {self.bot.id}: {str(e)}")
             raise
@@ -947,157 +1690,214 @@ class TradingStrategy:
     def check_open_orders(self):
         """
         Проверяет состояние открытых ордеров и обновляет позицию.
+
+        Если подключён приватный поток ордеров, исполнения берутся из него, а REST-запрос
+        к бирже выполняется не чаще раза в ORDER_RECONCILE_INTERVAL секунд для сверки.
         """
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
+        trading_pair = self._trading_pair_norm
         if not trading_pair:
             logger.error(f"Торговая пара не указана для бота {self.bot.id}")
             return
 
+        if self._order_stream is not None and self._order_stream.is_connected():
+            self._apply_stream_fills()
+            # Пока поток подключён, REST-опрос выполняется только как периодическая сверка
+            if not cache.add(f"orders_reconciled_{self.bot_id}", 1, timeout=ORDER_RECONCILE_INTERVAL):
+                return
+
         try:
             if self.exchange == 'bybit':
                 url = "https://api.bybit.com/v5/order/realtime"
                 timestamp = str(get_bybit_server_time())
-                params = {"category": self.category, "symbol": trading_pair}
-                query_string = urlencode(sorted(params.items()))
-                sign_str = timestamp + self.api_key + str(self.recv_window) + query_string
-                signature = hmac.new(self.api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
-                headers = {
-                    "X-BAPI-API-KEY": self.api_key,
-                    "X-BAPI-TIMESTAMP": timestamp,
-                    "X-BAPI-RECV-WINDOW": str(self.recv_window),
-                    "X-BAPI-SIGN": signature,
-                }
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                # Строка запроса в фиксированном порядке: она же подписывается и отправляется
+                query_string = f"category={self.category}&symbol={trading_pair}"
+                signature = self._sign(timestamp.encode() + self._bybit_sign_infix + query_string.encode())
+                headers = {**self._base_headers, "X-BAPI-TIMESTAMP": timestamp, "X-BAPI-SIGN": signature}
+                response = _HTTP.get(f"{url}?{query_string}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     open_orders = data['result']['list']
+                    buy_set = set(self.buy_orders)
+                    filled_count = 0
                     remaining_buy_orders = []
                     for order in open_orders:
                         order_id = order['orderId']
-                        if order_id in self.buy_orders:
+                        if order_id in buy_set:
                             if order['orderStatus'] == 'Filled':
                                 price = safe_float(order['price'])
                                 qty = safe_float(order['qty'])
-                                self.update_position(price, qty)
-                                self.bot.deals_completed += 1
-                                self.bot.save()
+                                self.update_position(price, qty, save=False)
+                                filled_count += 1
                                 logger.info("Ордер покупки исполнен: bot_id=%s, price=%s, qty=%s", self.bot.id, price, qty)
                             else:
                                 remaining_buy_orders.append(order_id)
                         elif order_id == self.sell_order_id and order['orderStatus'] == 'Filled':
                             profit = (safe_float(order['price']) - self.avg_price) * self.position
-                            self.close_position(profit=profit)
-                            self.bot.deals_completed += 1
-                            self.bot.save()
+                            self.close_position(profit=profit, save=False)
+                            filled_count += 1
                             logger.info("Ордер продажи исполнен, позиция закрыта: bot_id=%s, прибыль=%s", self.bot.id, profit)
                     self.buy_orders = remaining_buy_orders
-                    self.position_obj.buy_orders = self.buy_orders
-                    self.position_obj.save()
+                    self._save_fills(filled_count)
                 else:
                     logger.error("Ошибка проверки открытых ордеров на Bybit для бота %s: %s", self.bot.id, data['retMsg'])
             elif self.exchange == 'binance':
                 url = "https://api.binance.com/api/v3/openOrders" if self.category == 'spot' else "https://fapi.binance.com/fapi/v1/openOrders"
                 timestamp = str(int(time.time() * 1000))
-                params = {"symbol": trading_pair, "timestamp": timestamp}
-                query_string = urlencode(sorted(params.items()))
-                signature = hmac.new(self.api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-                params["signature"] = signature
-                headers = {"X-MBX-APIKEY": self.api_key}
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                query_string = f"symbol={trading_pair}&timestamp={timestamp}"
+                signature = self._sign(query_string)
+                headers = self._base_headers
+                response = _HTTP.get(f"{url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                 response.raise_for_status()
-                open_orders = response.json()
+                open_orders = orjson.loads(response.content)
+                buy_set = set(self.buy_orders)
+                filled_count = 0
                 remaining_buy_orders = []
                 for order in open_orders:
                     order_id = str(order['orderId'])
-                    if order_id in self.buy_orders:
+                    if order_id in buy_set:
                         if order['status'] == 'FILLED':
                             price = safe_float(order['price'])
                             qty = safe_float(order['origQty'])
-                            self.update_position(price, qty)
-                            self.bot.deals_completed += 1
-                            self.bot.save()
+                            self.update_position(price, qty, save=False)
+                            filled_count += 1
                             logger.info("Ордер покупки исполнен: bot_id=%s, price=%s, qty=%s", self.bot.id, price, qty)
                         else:
                             remaining_buy_orders.append(order_id)
                     elif order_id == self.sell_order_id and order['status'] == 'FILLED':
                         profit = (safe_float(order['price']) - self.avg_price) * self.position
-                        self.close_position(profit=profit)
-                        self.bot.deals_completed += 1
-                        self.bot.save()
+                        self.close_position(profit=profit, save=False)
+                        filled_count += 1
                         logger.info("Ордер продажи исполнен, позиция закрыта: bot_id=%s, прибыль=%s", self.bot.id, profit)
                 self.buy_orders = remaining_buy_orders
-                self.position_obj.buy_orders = self.buy_orders
-                self.position_obj.save()
+                self._save_fills(filled_count)
             elif self.exchange == 'okx':
                 url = "https://www.okx.com/api/v5/trade/orders-pending"
                 timestamp = str(int(time.time()))
-                method = "GET"
-                request_path = "/api/v5/trade/orders-pending"
-                body = ""
-                sign_str = timestamp + method + request_path + body
-                signature = hmac.new(self.api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
-                headers = {
-                    "OK-ACCESS-KEY": self.api_key,
-                    "OK-ACCESS-SIGN": signature,
-                    "OK-ACCESS-TIMESTAMP": timestamp,
-                    "OK-ACCESS-PASSPHRASE": ""
-                }
-                response = requests.get(url, headers=headers, timeout=10)
+                signature = self._sign(timestamp.encode() + _OKX_PENDING_SIGN_PREFIX)
+                headers = {**self._base_headers, "OK-ACCESS-SIGN": signature, "OK-ACCESS-TIMESTAMP": timestamp}
+                response = _HTTP.get(url, headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
-                    open_orders = [order for order in data['data'] if order['instId'] == trading_pair.replace('/', '-')]
+                    open_orders = [order for order in data['data'] if order['instId'] == self._symbol_okx]
+                    buy_set = set(self.buy_orders)
+                    filled_count = 0
                     remaining_buy_orders = []
                     for order in open_orders:
                         order_id = order['ordId']
-                        if order_id in self.buy_orders:
+                        if order_id in buy_set:
                             if order['state'] == 'filled':
                                 price = safe_float(order['px'])
                                 qty = safe_float(order['sz'])
-                                self.update_position(price, qty)
-                                self.bot.deals_completed += 1
-                                self.bot.save()
+                                self.update_position(price, qty, save=False)
+                                filled_count += 1
                                 logger.info("Ордер покупки исполнен: bot_id=%s, price=%s, qty=%s", self.bot.id, price, qty)
                             else:
                                 remaining_buy_orders.append(order_id)
                         elif order_id == self.sell_order_id and order['state'] == 'filled':
                             profit = (safe_float(order['px']) - self.avg_price) * self.position
-                            self.close_position(profit=profit)
-                            self.bot.deals_completed += 1
-                            self.bot.save()
+                            self.close_position(profit=profit, save=False)
+                            filled_count += 1
                             logger.info("Ордер продажи исполнен, позиция закрыта: bot_id=%s, прибыль=%s", self.bot.id, profit)
                     self.buy_orders = remaining_buy_orders
-                    self.position_obj.buy_orders = self.buy_orders
-                    self.position_obj.save()
+                    self._save_fills(filled_count)
                 else:
                     logger.error(f"Ошибка проверки открытых ордеров на OKX для бота {self.bot.id}: {data['msg']}")
             else:
                 logger.error(f"Биржа {self.exchange} не поддерживается для бота {self.bot.id}")
                 raise NotImplementedError(f"Exchange {self.exchange} not supported")
-        except requests.RequestException as e:
+        except _HTTP_ERRORS as e:
             logger.error(f"Ошибка при проверке открытых ордеров для бота {self.bot.id}: {str(e)}")
 
-    def calculate_buy_levels(self, current_price):
+    def _apply_stream_fills(self):
+        """
+        Применяет исполнения отслеживаемых ордеров, полученные из приватного потока.
+        """
+        buy_orders = list(self.buy_orders)
+        tracked = set(buy_orders)
+        if self.sell_order_id:
+            tracked.add(self.sell_order_id)
+        fills = self._order_stream.pop_fills(tracked)
+        if not fills:
+            return
+        # Исполнения применяются в порядке биржи, а при равном времени покупки идут раньше продажи,
+        # которая закрывает набранную ими позицию
+        fills.sort(key=lambda order: (int(order.get('updatedTime') or 0), order['orderId'] == self.sell_order_id))
+        filled_count = 0
+        filled_buys = set()
+        for order in fills:
+            order_id = order['orderId']
+            price = safe_float(order.get('avgPrice')) or safe_float(order['price'])
+            if order_id == self.sell_order_id:
+                profit = (price - self.avg_price) * self.position
+                self.close_position(profit=profit, save=False)
+                logger.info("Ордер продажи исполнен (поток), позиция закрыта: bot_id=%s, прибыль=%s", self.bot_id, profit)
+            else:
+                qty = safe_float(order.get('cumExecQty')) or safe_float(order['qty'])
+                self.update_position(price, qty, save=False)
+                filled_buys.add(order_id)
+                logger.info("Ордер покупки исполнен (поток): bot_id=%s, price=%s, qty=%s", self.bot_id, price, qty)
+            filled_count += 1
+        self.buy_orders = [order_id for order_id in buy_orders if order_id not in filled_buys]
+        self._save_fills(filled_count)
+
+    def _save_fills(self, filled_count):
+        """
+        Сохраняет результат проверки ордеров: одно обновление счётчика сделок и одно сохранение позиции.
+
+        Args:
+            filled_count (int): Количество исполненных за проверку ордеров.
+        """
+        self.position_obj.buy_orders = self.buy_orders
+        if filled_count:
+            Bot.objects.filter(pk=self.bot.pk).update(deals_completed=F('deals_completed') + filled_count)
+            self.bot.deals_completed += filled_count
+            self._save_position(_POSITION_FIELDS)
+        else:
+            self._save_position(['buy_orders'])
+
+    def calculate_buy_levels(self, current_price, tick_size=None):
         """
         Рассчитывает уровни покупки для сетки.
 
         Args:
             current_price (float): Текущая цена.
+            tick_size (float, optional): Tick size; если не передан, запрашивается один раз на все уровни.
 
         Returns:
             list: Список цен для размещения ордеров на покупку.
         """
-        buy_levels = []
-        step = current_price * self.grid_spacing * (1 + self.grid_overlap)
-        for i in range(self.grid_orders):
-            if self.logarithmic:
-                price = current_price * (1 - self.grid_spacing * (i + 1) ** 1.2)
-            else:
-                price = current_price - step * (i + 1)
-            price = self.round_price(price, self.get_price_precision())
-            buy_levels.append(price)
-        return buy_levels
+        tick_size = tick_size or self.get_price_precision()
+        levels = np.arange(1, self.grid_orders + 1, dtype=np.float64)
+        if self.logarithmic:
+            prices = current_price * (1.0 - self.grid_spacing * levels ** 1.2)
+        else:
+            prices = current_price - current_price * self.grid_spacing * (1 + self.grid_overlap) * levels
+        # Округление вниз до тика всего массива; частное предварительно округляется,
+        # чтобы 2.9999999999 тика от двоичного деления не теряли целый тик (как в round_price)
+        decimals = max(0, -Decimal(repr(float(tick_size))).as_tuple().exponent)
+        prices = np.round(np.floor(np.round(prices / tick_size, 9)) * tick_size, decimals)
+        return prices.tolist()
+
+    def quantity_ladder(self):
+        """
+        Рассчитывает объёмы ордеров для всех уровней сетки с учётом мартингейла и минимального размера.
+
+        Returns:
+            list: Объёмы ордеров по уровням, округлённые вниз до шага объёма.
+        """
+        if self._qty_ladder is None:
+            base_qty = safe_float(self.bot.additional_settings.get('base_quantity', 0.1))
+            min_order_size = self.get_min_order_size()
+            step, inv_step, decimals = self.get_qty_step()
+            qtys = base_qty * (1 + self.martingale) ** np.arange(max(self.grid_orders, 1))
+            if qtys[0] < min_order_size:
+                logger.warning("Объём %s меньше минимального %s для бота %s, увеличиваем до минимального", qtys[0], min_order_size, self.bot.id)
+            qtys = np.maximum(qtys, min_order_size)
+            # Округляем до base_precision
+            self._qty_ladder = np.round(np.floor(qtys * inv_step) * step, decimals).tolist()
+        return self._qty_ladder
 
     def calculate_quantity(self, level_index):
         """
@@ -1109,80 +1909,21 @@ class TradingStrategy:
         Returns:
             float: Объём ордера.
         """
+        ladder = self.quantity_ladder()
+        if level_index < len(ladder):
+            return ladder[level_index]
         base_qty = safe_float(self.bot.additional_settings.get('base_quantity', 0.1))
-        min_order_size = self.get_min_order_size()
-        qty = base_qty * (1 + self.martingale) ** level_index
-        if qty < min_order_size:
-            logger.warning(f"Объём {qty} меньше минимального {min_order_size} для бота {self.bot.id}, увеличиваем до минимального")
-            qty = min_order_size
-
-        # Округляем до base_precision
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
-        cache_key = f"base_precision_{self.exchange}_{trading_pair}_{self.category}"
-        base_precision = cache.get(cache_key)
-        if base_precision is None:
-            try:
-                if self.exchange == 'bybit':
-                    url = f"https://api.bybit.com/v5/market/instruments-info?category={self.category}&symbol={trading_pair}"
-                    response = requests.get(url, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
-                    if data['retCode'] == 0:
-                        base_precision = safe_float(data['result']['list'][0]['lotSizeFilter']['basePrecision'])
-                    else:
-                        logger.error(f"Ошибка получения base_precision на Bybit для {trading_pair}: {data['retMsg']}")
-                        base_precision = 0.001
-                elif self.exchange == 'binance':
-                    url = "https://api.binance.com/api/v3/exchangeInfo" if self.category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
-                    response = requests.get(url, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
-                    for symbol in data['symbols']:
-                        if symbol['symbol'] == trading_pair:
-                            base_precision = safe_float(symbol['quantityPrecision'])
-                            break
-                    else:
-                        logger.error(f"Торговая пара {trading_pair} не найдена на Binance")
-                        base_precision = 0.001
-                elif self.exchange == 'okx':
-                    url = f"https://www.okx.com/api/v5/public/instruments?instType={'SPOT' if self.category == 'spot' else 'SWAP'}"
-                    response = requests.get(url, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
-                    if data['code'] == '0':
-                        for instrument in data['data']:
-                            if instrument['instId'] == trading_pair.replace('/', '-'):
-                                base_precision = safe_float(instrument['lotSz'])
-                                break
-                        else:
-                            logger.error(f"Торговая пара {trading_pair} не найдена на OKX")
-                            base_precision = 0.001
-                    else:
-                        logger.error(f"Ошибка получения base_precision на OKX для {trading_pair}: {data['msg']}")
-                        base_precision = 0.001
-                else:
-                    logger.error(f"Биржа {self.exchange} не поддерживается для получения base_precision")
-                    base_precision = 0.001
-
-                cache.set(cache_key, base_precision, timeout=3600)
-                logger.debug(f"Base precision для {trading_pair} закэширован: {base_precision}")
-            except requests.RequestException as e:
-                logger.error(f"Ошибка запроса base_precision для {trading_pair} на {self.exchange}: {str(e)}")
-                base_precision = 0.001
-            except Exception as e:
-                logger.error(f"Неожиданная ошибка при получении base_precision для {trading_pair} на {self.exchange}: {str(e)}", exc_info=True)
-                base_precision = 0.001
-
-        qty = math.floor(qty / base_precision) * base_precision
-        return qty
+        qty = max(base_qty * (1 + self.martingale) ** level_index, self.get_min_order_size())
+        return self.floor_qty(qty)
 
-    def update_position(self, price, qty):
+    def update_position(self, price, qty, save=True):
         """
         Обновляет текущую позицию и среднюю цену.
 
         Args:
             price (float): Цена покупки.
             qty (float): Количество.
+            save (bool): Сохранять позицию сразу; False, если вызывающий сохранит её сам.
         """
         if self.position == 0:
             self.position = qty
@@ -1195,15 +1936,17 @@ class TradingStrategy:
         self.position_obj.position = self.position
         self.position_obj.avg_price = self.avg_price
         self.position_obj.position_opened = self.position_opened
-        self.position_obj.save()
-        logger.debug(f"Позиция обновлена: bot_id={self.bot.id}, position={self.position}, avg_price={self.avg_price}")
+        if save:
+            self._save_position(['position', 'avg_price', 'position_opened'])
+        logger.debug("Позиция обновлена: bot_id=%s, position=%s, avg_price=%s", self.bot.id, self.position, self.avg_price)
 
-    def close_position(self, profit):
+    def close_position(self, profit, save=True):
         """
         Закрывает позицию и сбрасывает параметры.
 
         Args:
             profit (float): Прибыль или убыток от сделки.
+            save (bool): Сохранять позицию сразу; False, если вызывающий сохранит её сам.
         """
         self.position = 0
         self.avg_price = 0
@@ -1217,8 +1960,9 @@ class TradingStrategy:
         self.position_obj.buy_orders = self.buy_orders
         self.position_obj.position_opened = self.position_opened
         self.position_obj.highest_price = self.highest_price
-        self.position_obj.save()
-        logger.info(f"Позиция закрыта: bot_id={self.bot.id}, profit={profit}")
+        if save:
+            self._save_position(_POSITION_FIELDS)
+        logger.info("Позиция закрыта: bot_id=%s, profit=%s", self.bot.id, profit)
 
     def adjust_grid(self, current_price):
         """
@@ -1230,25 +1974,28 @@ class TradingStrategy:
         if not self.grid_follow:
             return
         try:
-            buy_levels = self.calculate_buy_levels(current_price)
-            active_orders = self.buy_orders[:]
-            for order_id in active_orders:
-                self.cancel_order(order_id)
-                self.buy_orders.remove(order_id)
-            self.position_obj.buy_orders = self.buy_orders
-            self.position_obj.save()
-            min_order_size = self.get_min_order_size()
-            for i, buy_price in enumerate(buy_levels[:self.grid_orders - len(self.buy_orders)]):
-                qty = self.calculate_quantity(i)
-                if qty < min_order_size:
-                    logger.warning(f"Объём {qty} меньше минимального {min_order_size} для бота {self.bot.id}, пропускаем ордер")
-                    continue
-                result = self.place_order('buy', buy_price, qty)
-                order_id = result['orderId']
-                self.buy_orders.append(order_id)
+            precision = self.get_price_precision()
+            buy_levels = self.calculate_buy_levels(current_price, precision)
+            try:
+                cancelled = self.cancel_orders(self.buy_orders)
+                self.buy_orders = [order_id for order_id in self.buy_orders if order_id not in cancelled]
+                min_order_size = self.get_min_order_size()
+                legs = []
+                for buy_price, qty in zip(buy_levels[:self.grid_orders - len(self.buy_orders)], self.quantity_ladder()):
+                    if qty < min_order_size:
+                        logger.warning("Объём %s меньше минимального %s для бота %s, пропускаем ордер", qty, min_order_size, self.bot.id)
+                        continue
+                    legs.append((buy_price, qty))
+                # Новые уровни выставляются одним пакетным запросом, где биржа это поддерживает
+                for (buy_price, qty), order_id in zip(legs, self.place_buy_orders(legs, precision)):
+                    if order_id is None:
+                        continue
+                    self.buy_orders.append(order_id)
+                    logger.info("Сетка скорректирована: bot_id=%s, new buy price=%s, qty=%s", self.bot.id, buy_price, qty)
+            finally:
+                # Одно сохранение за корректировку, в том числе если размещение прервалось ошибкой
                 self.position_obj.buy_orders = self.buy_orders
-                self.position_obj.save()
-                logger.info(f"Сетка скорректирована: bot_id={self.bot.id}, new buy price={buy_price}, qty={qty}")
+                self._save_position(['buy_orders'])
         except Exception as e:
             logger.error(f"Ошибка при корректировке сетки для бота {self.bot.id}: {str(e)}")
 
@@ -1258,105 +2005,129 @@ class TradingStrategy:
 
         Args:
             order_id (str): ID ордера.
+
+        Returns:
+            bool: True, если биржа подтвердила отмену.
         """
-        trading_pair = self.bot.trading_pair.replace('/', '') if self.bot.trading_pair else ''
+        trading_pair = self._trading_pair_norm
         if not trading_pair:
             logger.error(f"Торговая пара не указана для бота {self.bot.id}")
-            return
+            return False
 
         if self.exchange == 'bybit':
             url = "https://api.bybit.com/v5/order/cancel"
             timestamp = str(get_bybit_server_time())
-            params = {"category": self.category, "symbol": trading_pair, "orderId": order_id}
-            payload = json.dumps(params, separators=(',', ':'), sort_keys=True)
-            sign_str = timestamp + self.api_key + str(self.recv_window) + payload
-            signature = hmac.new(self.api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            # Компактный JSON с ключами в алфавитном порядке, как json.dumps(..., sort_keys=True)
+            # Тело кодируется в байты один раз: эти же байты подписываются и отправляются
+            payload = f'{{"category":"{self.category}","orderId":"{order_id}","symbol":"{trading_pair}"}}'.encode()
+            signature = self._sign(timestamp.encode() + self._bybit_sign_infix + payload)
             headers = {
-                "X-BAPI-API-KEY": self.api_key,
-                "X-BAPI-TIMESTAMP": timestamp,
-                "X-BAPI-RECV-WINDOW": str(self.recv_window),
-                "X-BAPI-SIGN": signature,
+                **self._base_headers, "X-BAPI-TIMESTAMP": timestamp, "X-BAPI-SIGN": signature,
                 "Content-Type": "application/json"
             }
             try:
-                response = requests.post(url, headers=headers, data=payload, timeout=10)
+                response = _http_post(url, headers, payload)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] != 0:
+                    if data['retCode'] == 10002:
+                        reset_bybit_time_offset()
                     logger.error("Ошибка отмены ордера на Bybit: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, data['retMsg'])
-                else:
-                    logger.info("Ордер отменён на Bybit: bot_id=%s, order_id=%s", self.bot.id, order_id)
-            except requests.RequestException as e:
+                    return False
+                logger.info("Ордер отменён на Bybit: bot_id=%s, order_id=%s", self.bot.id, order_id)
+                return True
+            except _HTTP_ERRORS as e:
                 logger.error("Ошибка запроса при отмене ордера на Bybit: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, str(e))
+                return False
         elif self.exchange == 'binance':
             url = "https://api.binance.com/api/v3/order" if self.category == 'spot' else "https://fapi.binance.com/fapi/v1/order"
             timestamp = str(int(time.time() * 1000))
-            params = {
-                "symbol": trading_pair,
-                "orderId": order_id,
-                "timestamp": timestamp
-            }
-            query_string = urlencode(sorted(params.items()))
-            signature = hmac.new(self.api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-            params["signature"] = signature
-            headers = {"X-MBX-APIKEY": self.api_key}
+            query_string = f"orderId={order_id}&symbol={trading_pair}&timestamp={timestamp}"
+            signature = self._sign(query_string)
+            headers = self._base_headers
             try:
-                response = requests.delete(url, headers=headers, params=params, timeout=10)
+                response = _HTTP.delete(f"{url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                 response.raise_for_status()
                 logger.info("Ордер отменён на Binance: bot_id=%s, order_id=%s", self.bot.id, order_id)
-            except requests.RequestException as e:
+                return True
+            except _HTTP_ERRORS as e:
                 logger.error("Ошибка при отмене ордера на Binance: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, str(e))
+                return False
         elif self.exchange == 'okx':
             url = "https://www.okx.com/api/v5/trade/cancel-order"
             timestamp = str(int(time.time()))
-            method = "POST"
-            request_path = "/api/v5/trade/cancel-order"
-            body = json.dumps({"instId": trading_pair.replace('/', '-'), "ordId": order_id})
-            sign_str = timestamp + method + request_path + body
-            signature = hmac.new(self.api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            body = orjson.dumps({"instId": self._symbol_okx, "ordId": order_id})
+            signature = self._sign(timestamp.encode() + _OKX_CANCEL_SIGN_PREFIX + body)
             headers = {
-                "OK-ACCESS-KEY": self.api_key,
-                "OK-ACCESS-SIGN": signature,
-                "OK-ACCESS-TIMESTAMP": timestamp,
-                "OK-ACCESS-PASSPHRASE": "",
+                **self._base_headers, "OK-ACCESS-SIGN": signature, "OK-ACCESS-TIMESTAMP": timestamp,
                 "Content-Type": "application/json"
             }
             try:
-                response = requests.post(url, headers=headers, data=body, timeout=10)
+                response = _http_post(url, headers, body)
                 response.raise_for_status()
-                data = response.json()
-                if data['code'] == '0':
-                    logger.info("Ордер отменён на OKX: bot_id=%s, order_id=%s", self.bot.id, order_id)
-                else:
+                data = orjson.loads(response.content)
+                if data['code'] != '0':
                     logger.error("Ошибка отмены ордера на OKX: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, data['msg'])
-            except requests.RequestException as e:
+                    return False
+                logger.info("Ордер отменён на OKX: bot_id=%s, order_id=%s", self.bot.id, order_id)
+                return True
+            except _HTTP_ERRORS as e:
                 logger.error("Ошибка при отмене ордера на OKX: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, str(e))
+                return False
         else:
             logger.error(f"Exchange {self.exchange} not supported для бота {self.bot.id}")
             raise NotImplementedError(f"Exchange {self.exchange} not supported")
 
-    def cancel_all_orders(self):
+    def cancel_orders(self, order_ids):
         """
-        Отменяет все активные ордера бота.
+        Отменяет несколько ордеров параллельно.
+
+        Args:
+            order_ids (list): ID ордеров.
+
+        Returns:
+            set: ID ордеров, отмену которых подтвердила биржа.
         """
-        logger.info("Отмена всех ордеров для бота %s", self.bot.id)
-        for order_id in self.buy_orders[:]:
+        # Отмены отправляются одновременно: ожидание равно самому медленному ответу биржи, а не сумме
+        futures = {order_id: _IO_POOL.submit(self.cancel_order, order_id) for order_id in order_ids}
+        cancelled = set()
+        for order_id, future in futures.items():
             try:
-                self.cancel_order(order_id)
-                self.buy_orders.remove(order_id)
+                if future.result():
+                    cancelled.add(order_id)
             except Exception as e:
-                logger.error("Ошибка при отмене ордера на покупку: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, str(e))
+                logger.error("Ошибка при отмене ордера: bot_id=%s, order_id=%s, error=%s", self.bot.id, order_id, str(e))
+        return cancelled
 
-        if self.sell_order_id:
+    def cancel_all_orders(self, save=True):
+        """
+        Отменяет все активные ордера бота.
+
+        Args:
+            save (bool): Сохранять список ордеров сразу; False, если вызывающий сохранит позицию сам.
+        """
+        logger.info("Отмена всех ордеров для бота %s", self.bot.id)
+        order_ids = self.buy_orders + ([self.sell_order_id] if self.sell_order_id else [])
+        cancelled = None
+        if order_ids:
             try:
-                self.cancel_order(self.sell_order_id)
-                self.sell_order_id = None
+                # Пакетная отмена по ID: один запрос на пакет вместо запроса на каждый ордер
+                cancelled = ExchangeAPI.cancel_orders_batch(
+                    self.exchange, self.api_key, self.api_secret, self._exchange_symbol, order_ids, category=self.category
+                )
             except Exception as e:
-                logger.error("Ошибка при отмене ордера на продажу: bot_id=%s, order_id=%s, error=%s", self.bot.id, self.sell_order_id, str(e))
+                logger.error("Ошибка пакетной отмены ордеров для бота %s: %s", self.bot.id, str(e))
+        if cancelled is None:
+            # Пакетная отмена не поддерживается или не удалась: отменяем по одному (повторная отмена безопасна)
+            cancelled = self.cancel_orders(order_ids)
+        self.buy_orders = [order_id for order_id in self.buy_orders if order_id not in cancelled]
+        if self.sell_order_id in cancelled:
+            self.sell_order_id = None
 
         self.position_obj.buy_orders = self.buy_orders
         self.position_obj.sell_order_id = self.sell_order_id
-        self.position_obj.save()
+        if save:
+            self._save_position(['buy_orders', 'sell_order_id'])
         logger.info("Все ордера отменены для бота %s", self.bot.id)
 
     def stop_bot(self):
@@ -1364,41 +2135,159 @@ class TradingStrategy:
         Останавливает бота и закрывает все открытые ордера.
         """
         try:
+            forget_strategy(self.bot_id)
+            self.cancel_all_orders(save=False)
+            self.close_position(profit=0, save=False)
             self.bot.status = 'stopped'
             self.bot.is_running = False
-            self.bot.save()
-            self.cancel_all_orders()
-            self.close_position(profit=0)
+            # Статус бота и сброшенная позиция записываются вместе: два UPDATE в одной транзакции
+            with transaction.atomic():
+                Bot.objects.filter(pk=self.bot.pk).update(status='stopped', is_running=False)
+                self._save_position(_POSITION_FIELDS)
         except Exception as e:
             logger.error(f"Ошибка при остановке бота {self.bot.id}: {str(e)}", exc_info=True)
             raise
         finally:
-            logger.info(f"Бот {self.bot.id} остановлен")
+            logger.info("Бот %s остановлен", self.bot.id)
+
+_STRATEGY_CACHE = OrderedDict()
+_STRATEGY_CACHE_LOCK = threading.Lock()
+STRATEGY_CACHE_SIZE = getattr(settings, 'STRATEGY_CACHE_SIZE', 1000)
+
+
+def _strategy_version(bot):
+    """
+    Возвращает отпечаток данных бота, из которых строится стратегия: ключи API, пара и настройки.
+
+    Args:
+        bot (Bot): Экземпляр модели Bot.
+
+    Returns:
+        bytes: Отпечаток; стратегия из кэша используется только при его совпадении.
+    """
+    bot_settings = bot.settings
+    return orjson.dumps([
+        bot.api_key_id, bot.api_key.exchange, bot.api_key.api_key, bot.api_key.api_secret,
+        bot.trading_pair, bot.strategy,
+        [getattr(bot_settings, field.attname) for field in bot_settings._meta.concrete_fields],
+    ], default=str)
+
+
+def get_strategy(bot):
+    """
+    Возвращает стратегию бота из кэша процесса или создаёт новую.
+
+    Стратегия переиспользуется между итерациями, пока не изменились ключи API, пара и настройки бота:
+    расшифровка ключей и разбор настроек выполняются один раз, а позиция перечитывается каждую итерацию.
+
+    Args:
+        bot (Bot): Экземпляр модели Bot (желательно загруженный с select_related(*BOT_RELATED_FIELDS)).
+
+    Returns:
+        TradingStrategy: Стратегия бота.
+    """
+    version = _strategy_version(bot)
+    with _STRATEGY_CACHE_LOCK:
+        entry = _STRATEGY_CACHE.get(bot.id)
+        if entry is not None and entry[1] == version:
+            _STRATEGY_CACHE.move_to_end(bot.id)
+            strategy = entry[0]
+        else:
+            strategy = None
+    if strategy is not None:
+        strategy.rebind(bot)
+        return strategy
+    strategy = TradingStrategy(bot)
+    evicted = []
+    with _STRATEGY_CACHE_LOCK:
+        _STRATEGY_CACHE[bot.id] = (strategy, version)
+        _STRATEGY_CACHE.move_to_end(bot.id)
+        while len(_STRATEGY_CACHE) > STRATEGY_CACHE_SIZE:
+            evicted.append(_STRATEGY_CACHE.popitem(last=False)[0])
+    # Вытесненные стратегии не держат приватные потоки ордеров открытыми
+    for bot_id in evicted:
+        release_order_stream(bot_id)
+    return strategy
+
+
+def forget_strategy(bot_id):
+    """
+    Удаляет стратегию бота из кэша процесса (например, после остановки бота)
+    и закрывает приватный поток ордеров, если им больше не пользуется ни один бот.
+
+    Args:
+        bot_id (int): ID бота.
+    """
+    with _STRATEGY_CACHE_LOCK:
+        _STRATEGY_CACHE.pop(bot_id, None)
+    release_order_stream(bot_id)
+
 
-# Функция для остановки бота
+def preload_exchange_filters():
+    """
+    Загружает параметры инструментов всех поддерживаемых бирж и категорий в память процесса.
+
+    Вызывается при старте процесса воркера, чтобы первые итерации ботов не ждали загрузки списка.
+    """
+    for exchange in _ADAPTERS:
+        for category in ('spot', 'linear'):
+            filters = TradingStrategy._load_exchange_filters(exchange, category)
+            if filters is None:
+                logger.warning("Параметры инструментов %s (%s) не загружены при старте", exchange, category)
+
+def _run_tick(strategy):
+    """
+    Выполняет одну итерацию стратегии в потоке пула: проверка сигнала и execute().
+
+    Args:
+        strategy (TradingStrategy): Стратегия бота.
+
+    Returns:
+        bool: True, если сигнал сработал и стратегия выполнена.
+    """
+    try:
+        if not strategy.check_signal():
+            return False
+        strategy.execute()
+        return True
+    finally:
+        # У каждого потока своё соединение с БД: закрываем, чтобы не держать его между итерациями
+        connection.close()
+
+async def execute_strategies(strategies):
+    """
+    Выполняет итерации нескольких стратегий одновременно.
+
+    Запросы к бирже синхронные, поэтому итерации идут в потоках _STRATEGY_POOL, а asyncio.gather
+    дожидается всех: общее время равно самой долгой итерации, а не сумме по ботам.
+
+    Args:
+        strategies (list): Экземпляры TradingStrategy.
+
+    Returns:
+        list: Для каждой стратегии результат _run_tick или исключение, если итерация завершилась ошибкой.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(_STRATEGY_POOL, _run_tick, strategy) for strategy in strategies),
+        return_exceptions=True,
+    )
+
+# Задача Celery для остановки бота
+@shared_task
 def stop_bot(bot_id):
     """
     Останавливает бота, отменяет все его ордера и изменяет статус на 'stopped'.
 
+    Вся работа выполняется в TradingStrategy.stop_bot, чтобы остановка из API, по лимиту сделок
+    и из самой стратегии шла одним путём.
+
     Args:
         bot_id (int): ID бота.
     """
     try:
-        bot = Bot.objects.get(id=bot_id)
-        strategy = TradingStrategy(bot)
-        strategy.cancel_all_orders()  # Отменяем все ордера
-        bot.status = 'stopped'
-        bot.is_running = False
-        bot.save()
-        # Сбрасываем состояние позиции
-        position = BotPosition.objects.get(bot=bot)
-        position.position = 0
-        position.avg_price = 0
-        position.sell_order_id = None
-        position.buy_orders = []
-        position.position_opened = False
-        position.save()
-        logger.info(f"Бот {bot_id} остановлен")
+        bot = Bot.objects.select_related(*BOT_RELATED_FIELDS).get(id=bot_id)
+        TradingStrategy(bot).stop_bot()
     except Bot.DoesNotExist:
         logger.error(f"Бот с id={bot_id} не найден")
     except Exception as e:
@@ -1414,15 +2303,15 @@ def run_trading_strategy(bot_id):
         bot_id (int): ID бота.
     """
     try:
-        bot = Bot.objects.get(id=bot_id)
+        bot = Bot.objects.select_related(*BOT_RELATED_FIELDS).get(id=bot_id)
         if bot.status != 'active' or not bot.is_running:
-            logger.info(f"Бот {bot_id} не активен или не запущен, пропуск задачи")
+            logger.info("Бот %s не активен или не запущен, пропуск задачи", bot_id)
             return
-        strategy = TradingStrategy(bot)
+        strategy = get_strategy(bot)
         strategy.execute()  # Выполнение торговой стратегии
-        logger.info(f"Задача для бота {bot_id} выполнена")
+        logger.info("Задача для бота %s выполнена", bot_id)
     except Bot.DoesNotExist:
         logger.error(f"Бот с id={bot_id} не найден")
     except Exception as e:
         logger.error(f"Ошибка при выполнении стратегии для бота {bot_id}: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
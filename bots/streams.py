@@ -0,0 +1,360 @@
+# bots/streams.py
+import hashlib
+import hmac
+import logging
+import threading
+import time
+import orjson
+import websocket
+from .utils import okx_inst_id
+
+logger = logging.getLogger(__name__)
+
+# Публичные WebSocket-потоки тикеров по бирже и категории
+_PUBLIC_STREAM_URLS = {
+    ('bybit', 'spot'): "wss://stream.bybit.com/v5/public/spot",
+    ('bybit', 'linear'): "wss://stream.bybit.com/v5/public/linear",
+    ('binance', 'spot'): "wss://stream.binance.com:9443/ws",
+    ('binance', 'linear'): "wss://fstream.binance.com/ws",
+    ('okx', 'spot'): "wss://ws.okx.com:8443/ws/v5/public",
+    ('okx', 'linear'): "wss://ws.okx.com:8443/ws/v5/public",
+}
+
+
+def _subscribe_message(exchange, category, symbol):
+    """
+    Формирует сообщение подписки на тикер символа.
+
+    Args:
+        exchange (str): Биржа.
+        category (str): Категория ('spot' или 'linear').
+        symbol (str): Символ без разделителя.
+
+    Returns:
+        bytes: JSON-сообщение подписки (websocket-client отправляет его текстовым фреймом).
+    """
+    if exchange == 'bybit':
+        return orjson.dumps({"op": "subscribe", "args": [f"tickers.{symbol}"]})
+    if exchange == 'binance':
+        return orjson.dumps({"method": "SUBSCRIBE", "params": [f"{symbol.lower()}@ticker"], "id": int(time.time() * 1000)})
+    return orjson.dumps({"op": "subscribe", "args": [{"channel": "tickers", "instId": okx_inst_id(symbol, category)}]})
+
+
+def _parse_ticker(exchange, message):
+    """
+    Извлекает символ и последнюю цену из сообщения тикера.
+
+    Args:
+        exchange (str): Биржа.
+        message (dict): Разобранное сообщение потока.
+
+    Returns:
+        tuple: (символ без разделителя, цена) или None, если сообщение не является тикером.
+    """
+    if exchange == 'bybit':
+        data = message.get('data')
+        if not message.get('topic', '').startswith('tickers.') or not data or 'lastPrice' not in data:
+            return None
+        return data['symbol'], float(data['lastPrice'])
+    if exchange == 'binance':
+        if message.get('e') != '24hrTicker':
+            return None
+        return message['s'], float(message['c'])
+    if message.get('arg', {}).get('channel') != 'tickers' or not message.get('data'):
+        return None
+    ticker = message['data'][0]
+    return ticker['instId'].replace('-SWAP', '').replace('-', ''), float(ticker['last'])
+
+
+class PriceFeed:
+    """
+    Последние цены из публичных WebSocket-потоков тикеров.
+
+    На каждую пару (биржа, категория) открывается одно соединение в фоновом потоке;
+    символы подписываются при первом запросе цены. Стратегии читают цену из памяти
+    вместо REST-запроса на каждой итерации, поэтому боты одного процесса с общей парой
+    используют одну подписку.
+    """
+
+    def __init__(self, max_age=2.0):
+        """
+        Args:
+            max_age (float): Максимальный возраст цены в секундах; более старая цена не возвращается.
+        """
+        self.max_age = max_age
+        self._prices = {}
+        self._symbols = {}
+        self._sockets = {}
+        self._lock = threading.Lock()
+
+    def get_price(self, exchange, symbol, category):
+        """
+        Возвращает последнюю цену символа из потока и подписывается на него при первом обращении.
+
+        Args:
+            exchange (str): Биржа.
+            symbol (str): Символ без разделителя.
+            category (str): Категория ('spot' или 'linear').
+
+        Returns:
+            float: Цена или None, если её ещё нет или она старше max_age.
+        """
+        if (exchange, category) not in _PUBLIC_STREAM_URLS:
+            return None
+        with self._lock:
+            entry = self._prices.get((exchange, category, symbol))
+            if entry is None:
+                self._subscribe(exchange, category, symbol)
+                return None
+        price, received_at = entry
+        if time.monotonic() - received_at > self.max_age:
+            return None
+        return price
+
+    def _subscribe(self, exchange, category, symbol):
+        """
+        Регистрирует символ и запускает соединение для биржи и категории, если его ещё нет.
+        Вызывается под self._lock.
+        """
+        symbols = self._symbols.setdefault((exchange, category), set())
+        if symbol in symbols:
+            return
+        symbols.add(symbol)
+        ws = self._sockets.get((exchange, category))
+        if ws is None:
+            self._start(exchange, category)
+        elif ws.sock and ws.sock.connected:
+            ws.send(_subscribe_message(exchange, category, symbol))
+
+    def _start(self, exchange, category):
+        """
+        Открывает соединение в фоновом потоке с автоматическим переподключением.
+        """
+        key = (exchange, category)
+
+        def on_open(ws):
+            with self._lock:
+                symbols = list(self._symbols.get(key, ()))
+            for symbol in symbols:
+                ws.send(_subscribe_message(exchange, category, symbol))
+            logger.info("Поток цен %s (%s) подключён, подписок: %s", exchange, category, len(symbols))
+
+        def on_message(ws, raw):
+            try:
+                ticker = _parse_ticker(exchange, orjson.loads(raw))
+            except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+                return
+            if ticker is not None:
+                symbol, price = ticker
+                self._prices[(exchange, category, symbol)] = (price, time.monotonic())
+
+        def on_error(ws, error):
+            logger.warning("Ошибка потока цен %s (%s): %s", exchange, category, error)
+
+        ws = websocket.WebSocketApp(
+            _PUBLIC_STREAM_URLS[key], on_open=on_open, on_message=on_message, on_error=on_error
+        )
+        self._sockets[key] = ws
+        thread = threading.Thread(
+            target=ws.run_forever,
+            kwargs={'ping_interval': 20, 'ping_timeout': 10, 'reconnect': 5},
+            name=f"price-feed-{exchange}-{category}",
+            daemon=True,
+        )
+        thread.start()
+
+
+class BybitOrderStream:
+    """
+    Приватный WebSocket-поток ордеров Bybit (топик order) для одного API-ключа.
+
+    Исполненные ордера накапливаются в памяти и забираются стратегией на следующей итерации,
+    поэтому исполнение становится известно без REST-опроса открытых ордеров.
+    """
+    URL = "wss://stream.bybit.com/v5/private"
+    # Сколько хранить исполненный ордер, который ещё не забрала стратегия
+    FILL_TTL = 3600
+
+    def __init__(self, api_key, api_secret):
+        """
+        Args:
+            api_key (str): API-ключ.
+            api_secret (str): Секретный ключ.
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._fills = {}
+        self._lock = threading.Lock()
+        self._authenticated = False
+        self._ws = websocket.WebSocketApp(
+            self.URL, on_open=self._on_open, on_message=self._on_message,
+            on_error=self._on_error, on_close=self._on_close
+        )
+        threading.Thread(
+            target=self._ws.run_forever,
+            kwargs={'ping_interval': 20, 'ping_timeout': 10, 'reconnect': 5},
+            name="order-stream-bybit",
+            daemon=True,
+        ).start()
+
+    def is_connected(self):
+        """
+        Returns:
+            bool: True, если поток авторизован и подписан на ордера.
+        """
+        return self._authenticated
+
+    def pop_fills(self, order_ids):
+        """
+        Забирает исполненные ордера из числа отслеживаемых.
+
+        Args:
+            order_ids (set): ID ордеров, которые отслеживает стратегия.
+
+        Returns:
+            list: Данные исполненных ордеров в формате топика order Bybit.
+        """
+        with self._lock:
+            return [self._fills.pop(order_id)[0] for order_id in order_ids if order_id in self._fills]
+
+    def close(self):
+        """
+        Закрывает поток без повторного подключения и удаляет секретный ключ из памяти.
+        """
+        self._authenticated = False
+        self.api_secret = None
+        with self._lock:
+            self._fills.clear()
+        self._ws.close()
+
+    def _on_open(self, ws):
+        if self.api_secret is None:
+            # Поток уже закрыт: переподключение, начавшееся до close(), не авторизуется
+            ws.close()
+            return
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'), f"GET/realtime{expires}".encode('utf-8'), hashlib.sha256
+        ).hexdigest()
+        ws.send(orjson.dumps({"op": "auth", "args": [self.api_key, expires, signature]}))
+
+    def _on_message(self, ws, raw):
+        try:
+            message = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return
+        if message.get('op') == 'auth':
+            if message.get('success'):
+                ws.send(orjson.dumps({"op": "subscribe", "args": ["order"]}))
+            else:
+                logger.error("Авторизация приватного потока Bybit не удалась: %s", message.get('ret_msg'))
+            return
+        if message.get('op') == 'subscribe':
+            self._authenticated = bool(message.get('success'))
+            logger.info("Приватный поток ордеров Bybit подписан: %s", self._authenticated)
+            return
+        if message.get('topic') != 'order':
+            return
+        now = time.monotonic()
+        with self._lock:
+            for order in message.get('data', []):
+                if order.get('orderStatus') == 'Filled':
+                    self._fills[order['orderId']] = (order, now)
+            expired = [order_id for order_id, (_, received_at) in self._fills.items() if now - received_at > self.FILL_TTL]
+            for order_id in expired:
+                del self._fills[order_id]
+
+    def _on_error(self, ws, error):
+        logger.warning("Ошибка приватного потока ордеров Bybit: %s", error)
+
+    def _on_close(self, ws, status_code, message):
+        # До повторной подписки исполнения могут быть пропущены: стратегия возвращается к REST-опросу
+        self._authenticated = False
+
+
+# ID API-ключа -> (отпечаток ключей, поток, ID ботов процесса, использующих поток)
+_order_streams = {}
+_order_streams_lock = threading.Lock()
+
+
+def _key_fingerprint(api_key, api_secret):
+    """
+    Возвращает отпечаток пары ключей, по которому замечается их смена без хранения секрета в реестре.
+
+    Args:
+        api_key (str): API-ключ.
+        api_secret (str): Секретный ключ.
+
+    Returns:
+        str: SHA-256 от пары ключей.
+    """
+    return hashlib.sha256(f"{api_key}:{api_secret}".encode('utf-8')).hexdigest()
+
+
+def _detach_bot(bot_id, keep=None):
+    """
+    Отвязывает бота от потоков реестра; вызывается под _order_streams_lock.
+
+    Args:
+        bot_id (int): ID бота.
+        keep (int, optional): ID API-ключа, поток которого не трогается.
+
+    Returns:
+        list: Потоки, которыми больше не пользуется ни один бот; закрываются вызывающим вне блокировки.
+    """
+    unused = []
+    for api_key_id, (_, stream, bot_ids) in list(_order_streams.items()):
+        if api_key_id == keep or bot_id not in bot_ids:
+            continue
+        bot_ids.discard(bot_id)
+        if not bot_ids:
+            del _order_streams[api_key_id]
+            unused.append(stream)
+    return unused
+
+
+def get_order_stream(api_key_id, api_key, api_secret, bot_id):
+    """
+    Возвращает приватный поток ордеров Bybit для API-ключа, открывая его при первом обращении.
+
+    Поток общий для ботов процесса с одним ключом. Если ключи изменились, прежний поток закрывается
+    и открывается новый.
+
+    Args:
+        api_key_id (int): ID модели APIKey.
+        api_key (str): API-ключ.
+        api_secret (str): Секретный ключ.
+        bot_id (int): ID бота, который будет использовать поток.
+
+    Returns:
+        BybitOrderStream: Поток ордеров.
+    """
+    fingerprint = _key_fingerprint(api_key, api_secret)
+    with _order_streams_lock:
+        unused = _detach_bot(bot_id, keep=api_key_id)
+        entry = _order_streams.get(api_key_id)
+        if entry is not None and entry[0] != fingerprint:
+            unused.append(entry[1])
+            logger.info("Ключи API %s изменились, приватный поток ордеров переоткрывается", api_key_id)
+            entry = (fingerprint, BybitOrderStream(api_key, api_secret), entry[2])
+            _order_streams[api_key_id] = entry
+        elif entry is None:
+            entry = (fingerprint, BybitOrderStream(api_key, api_secret), set())
+            _order_streams[api_key_id] = entry
+        entry[2].add(bot_id)
+    for stream in unused:
+        stream.close()
+    return entry[1]
+
+
+def release_order_stream(bot_id):
+    """
+    Отвязывает бота от приватного потока ордеров и закрывает поток, если им больше никто не пользуется.
+
+    Args:
+        bot_id (int): ID бота.
+    """
+    with _order_streams_lock:
+        unused = _detach_bot(bot_id)
+    for stream in unused:
+        stream.close()
@@ -1,15 +1,77 @@
 # bots/tasks.py
 from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init
+from django.conf import settings
 from django.core.cache import cache
+from django.db import DatabaseError, DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import asyncio
+import orjson
 import time
 import logging
 import sentry_sdk
 from .models import Bot, LogEntry
-from .strategies import TradingStrategy, stop_bot
+from .strategies import get_strategy, stop_bot, execute_strategies, preload_exchange_filters, BOT_RELATED_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# Буфер записей журнала в Redis: log_action добавляет запись в список, flush_log_entries переносит их в БД пачками
+LOG_BUFFER_ENABLED = getattr(settings, 'LOG_BUFFER_ENABLED', True)
+LOG_BUFFER_KEY = getattr(settings, 'LOG_BUFFER_KEY', 'log_entries')
+LOG_FLUSH_BATCH_SIZE = getattr(settings, 'LOG_FLUSH_BATCH_SIZE', 500)
+# Сколько пачек переносит один запуск flush_log_entries, чтобы задача не занимала воркер надолго
+LOG_FLUSH_MAX_BATCHES = getattr(settings, 'LOG_FLUSH_MAX_BATCHES', 20)
+# Записи, которые БД отклоняет, переносятся в отдельный список, чтобы не задерживать перенос остальных
+LOG_DEAD_LETTER_KEY = getattr(settings, 'LOG_DEAD_LETTER_KEY', 'log_entries_dead')
+# Пока БД недоступна, записи возвращаются в буфер не дольше этого срока (секунды) с момента события
+LOG_BUFFER_MAX_AGE = getattr(settings, 'LOG_BUFFER_MAX_AGE', 24 * 3600)
+
+# Пакетный режим: вместо цепочки отложенных задач на каждого бота dispatch_trading_batches (Celery beat)
+# собирает ботов, у которых подошло время итерации, и выполняет их итерации одновременно пачками
+STRATEGY_BATCH_ENABLED = getattr(settings, 'STRATEGY_BATCH_ENABLED', False)
+STRATEGY_BATCH_SIZE = getattr(settings, 'STRATEGY_BATCH_SIZE', 32)
+
+def _lock_key(bot_id):
+    """
+    Ключ блокировки итерации бота, общий для run_trading_strategy и run_trading_strategies_batch.
+    """
+    return f"run_trading_strategy_{bot_id}"
+
+def _due_key(bot_id):
+    """
+    Ключ отметки бота в пакетном режиме: пока отметка не истекла, следующая итерация не нужна.
+    """
+    return f"strategy_due_{bot_id}"
+
+def _log_buffer():
+    """
+    Возвращает клиент Redis для буфера журнала.
+
+    Returns:
+        Redis: Клиент или None, если буфер отключён или кэш не на Redis (тогда запись идёт сразу в БД).
+    """
+    if not LOG_BUFFER_ENABLED:
+        return None
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        return None
+
+@worker_process_init.connect
+def warm_instrument_cache(**kwargs):
+    """
+    Загружает параметры инструментов бирж при старте процесса воркера.
+    """
+    if not getattr(settings, 'INSTRUMENTS_PRELOAD', True):
+        return
+    try:
+        preload_exchange_filters()
+    except Exception as e:
+        logger.error(f"Ошибка предварительной загрузки параметров инструментов: {str(e)}")
+
 @shared_task
 def log_action(user_id, bot_id, action, details, status, error_message=None, financial_result=None):
     """
@@ -41,6 +103,12 @@ def log_action(user_id, bot_id, action, details, status, error_message=None, fin
         if not bot_id:
             logger.warning("bot_id не указан, пропуск логирования")
             return
+        buffer = _log_buffer()
+        if buffer is not None:
+            # Время фиксируется в момент события, а не при переносе в БД
+            buffer.rpush(LOG_BUFFER_KEY, orjson.dumps({**log_data, "timestamp": timezone.now().isoformat()}))
+            logger.debug("Действие добавлено в буфер журнала: %s", action)
+            return
         bot = Bot.objects.get(id=bot_id)
         LogEntry.objects.create(
             user_id=user_id,
@@ -59,6 +127,187 @@ def log_action(user_id, bot_id, action, details, status, error_message=None, fin
         logger.error(f"Ошибка при логировании действия: {str(e)}", exc_info=True)
         sentry_sdk.capture_exception(e)
 
+def _log_entry(record):
+    """
+    Строит запись журнала из записи буфера.
+
+    Args:
+        record (dict): Запись, добавленная log_action.
+
+    Returns:
+        LogEntry: Несохранённая запись.
+
+    Raises:
+        KeyError, TypeError, ValueError: Если запись некорректна (нет поля, неверный ID или время).
+    """
+    timestamp = parse_datetime(record['timestamp'])
+    if timestamp is None:
+        raise ValueError(f"Некорректное время записи журнала: {record['timestamp']}")
+    return LogEntry(
+        user_id=int(record['user_id']),
+        bot_id=int(record['bot_id']),
+        action=record['action'],
+        details=record['details'],
+        status=record['status'],
+        error_message=record['error_message'],
+        financial_result=record['financial_result'],
+        timestamp=timestamp,
+    )
+
+def _dead_letter(buffer, raw_entries, reason):
+    """
+    Переносит записи буфера, которые нельзя записать в БД, в список LOG_DEAD_LETTER_KEY.
+
+    Args:
+        buffer (Redis): Клиент Redis буфера журнала.
+        raw_entries (list): Записи в исходном виде (байты JSON).
+        reason (str): Причина для журнала ошибок.
+    """
+    buffer.rpush(LOG_DEAD_LETTER_KEY, *raw_entries)
+    logger.error("Записи журнала перенесены в %s (%s): %s", LOG_DEAD_LETTER_KEY, reason, len(raw_entries))
+    for raw in raw_entries:
+        logger.warning("Отложенная запись журнала: %s", raw)
+
+def _is_stale(raw, now):
+    """
+    Проверяет, что запись буфера старше LOG_BUFFER_MAX_AGE секунд (или её время не прочитать).
+    """
+    try:
+        timestamp = parse_datetime(orjson.loads(raw)['timestamp'])
+    except (ValueError, KeyError, TypeError):
+        return True
+    return timestamp is None or (now - timestamp).total_seconds() > LOG_BUFFER_MAX_AGE
+
+def _flush_batch(buffer, raw_entries):
+    """
+    Записывает пачку из буфера в БД.
+
+    Пачка вставляется одним bulk_create. Если его отклоняет какая-то запись (например, action длиннее
+    поля), пачка вставляется по одной записи, и в LOG_DEAD_LETTER_KEY уходят только отклонённые.
+    Некорректные записи уходят туда же сразу, записи удалённых ботов отбрасываются.
+
+    Args:
+        buffer (Redis): Клиент Redis буфера журнала.
+        raw_entries (list): Записи в исходном виде (байты JSON).
+
+    Returns:
+        int: Количество записанных в БД записей.
+
+    Raises:
+        DatabaseError: Если БД недоступна; ни одна запись пачки при этом не потеряна.
+    """
+    parsed = []
+    rejected = []
+    for raw in raw_entries:
+        try:
+            parsed.append((raw, _log_entry(orjson.loads(raw))))
+        except (KeyError, TypeError, ValueError):
+            rejected.append(raw)
+    existing_bots = set(
+        Bot.objects.filter(id__in={entry.bot_id for _, entry in parsed}).values_list('id', flat=True)
+    )
+    pending = [(raw, entry) for raw, entry in parsed if entry.bot_id in existing_bots]
+    if len(pending) < len(parsed):
+        logger.warning("Пропущено %s записей журнала удалённых ботов", len(parsed) - len(pending))
+    written = 0
+    try:
+        with transaction.atomic():
+            LogEntry.objects.bulk_create([entry for _, entry in pending], batch_size=LOG_FLUSH_BATCH_SIZE)
+        written = len(pending)
+    except (DataError, IntegrityError, ValueError, TypeError) as e:
+        logger.warning("Пачка журнала отклонена (%s), запись по одной", str(e))
+        for raw, entry in pending:
+            entry.pk = None
+            try:
+                # Точка сохранения на запись: ошибка одной не прерывает транзакцию остальных
+                with transaction.atomic():
+                    entry.save(force_insert=True)
+                written += 1
+            except (DataError, IntegrityError, ValueError, TypeError):
+                rejected.append(raw)
+    if rejected:
+        _dead_letter(buffer, rejected, "запись отклонена")
+    return written
+
+@shared_task
+def flush_log_entries():
+    """
+    Переносит записи журнала из буфера Redis в БД пачками через bulk_create.
+
+    Запускается периодически через Celery beat. Записи читаются в порядке добавления; записи
+    удалённых ботов отбрасываются, а записи, которые БД отклоняет, переносятся в LOG_DEAD_LETTER_KEY,
+    чтобы не задерживать остальные. Если БД недоступна, пачка возвращается в начало буфера,
+    кроме записей старше LOG_BUFFER_MAX_AGE, которые тоже уходят в LOG_DEAD_LETTER_KEY.
+
+    Returns:
+        int: Количество записанных в БД записей.
+    """
+    buffer = _log_buffer()
+    if buffer is None:
+        return 0
+    written = 0
+    for _ in range(LOG_FLUSH_MAX_BATCHES):
+        # LRANGE + LTRIM в одной транзакции: пачка забирается атомарно при любой версии Redis
+        pipe = buffer.pipeline()
+        pipe.lrange(LOG_BUFFER_KEY, 0, LOG_FLUSH_BATCH_SIZE - 1)
+        pipe.ltrim(LOG_BUFFER_KEY, LOG_FLUSH_BATCH_SIZE, -1)
+        raw_entries, _ = pipe.execute()
+        if not raw_entries:
+            break
+        try:
+            written += _flush_batch(buffer, raw_entries)
+        except DatabaseError as e:
+            now = timezone.now()
+            stale = [raw for raw in raw_entries if _is_stale(raw, now)]
+            fresh = [raw for raw in raw_entries if not _is_stale(raw, now)]
+            if stale:
+                _dead_letter(buffer, stale, "устарели при недоступной БД")
+            if fresh:
+                buffer.lpush(LOG_BUFFER_KEY, *reversed(fresh))
+            logger.error(f"Ошибка записи журнала из буфера: {str(e)}", exc_info=True)
+            sentry_sdk.capture_exception(e)
+            break
+        if len(raw_entries) < LOG_FLUSH_BATCH_SIZE:
+            break
+    if written:
+        logger.info("Записано в журнал из буфера: %s", written)
+    return written
+
+def _finish_tick(bot, strategy):
+    """
+    Записывает результат итерации стратегии в журнал и останавливает бота по лимиту сделок.
+
+    Args:
+        bot (Bot): Бот.
+        strategy (TradingStrategy): Стратегия бота после итерации.
+
+    Returns:
+        bool: False, если бот остановлен по лимиту сделок и следующая итерация не нужна.
+    """
+    position_obj = strategy.position_obj
+    financial_result = {
+        'position': position_obj.position,
+        'avg_price': position_obj.avg_price,
+        'deals_completed': bot.deals_completed
+    }
+    log_action.delay(
+        user_id=bot.user.id if bot.user else None,
+        bot_id=bot.id,
+        action="Strategy executed",
+        details=f"Выполнена стратегия {bot.trade_mode} для бота {bot.name}, "
+                f"сигналы: {strategy.combined_signals or strategy.signal_type}, "
+                f"позиция: {position_obj.position}, сделок завершено: {bot.deals_completed}",
+        status="success",
+        financial_result=financial_result
+    )
+
+    # Проверяем условие остановки после сделок
+    if bot.settings.stop_after_deals and bot.deals_completed >= bot.settings.stop_after_deals:
+        logger.info(f"Бот {bot.id} остановлен после достижения лимита сделок: {bot.deals_completed}")
+        stop_bot.delay(bot.id)
+        return False
+    return True
+
 @shared_task(bind=True, max_retries=3, soft_time_limit=50, time_limit=60)
 def run_trading_strategy(self, bot_id):
     """
@@ -68,19 +317,19 @@ def run_trading_strategy(self, bot_id):
         bot_id (int): ID бота.
     """
     start_time = time.time()
-    task_key = f"run_trading_strategy_{bot_id}"
+    task_key = _lock_key(bot_id)
     logger.info(f"Запуск торговой стратегии для бота {bot_id}")
     bot = None
+    lock_acquired = False
     try:
-        # Проверяем блокировку задачи
-        if cache.get(task_key):
+        # Атомарно берём блокировку (SET NX в Redis): одно обращение к кэшу и без гонки между воркерами
+        if not cache.add(task_key, True, timeout=60):
             logger.warning(f"Задача для бота {bot_id} уже выполняется, пропуск")
             return
+        lock_acquired = True
 
-        # Устанавливаем блокировку
-        cache.set(task_key, True, timeout=60)
-
-        bot = Bot.objects.get(id=bot_id)
+        # Ключ API, настройки, пользователь и позиция подгружаются тем же запросом
+        bot = Bot.objects.select_related(*BOT_RELATED_FIELDS).get(id=bot_id)
         if not bot.is_running or bot.status != 'active':
             logger.warning(f"Бот {bot_id} не активен или не запущен, пропуск задачи")
             cache.delete(task_key)
@@ -98,13 +347,13 @@ def run_trading_strategy(self, bot_id):
                 "signal_interval": bot.settings.signal_interval
             })
 
-        strategy = TradingStrategy(bot)
+        strategy = get_strategy(bot)
         logger.debug(f"Стратегия инициализирована для бота {bot_id}: exchange={bot.api_key.exchange}, "
                      f"trading_pair={bot.trading_pair}, category={'futures' if bot.strategy == 'futures' else 'spot'}")
 
         # Проверяем сигнал
         signal = strategy.check_signal()
-        logger.debug(f"Результат проверки сигнала для бота {bot_id}: {signal}")
+        logger.debug("Результат проверки сигнала для бота %s: %s", bot_id, signal)
 
         # Выполняем стратегию
         if signal:
@@ -113,40 +362,23 @@ def run_trading_strategy(self, bot_id):
         else:
             logger.info(f"Сигнал не сработал для бота {bot_id}, ожидание следующей проверки")
 
-        # Логируем результат
-        position_obj = strategy.position_obj
-        financial_result = {
-            'position': position_obj.position,
-            'avg_price': position_obj.avg_price,
-            'deals_completed': bot.deals_completed
-        }
-        log_action.delay(
-            user_id=bot.user.id if bot.user else None,
-            bot_id=bot.id,
-            action="Strategy executed",
-            details=f"Выполнена стратегия {bot.trade_mode} для бота {bot.name}, "
-                    f"сигналы: {strategy.combined_signals or strategy.signal_type}, "
-                    f"позиция: {position_obj.position}, сделок завершено: {bot.deals_completed}",
-            status="success",
-            financial_result=financial_result
-        )
-
-        # Проверяем условие остановки после сделок
-        if bot.settings.stop_after_deals and bot.deals_completed >= bot.settings.stop_after_deals:
-            logger.info(f"Бот {bot_id} остановлен после достижения лимита сделок: {bot.deals_completed}")
-            stop_bot.delay(bot_id)
+        # Логируем результат и проверяем лимит сделок
+        if not _finish_tick(bot, strategy):
             cache.delete(task_key)
             return
 
-        # Планируем следующую задачу, используя task_interval
         interval_seconds = bot.settings.task_interval * 60  # Используем новое поле
-        if bot.is_running and bot.status == 'active':
+        if STRATEGY_BATCH_ENABLED:
+            # Следующую итерацию выполнит пакет dispatch_trading_batches после истечения отметки
+            cache.set(_due_key(bot_id), 1, timeout=interval_seconds)
+        elif bot.is_running and bot.status == 'active':
+            # Планируем следующую задачу, используя task_interval
             run_trading_strategy.apply_async(
                 (bot_id,),
                 countdown=interval_seconds,
                 task_id=f"run_trading_strategy_{bot_id}_{int(time.time())}"
             )
-            logger.debug(f"Запланирована следующая задача для бота {bot_id} через {interval_seconds} секунд")
+            logger.debug("Запланирована следующая задача для бота %s через %s секунд", bot_id, interval_seconds)
 
         execution_time = time.time() - start_time
         logger.info(f"Задача завершена за {execution_time:.2f} секунд")
@@ -188,5 +420,85 @@ def run_trading_strategy(self, bot_id):
         countdown = 60 * (2 ** self.request.retries)
         raise self.retry(countdown=countdown, exc=e)
     finally:
-        # Удаляем блокировку после завершения задачи
-        cache.delete(task_key)
\ No newline at end of file
+        # Удаляем блокировку после завершения задачи; чужую блокировку не трогаем
+        if lock_acquired:
+            cache.delete(task_key)
+
+@shared_task(soft_time_limit=50, time_limit=60)
+def run_trading_strategies_batch(bot_ids):
+    """
+    Выполняет по одной итерации стратегий нескольких ботов одновременно.
+
+    Итерации идут параллельно через execute_strategies, так что время задачи определяется самым
+    медленным ботом, а не суммой по ботам. Как и в run_trading_strategy, бот выполняется только
+    под своей блокировкой, результат записывается в журнал, а по лимиту сделок бот останавливается.
+    Следующие итерации планирует dispatch_trading_batches.
+
+    Args:
+        bot_ids (list): ID ботов.
+    """
+    start_time = time.time()
+    # Бота, итерация которого уже идёт в другой задаче, пропускаем
+    locked = [bot_id for bot_id in bot_ids if cache.add(_lock_key(bot_id), True, timeout=60)]
+    try:
+        bots = Bot.objects.select_related(*BOT_RELATED_FIELDS).filter(
+            id__in=locked, is_running=True, status='active'
+        )
+        ticks = []
+        for bot in bots:
+            try:
+                ticks.append((bot, get_strategy(bot)))
+            except Exception as e:
+                logger.error(f"Ошибка инициализации стратегии для бота {bot.id}: {str(e)}")
+                sentry_sdk.capture_exception(e)
+        results = asyncio.run(execute_strategies([strategy for _, strategy in ticks]))
+        for (bot, strategy), result in zip(ticks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка в торговой стратегии для бота {bot.id}: {str(result)}")
+                log_action.delay(
+                    user_id=bot.user.id if bot.user else None,
+                    bot_id=bot.id,
+                    action="Strategy execution failed",
+                    details=f"Ошибка выполнения стратегии: {str(result)}",
+                    status="error",
+                    error_message=str(result)
+                )
+                sentry_sdk.capture_exception(result)
+                continue
+            _finish_tick(bot, strategy)
+        logger.info(f"Пакет стратегий выполнен за {time.time() - start_time:.2f} секунд: ботов {len(ticks)}")
+    except SoftTimeLimitExceeded:
+        # Итерации в потоках пула продолжаются: блокировки не снимаем, они истекут сами
+        logger.error(f"Превышен мягкий лимит времени выполнения пакета ботов {locked}")
+        sentry_sdk.capture_exception(SoftTimeLimitExceeded())
+        locked = []
+    finally:
+        if locked:
+            cache.delete_many([_lock_key(bot_id) for bot_id in locked])
+
+@shared_task
+def dispatch_trading_batches():
+    """
+    Отправляет на выполнение пакеты ботов, у которых подошло время следующей итерации.
+
+    Запускается периодически через Celery beat и работает только при STRATEGY_BATCH_ENABLED.
+    Бот готов к итерации, когда истекла его отметка strategy_due_<id>. Отметка ставится на
+    task_interval минут через cache.add, поэтому бот не попадёт в два пакета одновременно.
+
+    Returns:
+        int: Количество ботов, отправленных на выполнение.
+    """
+    if not STRATEGY_BATCH_ENABLED:
+        return 0
+    due = [
+        bot_id
+        for bot_id, task_interval in Bot.objects.filter(is_running=True, status='active').values_list(
+            'id', 'settings__task_interval'
+        )
+        if cache.add(_due_key(bot_id), 1, timeout=task_interval * 60)
+    ]
+    for start in range(0, len(due), STRATEGY_BATCH_SIZE):
+        run_trading_strategies_batch.delay(due[start:start + STRATEGY_BATCH_SIZE])
+    if due:
+        logger.info("Отправлено на выполнение ботов: %s", len(due))
+    return len(due)
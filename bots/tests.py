@@ -1,372 +1,674 @@
-from django.test import TestCase
-from django.contrib.auth.models import User
-from rest_framework.test import APIClient
-from .models import APIKey, Bot, BotSettings, BotPosition
-from .serializers import APIKeySerializer, BotSerializer, BotSettingsSerializer, BotStatusSerializer
-from .strategies import TradingStrategy
-from unittest.mock import patch
+import pytest
+from rest_framework import serializers
+from .models import Bot, BotSettings
+from .serializers import APIKeySerializer, BotSerializer, BotSettingsSerializer
+from .utils import reset_instrument_cache
+from unittest.mock import MagicMock
+import copy
+from decimal import Decimal
 import json
+import orjson
 import logging
+import numpy as np
+import time
 
 logger = logging.getLogger(__name__)
 
-class APITests(TestCase):
-    def setUp(self):
-        """
-        Настройка тестового окружения: создаём пользователя и аутентифицируем клиента.
-        """
-        self.user = User.objects.create_user(username='testuser', password='testpass')
-        self.client = APIClient()
-        self.client.force_authenticate(user=self.user)
-        logger.info("Тестовое окружение настроено: пользователь создан и аутентифицирован")
-
-    def test_create_api_key(self):
-        """
-        Тест создания API-ключа.
-        """
-        data = {
-            'exchange': 'bybit',
-            'api_key': 'test_api_key',
-            'api_secret': 'test_api_secret'
-        }
-        with patch('requests.get') as mock_get:
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.json.return_value = {'retCode': 0}
-            serializer = APIKeySerializer(data=data, context={'request': self.client.request(user=self.user)})
-            self.assertTrue(serializer.is_valid(), serializer.errors)
-            api_key = serializer.save()
-            self.assertEqual(api_key.exchange, 'bybit')
-            self.assertTrue(api_key.api_key.startswith('enc:'), "API-ключ должен быть зашифрован")
-            self.assertTrue(api_key.api_secret.startswith('enc:'), "API-секрет должен быть зашифрован")
-            logger.info("Тест создания API-ключа успешно пройден")
-
-    def test_create_bot(self):
-        """
-        Тест создания бота.
-        """
-        api_key = APIKey.objects.create(
-            user=self.user,
-            exchange='bybit',
-            api_key='enc:test_api_key',
-            api_secret='enc:test_api_secret'
-        )
-        data = {
-            'api_key_id': api_key.id,
-            'strategy': 'spot',
-            'algorithm': 'long',
-            'trading_pair': 'BTCUSDT',
-            'deposit': 1000,
-            'trade_mode': 'order_grid',
-            'additional_settings': {'base_quantity': 0.1},
-            'settings': {
-                'signal_type': 'rsi',
-                'signal_params': {'period': 14, 'threshold': 30},
-                'signal_interval': '1h',
-                'take_profit': 2.0,
-                'grid_orders': 5,
-                'grid_spacing': 1.0,
-                'grid_overlap': 20.0,
-                'martingale': 1.5,
-                'logarithmic_distribution': False,
-                'partial_grid': False,
-                'grid_follow': False,
-                'stop_after_deals': False,
-                'preset': 'moderate'
+# Ответы биржи, общие для тестов
+_TRADING_PAIRS_OK = {'retCode': 0, 'result': {'list': [{'symbol': 'BTCUSDT'}]}}
+_BALANCE_OK = {'retCode': 0, 'result': {'list': [{'totalAvailableBalance': '5000'}]}}
+_EMPTY_LIST_OK = {'retCode': 0, 'result': {'list': []}}
+_OK = {'retCode': 0, 'retMsg': 'OK'}
+_ORDER_CREATED = {'retCode': 0, 'result': {'orderId': '12345'}}
+_SERVER_TIME_OK = {'retCode': 0, 'result': {'timeNano': '1700000000000000000'}}
+# Ключ только с правом торговли на споте
+_API_KEY_INFO_OK = {'retCode': 0, 'retMsg': 'OK', 'result': {'permissions': {'Spot': ['Trade'], 'ContractTrade': []}}}
+# Параметры инструмента BTCUSDT; тест, которому нужны другие значения, изменяет copy.deepcopy
+_BASE_INSTRUMENT = {
+    'retCode': 0,
+    'result': {
+        'list': [{
+            'symbol': 'BTCUSDT',
+            'lotSizeFilter': {
+                'basePrecision': '0.001',
+                'minOrderQty': '0.001'
+            },
+            'priceFilter': {
+                'tickSize': '0.01'
             }
-        }
-        with patch('requests.get') as mock_get:
-            # Мокаем запросы для проверки торговой пары и баланса
-            mock_get.side_effect = [
-                # get_trading_pairs
-                type('Response', (), {'status_code': 200, 'json': lambda: {
-                    'retCode': 0,
-                    'result': {'list': [{'symbol': 'BTCUSDT'}]}
-                }})(),
-                # get_balance
-                type('Response', (), {'status_code': 200, 'json': lambda: {
-                    'retCode': 0,
-                    'result': {'list': [{'totalAvailableBalance': '5000'}]}
-                }})()
-            ]
-            serializer = BotSerializer(data=data, context={'request': self.client.request(user=self.user)})
-            self.assertTrue(serializer.is_valid(), serializer.errors)
-            bot = serializer.save()
-            self.assertEqual(bot.trading_pair, 'BTCUSDT')
-            self.assertEqual(bot.settings.signal_type, 'rsi')
-            self.assertEqual(bot.additional_settings['base_quantity'], 0.1)
-            self.assertEqual(bot.strategy, 'spot')
-            self.assertEqual(bot.algorithm, 'long')
-            logger.info("Тест создания бота успешно пройден")
-
-    def test_signal_params_validation(self):
-        """
-        Тест валидации signal_params для разных типов сигналов.
-        """
-        # Тест для RSI с некорректным threshold
-        data = {
-            'signal_type': 'rsi',
-            'signal_params': {'period': 14, 'threshold': -10},  # Неверный threshold
-            'signal_interval': '1h',
-            'take_profit': 2.0,
-            'grid_orders': 5,
-            'grid_spacing': 1.0,
-            'grid_overlap': 20.0,
-            'martingale': 1.5,
-            'logarithmic_distribution': False,
-            'partial_grid': False,
-            'grid_follow': False,
-            'stop_after_deals': False
-        }
-        serializer = BotSettingsSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('signal_params', serializer.errors)
-        self.assertIn('threshold должен быть числом в диапазоне 0–100', str(serializer.errors['signal_params']))
-        logger.info("Тест валидации signal_params для RSI (негативный threshold) пройден")
-
-        # Тест для RSI с отсутствующим threshold
-        data['signal_params'] = {'period': 14}  # Отсутствует threshold
-        serializer = BotSettingsSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('signal_params', serializer.errors)
-        self.assertIn("Отсутствует обязательное поле 'threshold'", str(serializer.errors['signal_params']))
-        logger.info("Тест валидации signal_params для RSI (отсутствие threshold) пройден")
-
-        # Тест для base_volume
-        data['signal_type'] = 'base_volume'
-        data['signal_params'] = {'threshold': 1000}
-        serializer = BotSettingsSerializer(data=data)
-        self.assertTrue(serializer.is_valid(), serializer.errors)
-        logger.info("Тест валидации signal_params для base_volume пройден")
-
-        # Тест для price с некорректным target_price
-        data['signal_type'] = 'price'
-        data['signal_params'] = {'target_price': -500}
-        serializer = BotSettingsSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('signal_params', serializer.errors)
-        self.assertIn('target_price должен быть положительным числом', str(serializer.errors['signal_params']))
-        logger.info("Тест валидации signal_params для price (негативный target_price) пройден")
-
-    def test_signal_interval_validation(self):
-        """
-        Тест валидации signal_interval.
-        """
-        data = {
-            'signal_type': 'rsi',
-            'signal_params': {'period': 14, 'threshold': 30},
-            'signal_interval': 'invalid_interval',  # Неверный интервал
-            'take_profit': 2.0,
-            'grid_orders': 5,
-            'grid_spacing': 1.0,
-            'grid_overlap': 20.0,
-            'martingale': 1.5,
-            'logarithmic_distribution': False,
-            'partial_grid': False,
-            'grid_follow': False,
-            'stop_after_deals': False
-        }
-        serializer = BotSettingsSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('signal_interval', serializer.errors)
-        logger.info("Тест валидации signal_interval (некорректный интервал) пройден")
-
-        data['signal_interval'] = '1m'  # Корректный интервал
-        serializer = BotSettingsSerializer(data=data)
-        self.assertTrue(serializer.is_valid(), serializer.errors)
-        logger.info("Тест валидации signal_interval (корректный интервал) пройден")
-
-        data['signal_interval'] = '1 минута'  # Текстовый формат интервала
-        serializer = BotSettingsSerializer(data=data)
-        self.assertTrue(serializer.is_valid(), serializer.errors)
-        logger.info("Тест валидации signal_interval (текстовый формат) пройден")
-
-    def test_bot_status_update(self):
-        """
-        Тест обновления статуса бота через BotStatusSerializer.
-        """
-        api_key = APIKey.objects.create(
-            user=self.user,
-            exchange='bybit',
-            api_key='enc:test_api_key',
-            api_secret='enc:test_api_secret'
-        )
-        bot_settings = BotSettings.objects.create(
-            signal_type='rsi',
-            signal_params={'period': 14, 'threshold': 30},
-            signal_interval='1h',
-            take_profit=2.0,
-            grid_orders=5,
-            grid_spacing=1.0,
-            grid_overlap=20.0,
-            martingale=1.5,
-            logarithmic_distribution=False,
-            partial_grid=False,
-            grid_follow=False,
-            stop_after_deals=False
-        )
-        bot = Bot.objects.create(
-            user=self.user,
-            name='Test Bot',
-            api_key=api_key,
-            trading_pair='BTCUSDT',
-            deposit=1000,
-            trade_mode='order_grid',
-            additional_settings={'base_quantity': 0.1},
-            settings=bot_settings,
-            status='active',
-            is_running=True
-        )
-        data = {
-            'status': 'stopped',
-            'is_running': False
-        }
-        with patch('bots.strategies.stop_bot.delay') as mock_stop_bot:
-            serializer = BotStatusSerializer(instance=bot, data=data)
-            self.assertTrue(serializer.is_valid(), serializer.errors)
-            updated_bot = serializer.save()
-            self.assertEqual(updated_bot.status, 'stopped')
-            self.assertFalse(updated_bot.is_running)
-            mock_stop_bot.assert_called_once_with(bot.id)
-            logger.info("Тест обновления статуса бота успешно пройден")
-
-class TradingStrategyTests(TestCase):
-    def setUp(self):
-        """
-        Настройка тестового окружения для TradingStrategy.
-        """
-        self.user = User.objects.create_user(username='testuser', password='testpass')
-        self.api_key = APIKey.objects.create(
-            user=self.user,
-            exchange='bybit',
-            api_key='enc:test_api_key',
-            api_secret='enc:test_api_secret'
-        )
-        self.bot_settings = BotSettings.objects.create(
-            signal_type='rsi',
-            signal_params={'period': 14, 'threshold': 30},
-            signal_interval='1h',
-            take_profit=2.0,
-            grid_orders=5,
-            grid_spacing=1.0,
-            grid_overlap=20.0,
-            martingale=1.5,
-            logarithmic_distribution=False,
-            partial_grid=False,
-            grid_follow=False,
-            stop_after_deals=False
-        )
-        self.bot = Bot.objects.create(
-            user=self.user,
-            name='Test Bot',
-            api_key=self.api_key,
-            trading_pair='BTCUSDT',
-            deposit=1000,
-            trade_mode='order_grid',
-            additional_settings={'base_quantity': 0.1},
-            settings=self.bot_settings,
-            status='active',
-            is_running=True
-        )
-        self.strategy = TradingStrategy(self.bot)
-        logger.info("Тестовое окружение для TradingStrategy настроено")
-
-    def test_calculate_quantity_qty_step(self):
-        """
-        Тест округления количества с учётом basePrecision.
-        """
-        with patch('requests.get') as mock_get:
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.json.return_value = {
-                'retCode': 0,
-                'result': {
-                    'list': [{
-                        'lotSizeFilter': {
-                            'basePrecision': '0.001',
-                            'minOrderQty': '0.001'
-                        }
-                    }]
-                }
-            }
-            qty = self.strategy.calculate_quantity(level_index=0)
-            self.assertEqual(qty, 0.1)  # base_quantity = 0.1
-            self.assertTrue(qty % 0.001 == 0, "Количество должно быть кратно basePrecision")
-            logger.info("Тест округления количества успешно пройден")
-
-    def test_place_order_qty_step_error(self):
-        """
-        Тест ошибки при некорректном количестве и успешного размещения ордера.
-        """
-        with patch('requests.get') as mock_get, patch('requests.post') as mock_post:
-            # Информация о торговой паре
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.json.return_value = {
-                'retCode': 0,
-                'result': {
-                    'list': [{
-                        'lotSizeFilter': {
-                            'basePrecision': '0.001',
-                            'minOrderQty': '0.002'  # Минимальное количество больше, чем qty
-                        },
-                        'priceFilter': {
-                            'tickSize': '0.01'
-                        }
-                    }]
-                }
-            }
-            # Проверяем, что слишком маленькое количество вызовет ошибку
-            with self.assertRaises(ValueError) as context:
-                self.strategy.place_order('buy', 50000.0, 0.001)
-            self.assertIn("меньше минимального", str(context.exception))
-            logger.info("Тест ошибки при некорректном количестве пройден")
-
-            # Исправляем количество и проверяем успешное создание ордера
-            mock_get.return_value.json.return_value['result']['list'][0]['lotSizeFilter']['minOrderQty'] = '0.001'
-            mock_post.return_value.status_code = 200
-            mock_post.return_value.json.return_value = {
-                'retCode': 0,
-                'result': {'orderId': '12345'}
-            }
-            result = self.strategy.place_order('buy', 50000.0, 0.1)
-            self.assertEqual(result['orderId'], '12345')
-            self.assertTrue(0.1 % 0.001 == 0, "Количество должно быть кратно basePrecision")
-            logger.info("Тест успешного размещения ордера пройден")
-
-    def test_check_signal_empty_data(self):
-        """
-        Тест обработки пустых данных в check_signal.
-        """
-        with patch('requests.get') as mock_get:
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.json.return_value = {
-                'retCode': 0,
-                'result': {'list': []}
-            }
-            result = self.strategy.check_signal()
-            self.assertFalse(result)
-            logger.info("Тест обработки пустых данных в check_signal пройден")
-
-    def test_check_signal_with_data(self):
-        """
-        Тест проверки сигнала с данными.
-        """
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = [
-                # Запрос исторических данных
-                type('Response', (), {'status_code': 200, 'json': lambda: {
-                    'retCode': 0,
-                    'result': {
-                        'list': [
-                            {'close': 50000, 'timestamp': 1234567890},
-                            {'close': 49000, 'timestamp': 1234567800}
-                        ]
-                    }
-                }})(),
-                # Запрос текущей цены (для расчёта индикатора)
-                type('Response', (), {'status_code': 200, 'json': lambda: {
-                    'retCode': 0,
-                    'result': {'last': 51000}
-                }})()
-            ]
-            result = self.strategy.check_signal()
-            self.assertIn(result, [True, False], "Результат должен быть булевым")
-            logger.info("Тест проверки сигнала с данными пройден")
\ No newline at end of file
+        }]
+    }
+}
+
+
+@pytest.mark.django_db
+def test_create_api_key(api_request, requests_mock):
+    """
+    Тест создания API-ключа.
+    """
+    data = {
+        'exchange': 'bybit',
+        'api_key': 'new_api_key',
+        'api_secret': 'new_api_secret'
+    }
+    requests_mock.get('https://api.bybit.com/v5/market/time', json=_SERVER_TIME_OK)
+    requests_mock.get('https://api.bybit.com/v5/user/query-api', json=_API_KEY_INFO_OK)
+    serializer = APIKeySerializer(data=data, context={'request': api_request})
+    assert serializer.is_valid(), serializer.errors
+    api_key = serializer.save(user=api_request.user)
+    assert api_key.exchange == 'bybit'
+    assert api_key.api_key.startswith('enc:'), "API-ключ должен быть зашифрован"
+    assert api_key.api_secret.startswith('enc:'), "API-секрет должен быть зашифрован"
+    logger.info("Тест создания API-ключа успешно пройден")
+
+
+@pytest.mark.django_db
+def test_create_bot(api_request, api_key, requests_mock, monkeypatch, bot_settings_kwargs):
+    """
+    Тест создания бота.
+    """
+    data = {
+        'api_key_id': api_key.id,
+        'strategy': 'spot',
+        'algorithm': 'long',
+        'trading_pair': 'BTCUSDT',
+        'deposit': 1000,
+        'trade_mode': 'order_grid',
+        'additional_settings': {'base_quantity': 0.1},
+        'settings': {**bot_settings_kwargs, 'preset': 'moderate'}
+    }
+    # Проверка ключа, торговой пары и баланса
+    requests_mock.get('https://api.bybit.com/v5/market/time', json=_SERVER_TIME_OK)
+    requests_mock.get('https://api.bybit.com/v5/user/query-api', json=_API_KEY_INFO_OK)
+    requests_mock.get('https://api.bybit.com/v5/market/instruments-info', json=_TRADING_PAIRS_OK)
+    requests_mock.get('https://api.bybit.com/v5/account/wallet-balance', json=_BALANCE_OK)
+    monkeypatch.setattr('bots.tasks.log_action.delay', MagicMock())
+    serializer = BotSerializer(data=data, context={'request': api_request})
+    assert serializer.is_valid(), serializer.errors
+    bot = serializer.save(user=api_request.user)
+    assert bot.trading_pair == 'BTCUSDT'
+    assert bot.settings.signal_type == 'rsi'
+    assert bot.additional_settings['base_quantity'] == 0.1
+    assert bot.strategy == 'spot'
+    assert bot.algorithm == 'long'
+    # Настройки записаны в строку, созданную сигналом post_save, а не второй строкой
+    assert BotSettings.objects.filter(bot=bot).count() == 1
+    logger.info("Тест создания бота успешно пройден")
+
+
+@pytest.mark.parametrize("signal_type, signal_params, error", [
+    ('rsi', {'period': 14, 'threshold': -10}, 'threshold должен быть числом в диапазоне 0–100'),
+    ('rsi', {'period': 14}, "Отсутствует обязательное поле 'threshold'"),
+    ('base_volume', {'threshold': 1000}, None),
+    ('price', {'target_price': -500}, 'target_price должен быть положительным числом'),
+])
+def test_signal_params_validation(bot_settings_kwargs, signal_type, signal_params, error):
+    """
+    Тест валидации signal_params для разных типов сигналов; error=None — параметры корректны.
+    """
+    data = {**bot_settings_kwargs, 'signal_type': signal_type, 'signal_params': signal_params}
+    serializer = BotSettingsSerializer(data=data)
+    if error is None:
+        assert serializer.is_valid(), serializer.errors
+    else:
+        assert not serializer.is_valid()
+        assert 'signal_params' in serializer.errors
+        assert error in str(serializer.errors['signal_params'])
+    logger.info("Тест валидации signal_params для %s пройден", signal_type)
+
+
+def test_signal_interval_validation(bot_settings_kwargs):
+    """
+    Тест валидации signal_interval.
+    """
+    data = {**bot_settings_kwargs, 'signal_interval': 'invalid_interval'}  # Неверный интервал
+    serializer = BotSettingsSerializer(data=data)
+    assert not serializer.is_valid()
+    assert 'signal_interval' in serializer.errors
+    logger.info("Тест валидации signal_interval (некорректный интервал) пройден")
+
+    data['signal_interval'] = '1m'  # Корректный интервал
+    serializer = BotSettingsSerializer(data=data)
+    assert serializer.is_valid(), serializer.errors
+    logger.info("Тест валидации signal_interval (корректный интервал) пройден")
+
+    data['signal_interval'] = '1 минута'  # Текстовый формат интервала
+    serializer = BotSettingsSerializer(data=data)
+    assert serializer.is_valid(), serializer.errors
+    logger.info("Тест валидации signal_interval (текстовый формат) пройден")
+
+
+def test_nested_signal_params_validation(bot_settings_kwargs):
+    """
+    Тест валидации signal_params во вложенном сериализаторе настроек: тип сигнала берётся из данных родителя.
+    """
+    class ParentSerializer(serializers.Serializer):
+        settings = BotSettingsSerializer()
+
+    data = {'settings': {**bot_settings_kwargs, 'signal_params': {'period': 14}}}
+    serializer = ParentSerializer(data=data)
+    assert not serializer.is_valid()
+    assert "Отсутствует обязательное поле 'threshold'" in str(serializer.errors['settings']['signal_params'])
+
+    serializer = ParentSerializer(data={'settings': dict(bot_settings_kwargs)})
+    assert serializer.is_valid(), serializer.errors
+    logger.info("Тест валидации вложенных signal_params пройден")
+
+
+@pytest.mark.parametrize("interval, expected", [('1m', '1'), ('1h', '60'), ('1 минута', '1'), ('4 часа', '240')])
+def test_signal_interval_normalized(bot_settings_kwargs, interval, expected):
+    """
+    Тест приведения signal_interval к формату биржи, в том числе из текстового формата.
+    """
+    serializer = BotSettingsSerializer(data={**bot_settings_kwargs, 'signal_interval': interval})
+    assert serializer.is_valid(), serializer.errors
+    assert serializer.validated_data['signal_interval'] == expected
+    logger.info("Тест приведения signal_interval %s пройден", interval)
+
+
+@pytest.mark.django_db
+def test_bot_status_update(api_client, bot, monkeypatch):
+    """
+    Тест обновления статуса бота через API: остановка ставит задачу stop_bot,
+    а остановленного бота повторно остановить нельзя.
+    """
+    from django.urls import reverse
+    mock_stop_bot = MagicMock()
+    monkeypatch.setattr('bots.views.stop_bot.delay', mock_stop_bot)
+    url = reverse('bot-stop', args=[bot.id])
+    response = api_client.post(url)
+    assert response.status_code == 200
+    mock_stop_bot.assert_called_once_with(bot.id)
+
+    # Статус меняет сама задача stop_bot; здесь его записываем напрямую
+    Bot.objects.filter(pk=bot.pk).update(status='stopped', is_running=False)
+    response = api_client.get(reverse('bot-status', args=[bot.id]))
+    assert response.status_code == 200
+    assert response.json()['status'] == 'stopped'
+    assert not response.json()['is_running']
+    assert api_client.post(url).status_code == 400
+    mock_stop_bot.assert_called_once()
+    logger.info("Тест обновления статуса бота успешно пройден")
+
+
+def test_calculate_quantity_qty_step(strategy, monkeypatch):
+    """
+    Тест округления количества с учётом basePrecision.
+    """
+    http_get = MagicMock()
+    http_get.return_value.status_code = 200
+    http_get.return_value.content = orjson.dumps(_BASE_INSTRUMENT)
+    monkeypatch.setattr('bots.strategies._HTTP.get', http_get)
+    qty = strategy.calculate_quantity(level_index=0)
+    assert qty == 0.1  # base_quantity = 0.1
+    assert Decimal(str(qty)) % Decimal('0.001') == 0, "Количество должно быть кратно basePrecision"
+    logger.info("Тест округления количества успешно пройден")
+
+
+@pytest.mark.django_db
+def test_place_order_qty_step_error(strategy, requests_mock):
+    """
+    Тест ошибки при некорректном количестве и успешного размещения ордера.
+    """
+    reset_instrument_cache()
+    # Информация о торговой паре: минимальное количество больше, чем qty
+    instrument_info = copy.deepcopy(_BASE_INSTRUMENT)
+    instrument_info['result']['list'][0]['lotSizeFilter']['minOrderQty'] = '0.002'
+    requests_mock.get('https://api.bybit.com/v5/market/instruments-info', json=instrument_info)
+    requests_mock.get('https://api.bybit.com/v5/market/time', json=_SERVER_TIME_OK)
+    # Проверяем, что слишком маленькое количество вызовет ошибку
+    with pytest.raises(ValueError) as context:
+        strategy.place_order('buy', 50000.0, 0.001)
+    assert "меньше минимального" in str(context.value)
+    logger.info("Тест ошибки при некорректном количестве пройден")
+
+    # Исправляем количество и проверяем успешное создание ордера; параметры пары запрашиваются заново
+    reset_instrument_cache()
+    requests_mock.get('https://api.bybit.com/v5/market/instruments-info', json=_BASE_INSTRUMENT)
+    requests_mock.post('https://api.bybit.com/v5/order/create', json=_ORDER_CREATED)
+    result = strategy.place_order('buy', 50000.0, 0.1)
+    assert result['orderId'] == '12345'
+    sent_qty = orjson.loads(requests_mock.last_request.body)['qty']
+    assert Decimal(sent_qty) % Decimal('0.001') == 0, "Количество должно быть кратно basePrecision"
+    logger.info("Тест успешного размещения ордера пройден")
+
+
+def _klines(closes):
+    """
+    Ответ биржи со свечами по ценам закрытия closes, от старой свечи к новой.
+    """
+    rows = [
+        [str(1700000000000 + i * 3600000), str(close), str(close + 50), str(close - 50), str(close), '10', str(close * 10)]
+        for i, close in enumerate(closes)
+    ]
+    return {'retCode': 0, 'result': {'list': rows}}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("klines, expected", [
+    (_EMPTY_LIST_OK, False),
+    # 30 свечей подряд вниз: RSI(14) = 0, ниже порога 30 — сигнал срабатывает
+    (_klines(range(60000, 57000, -100)), True),
+    # 30 свечей подряд вверх: RSI(14) = 100 — сигнала нет
+    (_klines(range(50000, 53000, 100)), False),
+])
+def test_check_signal(strategy, requests_mock, klines, expected):
+    """
+    Тест check_signal (RSI, period=14, threshold=30) на пустых, падающих и растущих свечах.
+    """
+    from django.core.cache import cache
+    # Свечи прошлого случая не должны прийти из кэша Django; остальные ключи кэша не трогаем
+    cache.delete(f"klines_{strategy._ck}_{strategy.signal_interval}_100")
+    requests_mock.get('https://api.bybit.com/v5/market/kline', json=klines)
+    assert strategy.check_signal() is expected
+    logger.info("Тест check_signal (ожидается %s) пройден", expected)
+
+
+def _candles(n=40, seed=7):
+    """
+    Минутные свечи случайного блуждания: максимумы, минимумы, закрытия и время открытия.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0.1, 1.0, n)
+    low = close - rng.uniform(0.1, 1.0, n)
+    return high, low, close, np.arange(n, dtype=np.int64) * 60000
+
+
+# Тики потокового индикатора: окно свечей и изменение цены текущей свечи
+_STREAMING_TICKS = [
+    (slice(0, 30), 0.0),    # состояние строится по всему ряду
+    (slice(0, 30), 1.5),    # текущая свеча изменилась, закрытые — нет
+    (slice(11, 31), 0.0),   # свеча закрылась, окно сдвинулось: состояние продвигается на одну свечу
+    (slice(11, 31), -2.0),
+    (slice(0, 36), 0.0),    # пропущено несколько свечей: состояние строится заново
+]
+
+
+@pytest.mark.parametrize("name", ['rsi', 'atr'])
+def test_streaming_indicator_matches_full_series(name):
+    """
+    Тест calculate_rsi_last и calculate_atr_last: на каждом тике значение совпадает с _rsi_loop / _atr_loop
+    по всей истории свечей, в том числе после закрытия свечи, когда окно уже не содержит начала истории,
+    и после пропуска нескольких свечей.
+    """
+    from django.core.cache import cache
+    from . import indicators
+
+    def streaming(high, low, close, timestamps):
+        if name == 'rsi':
+            return indicators.calculate_rsi_last(close, timestamps, 14, state_key='test')
+        return indicators.calculate_atr_last(high, low, close, timestamps, 14, state_key='test')
+
+    def reference(high, low, close):
+        if name == 'rsi':
+            return indicators._rsi_loop(close, 14)[-1]
+        return indicators._atr_loop(high, low, close, 14)[-1]
+
+    state_cache_key = f"{name}_state_test_14"
+    cache.delete(state_cache_key)
+    high, low, close, timestamps = _candles()
+    for tick, (window, delta) in enumerate(_STREAMING_TICKS):
+        h, l, c = high[:window.stop].copy(), low[:window.stop].copy(), close[:window.stop].copy()
+        c[-1] += delta
+        h[-1], l[-1] = max(h[-1], c[-1]), min(l[-1], c[-1])
+        result = streaming(h[window], l[window], c[window], timestamps[window])
+        assert result == pytest.approx(reference(h, l, c)), f"тик {tick}"
+        if window.start:
+            # Пересчёт по окну дал бы другое значение: состояние продвинуто, а не построено заново
+            assert result != pytest.approx(reference(h[window], l[window], c[window])), f"тик {tick}"
+        assert cache.get(state_cache_key)['ts'] == timestamps[window.stop - 2]
+    logger.info("Тест потокового %s пройден", name)
+
+
+@pytest.mark.django_db
+def test_cancel_order_bybit_payload(strategy, monkeypatch):
+    """
+    Тест тела запроса отмены ордера на Bybit: совпадает с json.dumps с сортировкой ключей.
+    """
+    mock_post = MagicMock()
+    mock_post.return_value.content = orjson.dumps(_OK)
+    monkeypatch.setattr('bots.strategies.get_bybit_server_time', MagicMock(return_value=1700000000000))
+    monkeypatch.setattr('bots.strategies._http_post', mock_post)
+    for order_id in ('1234567890', 'a1b2-c3d4'):
+        assert strategy.cancel_order(order_id)
+        payload = mock_post.call_args[0][2]
+        expected = json.dumps(
+            {"category": strategy.category, "symbol": 'BTCUSDT', "orderId": order_id},
+            separators=(',', ':'), sort_keys=True
+        ).encode()
+        assert payload == expected
+    logger.info("Тест тела запроса отмены ордера на Bybit пройден")
+
+
+def test_ttl_get_loads_once_and_stays_bounded(monkeypatch):
+    """
+    Тест локального кэша процесса: одновременные промахи по ключу вызывают loader один раз,
+    а число записей не превышает LOCAL_CACHE_SIZE.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from bots import utils
+    monkeypatch.setattr(utils, 'LOCAL_CACHE_SIZE', 2)
+    monkeypatch.setattr(utils, '_LOCAL_CACHE', utils.OrderedDict())
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: utils.ttl_get('key', 60, loader), range(8)))
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+    for key in ('a', 'b', 'c'):
+        utils.ttl_get(key, 60, lambda: key)
+    assert list(utils._LOCAL_CACHE) == ['b', 'c']
+    logger.info("Тест локального кэша процесса пройден")
+
+
+def test_cancel_orders_skips_rejected(strategy, monkeypatch):
+    """
+    Тест cancel_orders: ордер, отмену которого биржа отклонила (cancel_order вернул False), не считается отменённым.
+    """
+    monkeypatch.setattr(strategy, 'cancel_order', lambda order_id: order_id != 'live')
+    assert strategy.cancel_orders(['done', 'live']) == {'done'}
+    logger.info("Тест cancel_orders с отклонённой отменой пройден")
+
+
+def test_create_orders_batch_keeps_placed_chunks(requests_mock):
+    """
+    Тест пакетного размещения ордеров: ошибка второго пакета помечает неразмещёнными только его ордера,
+    а ID ордеров первого пакета возвращаются.
+    """
+    from .utils import ExchangeAPI
+    placed = {
+        'retCode': 0,
+        'result': {'list': [{'orderId': str(i)} for i in range(10)]},
+        'retExtInfo': {'list': [{'code': 0, 'msg': 'OK'}] * 10},
+    }
+    requests_mock.get('https://api.bybit.com/v5/market/time', json=_SERVER_TIME_OK)
+    requests_mock.post('https://api.bybit.com/v5/order/create-batch', [
+        {'json': placed},
+        {'json': {'retCode': 10006, 'retMsg': 'Too many visits'}},
+    ])
+    orders = [{'side': 'buy', 'price': 50000.0 - i * 10, 'qty': 0.001} for i in range(12)]
+    results = ExchangeAPI.create_orders_batch('bybit', 'test_api_key', 'test_api_secret', 'BTCUSDT', orders)
+    assert results == [{'orderId': str(i)} for i in range(10)] + [None, None]
+    assert len(orjson.loads(requests_mock.last_request.body)['request']) == 2
+    logger.info("Тест пакетного размещения с ошибкой второго пакета пройден")
+
+
+@pytest.mark.django_db
+def test_run_trading_strategies_batch_respects_bot_lock(bot, monkeypatch):
+    """
+    Тест пакетного выполнения итераций: бот под блокировкой run_trading_strategy пропускается,
+    свободный бот выполняется, а его блокировка снимается после пакета.
+    """
+    from django.core.cache import cache
+    from . import tasks
+    strategy = MagicMock()
+    strategy.check_signal.return_value = True
+    monkeypatch.setattr(tasks, 'get_strategy', MagicMock(return_value=strategy))
+    monkeypatch.setattr('bots.tasks.log_action.delay', MagicMock())
+    lock_key = f"run_trading_strategy_{bot.id}"
+    cache.set(lock_key, True)
+    try:
+        tasks.run_trading_strategies_batch([bot.id])
+        strategy.execute.assert_not_called()
+    finally:
+        cache.delete(lock_key)
+    tasks.run_trading_strategies_batch([bot.id])
+    strategy.execute.assert_called_once()
+    assert cache.get(lock_key) is None
+    logger.info("Тест пакетного выполнения итераций пройден")
+
+
+class _ListBuffer:
+    """
+    Списки Redis в памяти: команды, которые вызывают log_action и flush_log_entries.
+    """
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    def pipeline(self):
+        buffer = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def lrange(self, key, start, end):
+                self.commands.append(lambda: list(buffer.lists.get(key, [])[start:end + 1]))
+
+            def ltrim(self, key, start, end):
+                def trim():
+                    buffer.lists[key] = buffer.lists.get(key, [])[start:]
+                    return True
+                self.commands.append(trim)
+
+            def execute(self):
+                return [command() for command in self.commands]
+
+        return Pipeline()
+
+
+def _log_record(bot, action='Strategy executed', **overrides):
+    """
+    Запись буфера журнала в том виде, в котором её добавляет log_action.
+    """
+    from django.utils import timezone
+    record = {
+        'user_id': bot.user_id, 'bot_id': bot.id, 'action': action, 'details': 'details',
+        'status': 'success', 'error_message': None, 'financial_result': None,
+        'timestamp': timezone.now().isoformat(),
+    }
+    record.update(overrides)
+    return orjson.dumps(record)
+
+
+@pytest.fixture
+def log_buffer(monkeypatch):
+    """
+    Буфер журнала в памяти вместо Redis.
+    """
+    from . import tasks
+    buffer = _ListBuffer()
+    monkeypatch.setattr(tasks, '_log_buffer', lambda: buffer)
+    return buffer
+
+
+@pytest.mark.django_db
+def test_flush_log_entries(bot, log_buffer):
+    """
+    Тест переноса журнала: записи попадают в БД, записи удалённых ботов отбрасываются, буфер пустеет.
+    """
+    from .models import LogEntry
+    from .tasks import LOG_BUFFER_KEY, flush_log_entries
+    log_buffer.rpush(LOG_BUFFER_KEY, _log_record(bot, 'first'), _log_record(bot, bot_id=bot.id + 1000),
+                     _log_record(bot, 'second'))
+    assert flush_log_entries() == 2
+    assert list(LogEntry.objects.filter(bot=bot).order_by('id').values_list('action', flat=True)) == ['first', 'second']
+    assert log_buffer.lists[LOG_BUFFER_KEY] == []
+    logger.info("Тест переноса журнала пройден")
+
+
+@pytest.mark.django_db
+def test_flush_log_entries_dead_letters_rejected(bot, log_buffer, monkeypatch):
+    """
+    Тест переноса журнала с некорректными записями: пачка, отклонённая целиком, пишется по одной записи,
+    а некорректные записи уходят в список отложенных и не задерживают остальные.
+    """
+    from django.db import DataError
+    from .models import LogEntry
+    from .tasks import LOG_BUFFER_KEY, LOG_DEAD_LETTER_KEY, flush_log_entries
+    broken = _log_record(bot, timestamp='not a date')
+    log_buffer.rpush(LOG_BUFFER_KEY, _log_record(bot, 'first'), broken, b'{}', _log_record(bot, 'second'))
+    monkeypatch.setattr(LogEntry.objects, 'bulk_create', MagicMock(side_effect=DataError('value too long')))
+    assert flush_log_entries() == 2
+    assert LogEntry.objects.filter(bot=bot, action__in=['first', 'second']).count() == 2
+    assert log_buffer.lists[LOG_DEAD_LETTER_KEY] == [broken, b'{}']
+    assert log_buffer.lists[LOG_BUFFER_KEY] == []
+    logger.info("Тест переноса журнала с некорректными записями пройден")
+
+
+@pytest.mark.django_db
+def test_flush_log_entries_requeues_when_db_unavailable(bot, log_buffer, monkeypatch):
+    """
+    Тест переноса журнала при недоступной БД: пачка возвращается в начало буфера в прежнем порядке,
+    а записи старше LOG_BUFFER_MAX_AGE уходят в список отложенных.
+    """
+    from django.db import OperationalError
+    from .models import LogEntry
+    from .tasks import LOG_BUFFER_KEY, LOG_DEAD_LETTER_KEY, flush_log_entries
+    old = _log_record(bot, 'old', timestamp='2020-01-01T00:00:00+00:00')
+    fresh = [_log_record(bot, 'first'), _log_record(bot, 'second')]
+    log_buffer.rpush(LOG_BUFFER_KEY, fresh[0], old, fresh[1])
+    monkeypatch.setattr(LogEntry.objects, 'bulk_create', MagicMock(side_effect=OperationalError('connection lost')))
+    assert flush_log_entries() == 0
+    assert log_buffer.lists[LOG_BUFFER_KEY] == fresh
+    assert log_buffer.lists[LOG_DEAD_LETTER_KEY] == [old]
+    logger.info("Тест переноса журнала при недоступной БД пройден")
+
+
+def test_apply_stream_fills(strategy, monkeypatch):
+    """
+    Тест применения исполнений из приватного потока: исполнения применяются в порядке updatedTime,
+    при равном времени покупка идёт раньше продажи, а покупка после продажи открывает новую позицию.
+    """
+    fills = [
+        {'orderId': 'b3', 'updatedTime': '400', 'avgPrice': '80', 'price': '80', 'cumExecQty': '0.001', 'qty': '0.001'},
+        {'orderId': 's1', 'updatedTime': '300', 'avgPrice': '110', 'price': '110', 'cumExecQty': '0.002', 'qty': '0.002'},
+        {'orderId': 'b2', 'updatedTime': '300', 'avgPrice': '90', 'price': '90', 'cumExecQty': '0.001', 'qty': '0.001'},
+        {'orderId': 'b1', 'updatedTime': '100', 'avgPrice': '', 'price': '100', 'cumExecQty': '0.001', 'qty': '0.001'},
+    ]
+    stream = MagicMock()
+    stream.pop_fills.return_value = fills
+    save_fills = MagicMock()
+    monkeypatch.setattr(strategy, '_order_stream', stream)
+    monkeypatch.setattr(strategy, '_save_fills', save_fills)
+    monkeypatch.setattr(strategy, 'position_obj', MagicMock())
+    monkeypatch.setattr(strategy, 'position', 0)
+    monkeypatch.setattr(strategy, 'avg_price', 0)
+    monkeypatch.setattr(strategy, 'position_opened', False)
+    monkeypatch.setattr(strategy, 'highest_price', 0)
+    monkeypatch.setattr(strategy, 'buy_orders', ['b1', 'b2', 'b3', 'b4'])
+    monkeypatch.setattr(strategy, 'sell_order_id', 's1')
+    strategy._apply_stream_fills()
+    stream.pop_fills.assert_called_once_with({'b1', 'b2', 'b3', 'b4', 's1'})
+    # b1 и b2 набрали позицию, s1 её закрыл, b3 открыл новую
+    assert strategy.position == pytest.approx(0.001)
+    assert strategy.avg_price == pytest.approx(80)
+    assert strategy.position_opened is True
+    assert strategy.sell_order_id is None
+    assert strategy.buy_orders == ['b4']
+    save_fills.assert_called_once_with(4)
+    logger.info("Тест применения исполнений из потока пройден")
+
+
+def test_order_stream_shared_and_closed(monkeypatch):
+    """
+    Тест реестра приватных потоков: боты с одним ключом делят поток, смена секрета переоткрывает его,
+    а поток закрывается, когда его отпускает последний бот.
+    """
+    from . import streams
+    monkeypatch.setattr(streams, '_order_streams', {})
+    monkeypatch.setattr(streams, 'BybitOrderStream', MagicMock(side_effect=lambda api_key, api_secret: MagicMock()))
+    first = streams.get_order_stream(1, 'key', 'secret', bot_id=10)
+    assert streams.get_order_stream(1, 'key', 'secret', bot_id=11) is first
+    second = streams.get_order_stream(1, 'key', 'rotated', bot_id=10)
+    assert second is not first
+    first.close.assert_called_once_with()
+    assert streams.get_order_stream(1, 'key', 'rotated', bot_id=11) is second
+    streams.release_order_stream(10)
+    second.close.assert_not_called()
+    streams.release_order_stream(11)
+    second.close.assert_called_once_with()
+    assert streams._order_streams == {}
+    logger.info("Тест реестра приватных потоков ордеров пройден")
+
+
+class _FakeWebSocketApp:
+    """
+    WebSocketApp без сети: хранит обработчики и отправленные сообщения.
+    """
+
+    def __init__(self, url, on_open=None, on_message=None, on_error=None, on_close=None):
+        self.url = url
+        self.on_open = on_open
+        self.on_message = on_message
+        self.sock = None
+        self.sent = []
+
+    def run_forever(self, **kwargs):
+        pass
+
+    def send(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def price_feed(monkeypatch):
+    """
+    PriceFeed с заглушкой WebSocket вместо соединения с биржей.
+    """
+    from . import streams
+    monkeypatch.setattr(streams.websocket, 'WebSocketApp', _FakeWebSocketApp)
+    return streams.PriceFeed(max_age=2.0)
+
+
+def _push_ticker(feed, price):
+    """
+    Подключает поток цен Bybit (spot) и передаёт в него тикер BTCUSDT.
+    """
+    ws = feed._sockets[('bybit', 'spot')]
+    ws.on_open(ws)
+    ws.on_message(ws, orjson.dumps({'topic': 'tickers.BTCUSDT', 'data': {'symbol': 'BTCUSDT', 'lastPrice': str(price)}}))
+    return ws
+
+
+def test_price_feed_returns_cached_price(price_feed):
+    """
+    Тест PriceFeed: первый запрос подписывается на тикер, цена из потока читается из памяти,
+    а цена старше max_age не возвращается.
+    """
+    assert price_feed.get_price('bybit', 'BTCUSDT', 'spot') is None
+    ws = _push_ticker(price_feed, 50000.5)
+    assert ws.sent == [orjson.dumps({'op': 'subscribe', 'args': ['tickers.BTCUSDT']})]
+    assert price_feed.get_price('bybit', 'BTCUSDT', 'spot') == 50000.5
+    price_feed._prices[('bybit', 'spot', 'BTCUSDT')] = (50000.5, time.monotonic() - 2.5)
+    assert price_feed.get_price('bybit', 'BTCUSDT', 'spot') is None
+    logger.info("Тест чтения цены из потока пройден")
+
+
+def test_get_current_price_falls_back_to_rest(strategy, price_feed, monkeypatch):
+    """
+    Тест get_current_price: свежая цена берётся из потока без REST-запроса,
+    а цена старше 2 секунд запрашивается через REST.
+    """
+    from django.core.cache import cache
+    adapter = MagicMock()
+    adapter.fetch_price.return_value = 51000.0
+    monkeypatch.setattr('bots.strategies._PRICE_FEED', price_feed)
+    monkeypatch.setattr(strategy, '_adapter', adapter)
+    cache.delete(f"price_{strategy.exchange}_BTCUSDT_spot")
+    price_feed.get_price('bybit', 'BTCUSDT', 'spot')
+    _push_ticker(price_feed, 50000.5)
+    assert strategy.get_current_price('spot') == 50000.5
+    adapter.fetch_price.assert_not_called()
+
+    price_feed._prices[('bybit', 'spot', 'BTCUSDT')] = (50000.5, time.monotonic() - 2.5)
+    assert strategy.get_current_price('spot') == 51000.0
+    adapter.fetch_price.assert_called_once()
+    cache.delete(f"price_{strategy.exchange}_BTCUSDT_spot")
+    logger.info("Тест запасного REST-запроса цены пройден")
@@ -4,38 +4,116 @@ import requests
 import hmac
 import hashlib
 import time
-import json
+import orjson
 from urllib.parse import urlencode
 from ratelimit import limits, sleep_and_retry
+from requests.adapters import HTTPAdapter
 import math
+import threading
+from collections import OrderedDict
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
-def get_bybit_server_time():
+# HTTP-сессии по биржам: запросы к одной бирже переиспользуют keep-alive соединения
+# вместо нового TCP+TLS на каждый вызов
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def get_session(exchange):
     """
-    Получает текущее время с сервера Bybit для синхронизации запросов.
+    Возвращает HTTP-сессию биржи, создавая её при первом обращении.
+
+    Сессия общая для всех задач процесса (воркера Celery).
+
+    Args:
+        exchange (str): Биржа ('bybit', 'binance', 'okx').
 
     Returns:
-        int: Время в миллисекундах.
+        requests.Session: Сессия с пулом соединений.
+    """
+    session = _SESSIONS.get(exchange)
+    if session is None:
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(exchange)
+            if session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=50, max_retries=0))
+                _SESSIONS[exchange] = session
+    return session
 
-    Raises:
-        Exception: Если не удалось получить время сервера и запасной вариант не сработал.
+def sign_hmac(api_secret, message):
+    """
+    Подписывает сообщение HMAC-SHA256 секретным ключом.
+
+    Args:
+        api_secret (str): Секретный ключ.
+        message (str | bytes): Строка для подписи; байты подписываются без перекодирования.
+
+    Returns:
+        str: Подпись в hex.
+    """
+    return hmac.new(
+        api_secret.encode('utf-8'),
+        message if isinstance(message, bytes) else message.encode('utf-8'),
+        hashlib.sha256,
+    ).hexdigest()
+
+# Смещение часов Bybit относительно локальных: время сервера запрашивается раз в BYBIT_TIME_SYNC_INTERVAL секунд,
+# а между запросами получается из локальных часов
+BYBIT_TIME_SYNC_INTERVAL = 300
+_bybit_time = {'offset': 0, 'synced_at': None}
+_bybit_time_lock = threading.Lock()
+
+def _sync_bybit_time():
+    """
+    Запрашивает время сервера Bybit и обновляет смещение относительно локальных часов.
+
+    Смещение считается от середины запроса, чтобы задержка сети не сдвигала его на полпути.
+    При ошибке сохраняется прежнее смещение, а повторная попытка выполняется через 30 секунд.
     """
     url = "https://api.bybit.com/v5/market/time"
+    sent_at = time.time()
     try:
-        response = requests.get(url, timeout=10)
+        response = get_session('bybit').get(url, timeout=10)
         response.raise_for_status()
-        data = response.json()
-        if data['retCode'] == 0:
-            logger.debug("Успешно получено время сервера Bybit: %s", data['result']['timeNano'])
-            return int(data['result']['timeNano']) // 1_000_000  # Переводим из наносекунд в миллисекунды
-        else:
-            logger.error("Не удалось получить время сервера Bybit: %s", data['retMsg'])
-            raise Exception(f"Failed to get Bybit server time: {data['retMsg']}")
-    except requests.RequestException as e:
+        data = orjson.loads(response.content)
+        if data['retCode'] != 0:
+            raise ValueError(data['retMsg'])
+        received_at = time.time()
+        server_ms = int(data['result']['timeNano']) // 1_000_000  # Переводим из наносекунд в миллисекунды
+        _bybit_time['offset'] = server_ms - int((sent_at + received_at) * 500)
+        _bybit_time['synced_at'] = received_at
+        logger.debug("Синхронизировано время сервера Bybit: смещение %s мс", _bybit_time['offset'])
+    except (requests.RequestException, ValueError, KeyError) as e:
         logger.error("Ошибка запроса времени сервера Bybit: %s", str(e))
-        logger.warning("Используем локальное время как запасной вариант")
-        return int(time.time() * 1000)  # Локальное время в миллисекундах
+        logger.warning("Используем локальное время с прежним смещением как запасной вариант")
+        _bybit_time['synced_at'] = time.time() - BYBIT_TIME_SYNC_INTERVAL + 30
+
+def reset_bybit_time_offset():
+    """
+    Сбрасывает синхронизацию времени Bybit, чтобы следующий запрос заново получил время сервера
+    (например, после ошибки 10002 о расхождении времени).
+    """
+    _bybit_time['synced_at'] = None
+
+def get_bybit_server_time():
+    """
+    Возвращает текущее время сервера Bybit для подписи запросов.
+
+    Время сервера запрашивается не чаще раза в BYBIT_TIME_SYNC_INTERVAL секунд; между запросами
+    оно вычисляется как локальное время плюс сохранённое смещение.
+
+    Returns:
+        int: Время в миллисекундах.
+    """
+    synced_at = _bybit_time['synced_at']
+    if synced_at is None or time.time() - synced_at > BYBIT_TIME_SYNC_INTERVAL:
+        with _bybit_time_lock:
+            synced_at = _bybit_time['synced_at']
+            if synced_at is None or time.time() - synced_at > BYBIT_TIME_SYNC_INTERVAL:
+                _sync_bybit_time()
+    return int(time.time() * 1000) + _bybit_time['offset']
 
 def safe_float(value, default=0.0):
     """
@@ -53,6 +131,219 @@ def safe_float(value, default=0.0):
     except (ValueError, TypeError):
         return default
 
+def okx_inst_id(symbol, category):
+    """
+    Переводит символ без разделителя в instId OKX.
+
+    Args:
+        symbol (str): Символ (например, 'BTCUSDT').
+        category (str): Категория ('spot' или 'linear').
+
+    Returns:
+        str: instId (например, 'BTC-USDT' или 'BTC-USDT-SWAP').
+    """
+    for quote in ('USDT', 'USDC', 'USD', 'BTC', 'ETH'):
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            inst_id = f"{symbol[:-len(quote)]}-{quote}"
+            return f"{inst_id}-SWAP" if category == 'linear' else inst_id
+    return symbol
+
+# Локальный кэш процесса для редко меняющихся данных (параметры инструментов): {ключ: (значение, истекает)}.
+# Потоки пулов стратегий и итерации разных ботов обращаются к нему одновременно, поэтому доступ идёт под блокировкой,
+# а размер ограничен: при переполнении вытесняются давно не использованные ключи
+_LOCAL_CACHE = OrderedDict()
+_LOCAL_CACHE_LOCK = threading.Lock()
+# Блокировки загрузки по ключу: при промахе loader выполняет один поток, остальные ждут его результат
+_LOCAL_CACHE_LOADERS = {}
+LOCAL_CACHE_SIZE = getattr(settings, 'STRATEGY_LOCAL_CACHE_SIZE', 1024)
+
+def ttl_peek(key):
+    """
+    Возвращает значение из локального кэша процесса, если оно ещё не истекло; истёкшая запись удаляется.
+
+    Args:
+        key (str): Ключ кэша.
+
+    Returns:
+        Значение или None, если его нет или срок истёк.
+    """
+    with _LOCAL_CACHE_LOCK:
+        entry = _LOCAL_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            del _LOCAL_CACHE[key]
+            return None
+        _LOCAL_CACHE.move_to_end(key)
+        return entry[0]
+
+def ttl_put(key, value, ttl):
+    """
+    Сохраняет значение в локальном кэше процесса, вытесняя самые старые записи сверх LOCAL_CACHE_SIZE.
+
+    Args:
+        key (str): Ключ кэша.
+        value: Значение.
+        ttl (float): Время жизни значения в секундах.
+    """
+    with _LOCAL_CACHE_LOCK:
+        _LOCAL_CACHE[key] = (value, time.monotonic() + ttl)
+        _LOCAL_CACHE.move_to_end(key)
+        while len(_LOCAL_CACHE) > LOCAL_CACHE_SIZE:
+            _LOCAL_CACHE.popitem(last=False)
+
+def ttl_get(key, ttl, loader):
+    """
+    Возвращает значение из локального кэша процесса, вызывая loader при промахе.
+
+    Позволяет в течение ttl секунд не обращаться к Redis или бирже за
+    одними и теми же данными. Одновременные промахи по одному ключу вызывают loader
+    один раз. Пустой результат loader не кэшируется.
+
+    Args:
+        key (str): Ключ кэша.
+        ttl (float): Время жизни значения в секундах.
+        loader (callable): Функция без аргументов, загружающая значение.
+
+    Returns:
+        Значение из кэша или результат loader.
+    """
+    value = ttl_peek(key)
+    if value is not None:
+        return value
+    with _LOCAL_CACHE_LOCK:
+        key_lock = _LOCAL_CACHE_LOADERS.setdefault(key, threading.Lock())
+    try:
+        with key_lock:
+            # Пока поток ждал блокировку, значение мог загрузить другой поток
+            value = ttl_peek(key)
+            if value is None:
+                value = loader()
+                if value is not None:
+                    ttl_put(key, value, ttl)
+    finally:
+        with _LOCAL_CACHE_LOCK:
+            if _LOCAL_CACHE_LOADERS.get(key) is key_lock:
+                del _LOCAL_CACHE_LOADERS[key]
+    return value
+
+# Параметры торговых пар меняются редко: create_order берёт их из локального кэша процесса (ttl_get)
+# вместо запроса instruments-info / exchangeInfo перед каждым ордером
+INSTRUMENT_CACHE_TTL = 3600
+_INSTRUMENT_CACHE_PREFIX = 'instrument_filters_'
+
+def _fetch_instrument_filters(exchange, symbol, category):
+    """
+    Запрашивает у биржи шаг цены, шаг количества и минимальный объём торговой пары.
+
+    Args:
+        exchange (str): Название биржи ('bybit', 'binance', 'okx').
+        symbol (str): Торговая пара.
+        category (str): Категория ('spot' или фьючерсы).
+
+    Returns:
+        tuple: (tick_size, base_precision, min_order_qty).
+
+    Raises:
+        ValueError: Если не удалось получить параметры пары.
+    """
+    tick_size = None
+    base_precision = None
+    min_order_qty = None
+    if exchange == 'bybit':
+        url = f"https://api.bybit.com/v5/market/instruments-info?category={'spot' if category == 'spot' else 'linear'}&symbol={symbol}"
+        try:
+            response = get_session('bybit').get(url, timeout=10)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            if data['retCode'] == 0:
+                instrument = data['result']['list'][0]
+                lot_size_filter = instrument['lotSizeFilter']
+                price_filter = instrument['priceFilter']
+                tick_size = safe_float(price_filter['tickSize'], default=0.0001)
+                base_precision = safe_float(lot_size_filter['basePrecision'], default=0.001)
+                min_order_qty = safe_float(lot_size_filter['minOrderQty'], default=0.001)
+            else:
+                logger.error(f"Не удалось получить информацию о паре на Bybit: {data['retMsg']}")
+                raise ValueError(f"Не удалось получить информацию: {data['retMsg']}")
+        except requests.RequestException as e:
+            logger.error(f"Ошибка запроса параметров торговой пары на Bybit: {str(e)}")
+            raise ValueError(f"Ошибка запроса: {str(e)}")
+    elif exchange == 'binance':
+        url = "https://api.binance.com/api/v3/exchangeInfo" if category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
+        try:
+            # Фильтр по символу: биржа возвращает одну запись вместо всей exchangeInfo
+            response = get_session('binance').get(url, params={"symbol": symbol}, timeout=10)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            # Индексы по символу и типу фильтра вместо вложенного перебора списков
+            symbols = {s['symbol']: s for s in data['symbols']}
+            if symbol not in symbols:
+                logger.error(f"Торговая пара {symbol} не найдена на Binance")
+                raise ValueError(f"Торговая пара {symbol} не найдена")
+            filters = {f['filterType']: f for f in symbols[symbol]['filters']}
+            if 'PRICE_FILTER' in filters:
+                tick_size = safe_float(filters['PRICE_FILTER']['tickSize'], default=0.0001)
+            if 'LOT_SIZE' in filters:
+                base_precision = safe_float(filters['LOT_SIZE']['stepSize'], default=0.001)
+                min_order_qty = safe_float(filters['LOT_SIZE']['minQty'], default=0.001)
+        except requests.RequestException as e:
+            logger.error(f"Ошибка запроса параметров торговой пары на Binance: {str(e)}")
+            raise ValueError(f"Ошибка запроса: {str(e)}")
+    elif exchange == 'okx':
+        # Бессрочные фьючерсы (SWAP) и instId как у адаптера стратегии: 'BTC-USDT' или 'BTC-USDT-SWAP'
+        inst_type = 'SPOT' if category == 'spot' else 'SWAP'
+        inst_id = okx_inst_id(symbol.replace('/', '').replace('-', ''), 'spot' if category == 'spot' else 'linear')
+        url = f"https://www.okx.com/api/v5/public/instruments?instType={inst_type}&instId={inst_id}"
+        try:
+            response = get_session('okx').get(url, timeout=10)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            if data['code'] == '0':
+                instrument = data['data'][0]
+                tick_size = safe_float(instrument['tickSz'], default=0.0001)
+                base_precision = safe_float(instrument['lotSz'], default=0.001)
+                min_order_qty = safe_float(instrument['minSz'], default=0.001)
+            else:
+                logger.error(f"Не удалось получить информацию о паре на OKX: {data['msg']}")
+                raise ValueError(f"Не удалось получить информацию: {data['msg']}")
+        except requests.RequestException as e:
+            logger.error(f"Ошибка запроса параметров торговой пары на OKX: {str(e)}")
+            raise ValueError(f"Ошибка запроса: {str(e)}")
+    else:
+        logger.error(f"Биржа {exchange} не поддерживается")
+        raise ValueError(f"Биржа {exchange} не поддерживается")
+    return tick_size, base_precision, min_order_qty
+
+def get_instrument_filters(exchange, symbol, category):
+    """
+    Возвращает параметры торговой пары из кэша процесса, запрашивая биржу не чаще раза в INSTRUMENT_CACHE_TTL секунд.
+
+    Args:
+        exchange (str): Название биржи ('bybit', 'binance', 'okx').
+        symbol (str): Торговая пара.
+        category (str): Категория ('spot' или фьючерсы).
+
+    Returns:
+        tuple: (tick_size, base_precision, min_order_qty).
+
+    Raises:
+        ValueError: Если не удалось получить параметры пары.
+    """
+    return ttl_get(
+        f"{_INSTRUMENT_CACHE_PREFIX}{exchange}_{category}_{symbol}",
+        INSTRUMENT_CACHE_TTL,
+        lambda: _fetch_instrument_filters(exchange, symbol, category),
+    )
+
+def reset_instrument_cache():
+    """
+    Очищает кэш параметров торговых пар (например, после изменения фильтров на бирже).
+    """
+    with _LOCAL_CACHE_LOCK:
+        for key in [key for key in _LOCAL_CACHE if key.startswith(_INSTRUMENT_CACHE_PREFIX)]:
+            del _LOCAL_CACHE[key]
+
 class ExchangeAPI:
     """
     Класс для работы с API различных бирж.
@@ -79,9 +370,9 @@ class ExchangeAPI:
         if exchange == 'bybit':
             url = f"https://api.bybit.com/v5/market/instruments-info?category={'spot' if category == 'spot' else 'linear'}"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('bybit').get(url, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     pairs = [item['symbol'] for item in data.get('result', {}).get('list', []) if 'symbol' in item]
                     logger.debug(f"Получено {len(pairs)} торговых пар для Bybit ({category})")
@@ -95,9 +386,9 @@ class ExchangeAPI:
         elif exchange == 'binance':
             url = "https://api.binance.com/api/v3/exchangeInfo" if category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('binance').get(url, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 pairs = [item['symbol'] for item in data.get('symbols', []) if 'symbol' in item]
                 logger.debug(f"Получено {len(pairs)} торговых пар для Binance ({category})")
                 return pairs
@@ -108,9 +399,9 @@ class ExchangeAPI:
             inst_type = 'SPOT' if category == 'spot' else 'FUTURES'
             url = f"https://www.okx.com/api/v5/public/instruments?instType={inst_type}"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('okx').get(url, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
                     pairs = [item['instId'].replace('-', '') for item in data.get('data', []) if 'instId' in item]
                     logger.debug(f"Получено {len(pairs)} торговых пар для OKX ({category})")
@@ -146,31 +437,29 @@ class ExchangeAPI:
                 url = "https://api.bybit.com/v5/user/query-api"
                 timestamp = str(get_bybit_server_time())
                 recv_window = "5000"
-                sign_str = timestamp + api_key + recv_window
-                signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+                sign_str = f"{timestamp}{api_key}{recv_window}".encode('utf-8')
+                signature = sign_hmac(api_secret, sign_str)
                 headers = {
                     "X-BAPI-API-KEY": api_key,
                     "X-BAPI-TIMESTAMP": timestamp,
                     "X-BAPI-RECV-WINDOW": recv_window,
                     "X-BAPI-SIGN": signature
                 }
-                response = requests.get(url, headers=headers, timeout=10)
+                response = get_session('bybit').get(url, headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] != 0:
                     logger.error(f"Ошибка валидации API-ключа для Bybit: {data['retMsg']}")
                     raise ValueError(f"Invalid API key: {data['retMsg']}")
             elif exchange == 'binance':
                 url = "https://api.binance.com/api/v3/account"
                 timestamp = str(int(time.time() * 1000))
-                params = {"timestamp": timestamp}
-                query_string = urlencode(sorted(params.items()))
-                signature = hmac.new(api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-                params["signature"] = signature
+                query_string = f"timestamp={timestamp}"
+                signature = sign_hmac(api_secret, query_string.encode('utf-8'))
                 headers = {"X-MBX-APIKEY": api_key}
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('binance').get(f"{url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if 'code' in data and data['code'] != 200:
                     logger.error(f"Ошибка валидации API-ключа для Binance: {data['msg']}")
                     raise ValueError(f"Invalid API key: {data['msg']}")
@@ -180,17 +469,17 @@ class ExchangeAPI:
                 method = "GET"
                 request_path = "/api/v5/account/balance"
                 body = ""
-                sign_str = timestamp + method + request_path + body
-                signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+                sign_str = f"{timestamp}{method}{request_path}{body}".encode('utf-8')
+                signature = sign_hmac(api_secret, sign_str)
                 headers = {
                     "OK-ACCESS-KEY": api_key,
                     "OK-ACCESS-SIGN": signature,
                     "OK-ACCESS-TIMESTAMP": timestamp,
                     "OK-ACCESS-PASSPHRASE": ""
                 }
-                response = requests.get(url, headers=headers, timeout=10)
+                response = get_session('okx').get(url, headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] != '0':
                     logger.error(f"Ошибка валидации API-ключа для OKX: {data['msg']}")
                     raise ValueError(f"Invalid API key: {data['msg']}")
@@ -221,8 +510,8 @@ class ExchangeAPI:
             url = "https://api.bybit.com/v5/user/query-api"
             timestamp = str(get_bybit_server_time())
             recv_window = "5000"
-            sign_str = timestamp + api_key + recv_window
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            sign_str = f"{timestamp}{api_key}{recv_window}".encode('utf-8')
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "X-BAPI-API-KEY": api_key,
                 "X-BAPI-TIMESTAMP": timestamp,
@@ -230,9 +519,9 @@ class ExchangeAPI:
                 "X-BAPI-SIGN": signature
             }
             try:
-                response = requests.get(url, headers=headers, timeout=10)
+                response = get_session('bybit').get(url, headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     permissions = data['result'].get('permissions', {})
                     if 'Withdraw' in permissions.get('Spot', []) or 'Withdraw' in permissions.get('Contract', []):
@@ -276,10 +565,9 @@ class ExchangeAPI:
             url = "https://api.bybit.com/v5/account/wallet-balance"
             timestamp = str(get_bybit_server_time())
             recv_window = "5000"
-            params = {"accountType": "UNIFIED" if category == 'futures' else "SPOT"}
-            query_string = urlencode(sorted(params.items()))
-            sign_str = timestamp + api_key + recv_window + query_string
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            query_string = f"accountType={'UNIFIED' if category == 'futures' else 'SPOT'}"
+            sign_str = f"{timestamp}{api_key}{recv_window}{query_string}".encode('utf-8')
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "X-BAPI-API-KEY": api_key,
                 "X-BAPI-TIMESTAMP": timestamp,
@@ -287,9 +575,9 @@ class ExchangeAPI:
                 "X-BAPI-SIGN": signature,
             }
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('bybit').get(f"{url}?{query_string}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     account_info = data['result']['list'][0]
                     total_available = safe_float(account_info.get('totalAvailableBalance', "0"))
@@ -319,15 +607,13 @@ class ExchangeAPI:
         elif exchange == 'binance':
             url = "https://api.binance.com/api/v3/account" if category == 'spot' else "https://fapi.binance.com/fapi/v2/account"
             timestamp = str(int(time.time() * 1000))
-            params = {"timestamp": timestamp}
-            query_string = urlencode(sorted(params.items()))
-            signature = hmac.new(api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-            params["signature"] = signature
+            query_string = f"timestamp={timestamp}"
+            signature = sign_hmac(api_secret, query_string.encode('utf-8'))
             headers = {"X-MBX-APIKEY": api_key}
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('binance').get(f"{url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if category == 'spot':
                     balances = {
                         item['asset']: {
@@ -365,8 +651,8 @@ class ExchangeAPI:
             method = "GET"
             request_path = "/api/v5/account/balance"
             body = ""
-            sign_str = timestamp + method + request_path + body
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            sign_str = f"{timestamp}{method}{request_path}{body}".encode('utf-8')
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "OK-ACCESS-KEY": api_key,
                 "OK-ACCESS-SIGN": signature,
@@ -374,9 +660,9 @@ class ExchangeAPI:
                 "OK-ACCESS-PASSPHRASE": ""
             }
             try:
-                response = requests.get(url, headers=headers, timeout=10)
+                response = get_session('okx').get(url, headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
                     balances = {
                         balance['ccy']: {
@@ -433,70 +719,7 @@ class ExchangeAPI:
             ValueError: Если не удалось создать ордер.
         """
         logger.info(f"Создание ордера на {exchange}: symbol={symbol}, side={side}, qty={qty}, price={price}, category={category}")
-        tick_size = None
-        base_precision = None
-        min_order_qty = None
-        if exchange == 'bybit':
-            url = f"https://api.bybit.com/v5/market/instruments-info?category={'spot' if category == 'spot' else 'linear'}&symbol={symbol}"
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['retCode'] == 0:
-                    instrument = data['result']['list'][0]
-                    lot_size_filter = instrument['lotSizeFilter']
-                    price_filter = instrument['priceFilter']
-                    tick_size = safe_float(price_filter['tickSize'], default=0.0001)
-                    base_precision = safe_float(lot_size_filter['basePrecision'], default=0.001)
-                    min_order_qty = safe_float(lot_size_filter['minOrderQty'], default=0.001)
-                else:
-                    logger.error(f"Не удалось получить информацию о паре на Bybit: {data['retMsg']}")
-                    raise ValueError(f"Не удалось получить информацию: {data['retMsg']}")
-            except requests.RequestException as e:
-                logger.error(f"Ошибка запроса параметров торговой пары на Bybit: {str(e)}")
-                raise ValueError(f"Ошибка запроса: {str(e)}")
-        elif exchange == 'binance':
-            url = "https://api.binance.com/api/v3/exchangeInfo" if category == 'spot' else "https://fapi.binance.com/fapi/v1/exchangeInfo"
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                for s in data['symbols']:
-                    if s['symbol'] == symbol:
-                        for f in s['filters']:
-                            if f['filterType'] == 'PRICE_FILTER':
-                                tick_size = safe_float(f['tickSize'], default=0.0001)
-                            elif f['filterType'] == 'LOT_SIZE':
-                                base_precision = safe_float(f['stepSize'], default=0.001)
-                                min_order_qty = safe_float(f['minQty'], default=0.001)
-                        break
-                else:
-                    logger.error(f"Торговая пара {symbol} не найдена на Binance")
-                    raise ValueError(f"Торговая пара {symbol} не найдена")
-            except requests.RequestException as e:
-                logger.error(f"Ошибка запроса параметров торговой пары на Binance: {str(e)}")
-                raise ValueError(f"Ошибка запроса: {str(e)}")
-        elif exchange == 'okx':
-            inst_type = 'SPOT' if category == 'spot' else 'FUTURES'
-            url = f"https://www.okx.com/api/v5/public/instruments?instType={inst_type}&instId={symbol.replace('/', '-')}"
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data['code'] == '0':
-                    instrument = data['data'][0]
-                    tick_size = safe_float(instrument['tickSz'], default=0.0001)
-                    base_precision = safe_float(instrument['lotSz'], default=0.001)
-                    min_order_qty = safe_float(instrument['minSz'], default=0.001)
-                else:
-                    logger.error(f"Не удалось получить информацию о паре на OKX: {data['msg']}")
-                    raise ValueError(f"Не удалось получить информацию: {data['msg']}")
-            except requests.RequestException as e:
-                logger.error(f"Ошибка запроса параметров торговой пары на OKX: {str(e)}")
-                raise ValueError(f"Ошибка запроса: {str(e)}")
-        else:
-            logger.error(f"Биржа {exchange} не поддерживается")
-            raise ValueError(f"Биржа {exchange} не поддерживается")
+        tick_size, base_precision, min_order_qty = get_instrument_filters(exchange, symbol, category)
 
         # Проверяем и корректируем qty и price
         if base_precision <= 0:
@@ -539,9 +762,9 @@ class ExchangeAPI:
                 order_params["marginMode"] = margin_type.upper()
             if additional_params:
                 order_params.update(additional_params)
-            payload = json.dumps(order_params, separators=(',', ':'), sort_keys=True)
-            sign_str = timestamp + api_key + recv_window + payload
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            payload = orjson.dumps(order_params, option=orjson.OPT_SORT_KEYS)
+            sign_str = f"{timestamp}{api_key}{recv_window}".encode('utf-8') + payload
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "X-BAPI-API-KEY": api_key,
                 "X-BAPI-TIMESTAMP": timestamp,
@@ -550,13 +773,15 @@ class ExchangeAPI:
                 "Content-Type": "application/json"
             }
             try:
-                response = requests.post(url, headers=headers, data=payload, timeout=10)
+                response = get_session('bybit').post(url, headers=headers, data=payload, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     logger.info(f"Ордер успешно создан на Bybit: orderId={data['result']['orderId']}")
                     return data['result']
                 else:
+                    if data['retCode'] == 10002:
+                        reset_bybit_time_offset()
                     logger.error(f"Ошибка создания ордера на Bybit: {data['retMsg']}")
                     raise ValueError(f"Failed to create order: {data['retMsg']}")
             except requests.RequestException as e:
@@ -578,17 +803,11 @@ class ExchangeAPI:
             if leverage and category == 'futures':
                 # Устанавливаем кредитное плечо
                 leverage_url = "https://fapi.binance.com/fapi/v1/leverage"
-                leverage_params = {
-                    "symbol": symbol,
-                    "leverage": leverage,
-                    "timestamp": timestamp
-                }
-                query_string = urlencode(sorted(leverage_params.items()))
-                signature = hmac.new(api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-                leverage_params["signature"] = signature
+                query_string = f"leverage={leverage}&symbol={symbol}&timestamp={timestamp}"
+                signature = sign_hmac(api_secret, query_string.encode('utf-8'))
                 headers = {"X-MBX-APIKEY": api_key}
                 try:
-                    response = requests.post(leverage_url, headers=headers, params=leverage_params, timeout=10)
+                    response = get_session('binance').post(f"{leverage_url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                     response.raise_for_status()
                     logger.info(f"Установлено кредитное плечо {leverage} для {symbol} на Binance")
                 except requests.RequestException as e:
@@ -597,13 +816,13 @@ class ExchangeAPI:
             if additional_params:
                 params.update(additional_params)
             query_string = urlencode(sorted(params.items()))
-            signature = hmac.new(api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
+            signature = sign_hmac(api_secret, query_string.encode('utf-8'))
             params["signature"] = signature
             headers = {"X-MBX-APIKEY": api_key}
             try:
-                response = requests.post(url, headers=headers, params=params, timeout=10)
+                response = get_session('binance').post(url, headers=headers, params=params, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 logger.info(f"Ордер успешно создан на Binance: orderId={data['orderId']}")
                 return {"orderId": str(data["orderId"])}
             except requests.RequestException as e:
@@ -627,9 +846,9 @@ class ExchangeAPI:
                 order_params["lever"] = str(leverage)
             if additional_params:
                 order_params.update(additional_params)
-            body = json.dumps(order_params)
-            sign_str = timestamp + method + request_path + body
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            body = orjson.dumps(order_params)
+            sign_str = f"{timestamp}{method}{request_path}".encode('utf-8') + body
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "OK-ACCESS-KEY": api_key,
                 "OK-ACCESS-SIGN": signature,
@@ -638,9 +857,9 @@ class ExchangeAPI:
                 "Content-Type": "application/json"
             }
             try:
-                response = requests.post(url, headers=headers, data=body, timeout=10)
+                response = get_session('okx').post(url, headers=headers, data=body, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
                     logger.info(f"Ордер успешно создан на OKX: ordId={data['data'][0]['ordId']}")
                     return {"orderId": data['data'][0]['ordId']}
@@ -654,6 +873,284 @@ class ExchangeAPI:
             logger.error(f"Биржа {exchange} не поддерживается")
             raise NotImplementedError(f"Exchange {exchange} not supported")
 
+    @staticmethod
+    @sleep_and_retry
+    @limits(calls=10, period=1)
+    def create_orders_batch(exchange, api_key, api_secret, symbol, orders, category="spot", margin_type=None):
+        """
+        Создаёт несколько лимитных ордеров пакетными запросами.
+
+        Используются пакетные эндпоинты: Bybit /v5/order/create-batch (до 10 ордеров),
+        Binance Futures /fapi/v1/batchOrders (до 5), OKX /api/v5/trade/batch-orders (до 20).
+        У спота Binance пакетного эндпоинта нет.
+
+        Args:
+            exchange (str): Название биржи ('bybit', 'binance', 'okx').
+            api_key (str): API-ключ.
+            api_secret (str): Секретный ключ.
+            symbol (str): Торговая пара (например, 'BTCUSDT'); для OKX — instId ('BTC-USDT', 'BTC-USDT-SWAP').
+            orders (list): Ордера в виде словарей с ключами 'side', 'qty', 'price'; цена и объём уже округлены.
+            category (str): Категория ('spot' или 'linear').
+            margin_type (str, optional): Тип маржи для фьючерсов OKX ('isolated' или 'cross').
+
+        Returns:
+            list: Для каждого ордера {'orderId': ...} или None, если биржа отклонила этот ордер
+                или запрос его пакета не выполнен (ID ордеров из успешных пакетов сохраняются);
+                None целиком, если пакетное размещение для биржи и категории не поддерживается.
+        """
+        def fmt(value):
+            return "{:.8f}".format(value).rstrip('0').rstrip('.')
+
+        if exchange == 'binance' and category == 'spot':
+            return None
+        logger.info(f"Пакетное создание {len(orders)} ордеров на {exchange}: symbol={symbol}, category={category}")
+        # Ошибка пакета помечает неразмещёнными только его ордера: ордера прошлых пакетов уже на бирже,
+        # и их ID нужны стратегии для отслеживания и отмены
+        results = []
+        if exchange == 'bybit':
+            url = "https://api.bybit.com/v5/order/create-batch"
+            recv_window = "5000"
+            for start in range(0, len(orders), 10):
+                chunk = orders[start:start + 10]
+                payload = orjson.dumps({
+                    "category": category,
+                    "request": [{
+                        "symbol": symbol,
+                        "side": order['side'].capitalize(),
+                        "orderType": "Limit",
+                        "qty": fmt(order['qty']),
+                        "price": fmt(order['price']),
+                        "timeInForce": "GTC",
+                    } for order in chunk],
+                })
+                timestamp = str(get_bybit_server_time())
+                sign_str = f"{timestamp}{api_key}{recv_window}".encode('utf-8') + payload
+                signature = sign_hmac(api_secret, sign_str)
+                headers = {
+                    "X-BAPI-API-KEY": api_key,
+                    "X-BAPI-TIMESTAMP": timestamp,
+                    "X-BAPI-RECV-WINDOW": recv_window,
+                    "X-BAPI-SIGN": signature,
+                    "Content-Type": "application/json"
+                }
+                try:
+                    response = get_session('bybit').post(url, headers=headers, data=payload, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетного создания ордеров на Bybit: {str(e)}")
+                    results.extend([None] * len(chunk))
+                    continue
+                if data['retCode'] != 0:
+                    logger.error(f"Ошибка пакетного создания ордеров на Bybit: {data['retMsg']}")
+                    results.extend([None] * len(chunk))
+                    continue
+                statuses = data.get('retExtInfo', {}).get('list', [])
+                for i, item in enumerate(data['result']['list']):
+                    status = statuses[i] if i < len(statuses) else {'code': 0}
+                    if status.get('code') == 0 and item.get('orderId'):
+                        results.append({"orderId": item['orderId']})
+                    else:
+                        logger.error(f"Ордер отклонён Bybit в пакете: {status.get('msg')}")
+                        results.append(None)
+        elif exchange == 'binance':
+            url = "https://fapi.binance.com/fapi/v1/batchOrders"
+            headers = {"X-MBX-APIKEY": api_key}
+            for start in range(0, len(orders), 5):
+                chunk = orders[start:start + 5]
+                batch = orjson.dumps([{
+                    "symbol": symbol,
+                    "side": order['side'].upper(),
+                    "type": "LIMIT",
+                    "quantity": fmt(order['qty']),
+                    "price": fmt(order['price']),
+                    "timeInForce": "GTC",
+                } for order in chunk]).decode()
+                params = [("batchOrders", batch), ("timestamp", str(int(time.time() * 1000)))]
+                signature = sign_hmac(api_secret, urlencode(params).encode('utf-8'))
+                params.append(("signature", signature))
+                try:
+                    response = get_session('binance').post(url, headers=headers, params=params, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетного создания ордеров на Binance: {str(e)}")
+                    results.extend([None] * len(chunk))
+                    continue
+                for item in data:
+                    if 'orderId' in item:
+                        results.append({"orderId": str(item['orderId'])})
+                    else:
+                        logger.error(f"Ордер отклонён Binance в пакете: {item.get('msg')}")
+                        results.append(None)
+        elif exchange == 'okx':
+            url = "https://www.okx.com/api/v5/trade/batch-orders"
+            request_path = "/api/v5/trade/batch-orders"
+            for start in range(0, len(orders), 20):
+                chunk = orders[start:start + 20]
+                body = orjson.dumps([{
+                    "instId": symbol,
+                    "tdMode": "cash" if category == 'spot' else ("isolated" if margin_type == 'isolated' else "cross"),
+                    "side": order['side'],
+                    "ordType": "limit",
+                    "sz": fmt(order['qty']),
+                    "px": fmt(order['price']),
+                } for order in chunk])
+                timestamp = str(int(time.time()))
+                sign_str = f"{timestamp}POST{request_path}".encode('utf-8') + body
+                signature = sign_hmac(api_secret, sign_str)
+                headers = {
+                    "OK-ACCESS-KEY": api_key,
+                    "OK-ACCESS-SIGN": signature,
+                    "OK-ACCESS-TIMESTAMP": timestamp,
+                    "OK-ACCESS-PASSPHRASE": "",
+                    "Content-Type": "application/json"
+                }
+                try:
+                    response = get_session('okx').post(url, headers=headers, data=body, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетного создания ордеров на OKX: {str(e)}")
+                    results.extend([None] * len(chunk))
+                    continue
+                # Код 1 означает частичный успех: статус каждого ордера в sCode
+                if data['code'] not in ('0', '1', '2'):
+                    logger.error(f"Ошибка пакетного создания ордеров на OKX: {data['msg']}")
+                    results.extend([None] * len(chunk))
+                    continue
+                for item in data['data']:
+                    if item.get('sCode') == '0':
+                        results.append({"orderId": item['ordId']})
+                    else:
+                        logger.error(f"Ордер отклонён OKX в пакете: {item.get('sMsg')}")
+                        results.append(None)
+        else:
+            logger.error(f"Биржа {exchange} не поддерживается")
+            raise NotImplementedError(f"Exchange {exchange} not supported")
+        return results
+
+    @staticmethod
+    @sleep_and_retry
+    @limits(calls=10, period=1)
+    def cancel_orders_batch(exchange, api_key, api_secret, symbol, order_ids, category="spot"):
+        """
+        Отменяет несколько ордеров пакетными запросами по их ID.
+
+        Используются пакетные эндпоинты: Bybit /v5/order/cancel-batch (до 10 ордеров),
+        Binance Futures /fapi/v1/batchOrders (до 10), OKX /api/v5/trade/cancel-batch-orders (до 20).
+        Эндпоинты «отменить всё по символу» не используются: они затронули бы ордера других ботов
+        с тем же ключом и парой. У спота Binance пакетной отмены по ID нет.
+
+        Args:
+            exchange (str): Название биржи ('bybit', 'binance', 'okx').
+            api_key (str): API-ключ.
+            api_secret (str): Секретный ключ.
+            symbol (str): Торговая пара (например, 'BTCUSDT'); для OKX — instId ('BTC-USDT', 'BTC-USDT-SWAP').
+            order_ids (list): ID ордеров.
+            category (str): Категория ('spot' или 'linear').
+
+        Returns:
+            set: ID отменённых ордеров; None, если пакетная отмена для биржи и категории не поддерживается.
+
+        Raises:
+            ValueError: Если запрос к бирже не выполнен.
+        """
+        if exchange == 'binance' and category == 'spot':
+            return None
+        logger.info(f"Пакетная отмена {len(order_ids)} ордеров на {exchange}: symbol={symbol}, category={category}")
+        cancelled = set()
+        if exchange == 'bybit':
+            url = "https://api.bybit.com/v5/order/cancel-batch"
+            recv_window = "5000"
+            for start in range(0, len(order_ids), 10):
+                payload = orjson.dumps({
+                    "category": category,
+                    "request": [{"symbol": symbol, "orderId": order_id} for order_id in order_ids[start:start + 10]],
+                })
+                timestamp = str(get_bybit_server_time())
+                sign_str = f"{timestamp}{api_key}{recv_window}".encode('utf-8') + payload
+                signature = sign_hmac(api_secret, sign_str)
+                headers = {
+                    "X-BAPI-API-KEY": api_key,
+                    "X-BAPI-TIMESTAMP": timestamp,
+                    "X-BAPI-RECV-WINDOW": recv_window,
+                    "X-BAPI-SIGN": signature,
+                    "Content-Type": "application/json"
+                }
+                try:
+                    response = get_session('bybit').post(url, headers=headers, data=payload, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетной отмены ордеров на Bybit: {str(e)}")
+                    raise ValueError(f"Failed to cancel orders on Bybit: {str(e)}")
+                if data['retCode'] != 0:
+                    logger.error(f"Ошибка пакетной отмены ордеров на Bybit: {data['retMsg']}")
+                    raise ValueError(f"Failed to cancel orders: {data['retMsg']}")
+                statuses = data.get('retExtInfo', {}).get('list', [])
+                for i, item in enumerate(data['result']['list']):
+                    status = statuses[i] if i < len(statuses) else {'code': 0}
+                    if status.get('code') == 0 and item.get('orderId'):
+                        cancelled.add(item['orderId'])
+                    else:
+                        logger.error(f"Отмена ордера отклонена Bybit в пакете: {status.get('msg')}")
+        elif exchange == 'binance':
+            url = "https://fapi.binance.com/fapi/v1/batchOrders"
+            headers = {"X-MBX-APIKEY": api_key}
+            for start in range(0, len(order_ids), 10):
+                id_list = orjson.dumps([int(order_id) for order_id in order_ids[start:start + 10]]).decode()
+                params = [("symbol", symbol), ("orderIdList", id_list), ("timestamp", str(int(time.time() * 1000)))]
+                signature = sign_hmac(api_secret, urlencode(params).encode('utf-8'))
+                params.append(("signature", signature))
+                try:
+                    response = get_session('binance').delete(url, headers=headers, params=params, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетной отмены ордеров на Binance: {str(e)}")
+                    raise ValueError(f"Failed to cancel orders on Binance: {str(e)}")
+                for item in data:
+                    if 'orderId' in item:
+                        cancelled.add(str(item['orderId']))
+                    else:
+                        logger.error(f"Отмена ордера отклонена Binance в пакете: {item.get('msg')}")
+        elif exchange == 'okx':
+            url = "https://www.okx.com/api/v5/trade/cancel-batch-orders"
+            request_path = "/api/v5/trade/cancel-batch-orders"
+            for start in range(0, len(order_ids), 20):
+                body = orjson.dumps([{"instId": symbol, "ordId": order_id} for order_id in order_ids[start:start + 20]])
+                timestamp = str(int(time.time()))
+                sign_str = f"{timestamp}POST{request_path}".encode('utf-8') + body
+                signature = sign_hmac(api_secret, sign_str)
+                headers = {
+                    "OK-ACCESS-KEY": api_key,
+                    "OK-ACCESS-SIGN": signature,
+                    "OK-ACCESS-TIMESTAMP": timestamp,
+                    "OK-ACCESS-PASSPHRASE": "",
+                    "Content-Type": "application/json"
+                }
+                try:
+                    response = get_session('okx').post(url, headers=headers, data=body, timeout=10)
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                except requests.RequestException as e:
+                    logger.error(f"Ошибка запроса пакетной отмены ордеров на OKX: {str(e)}")
+                    raise ValueError(f"Failed to cancel orders on OKX: {str(e)}")
+                # Код 1 означает частичный успех: статус каждого ордера в sCode
+                if data['code'] not in ('0', '1', '2'):
+                    logger.error(f"Ошибка пакетной отмены ордеров на OKX: {data['msg']}")
+                    raise ValueError(f"Failed to cancel orders: {data['msg']}")
+                for item in data['data']:
+                    if item.get('sCode') == '0':
+                        cancelled.add(item['ordId'])
+                    else:
+                        logger.error(f"Отмена ордера отклонена OKX в пакете: {item.get('sMsg')}")
+        else:
+            logger.error(f"Биржа {exchange} не поддерживается")
+            raise NotImplementedError(f"Exchange {exchange} not supported")
+        return cancelled
+
     @staticmethod
     @sleep_and_retry
     @limits(calls=10, period=1)
@@ -679,10 +1176,9 @@ class ExchangeAPI:
             url = "https://api.bybit.com/v5/order/history"
             timestamp = str(get_bybit_server_time())
             recv_window = "5000"
-            params = {"category": category, "symbol": symbol}
-            query_string = urlencode(sorted(params.items()))
-            sign_str = timestamp + api_key + recv_window + query_string
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            query_string = f"category={category}&symbol={symbol}"
+            sign_str = f"{timestamp}{api_key}{recv_window}{query_string}".encode('utf-8')
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "X-BAPI-API-KEY": api_key,
                 "X-BAPI-TIMESTAMP": timestamp,
@@ -690,9 +1186,9 @@ class ExchangeAPI:
                 "X-BAPI-SIGN": signature,
             }
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('bybit').get(f"{url}?{query_string}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     logger.debug(f"Получена история ордеров для Bybit: {len(data['result']['list'])} записей")
                     return data['result']['list']
@@ -705,15 +1201,13 @@ class ExchangeAPI:
         elif exchange == 'binance':
             url = "https://api.binance.com/api/v3/allOrders" if category == 'spot' else "https://fapi.binance.com/fapi/v1/allOrders"
             timestamp = str(int(time.time() * 1000))
-            params = {"symbol": symbol, "timestamp": timestamp}
-            query_string = urlencode(sorted(params.items()))
-            signature = hmac.new(api_secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-            params["signature"] = signature
+            query_string = f"symbol={symbol}&timestamp={timestamp}"
+            signature = sign_hmac(api_secret, query_string.encode('utf-8'))
             headers = {"X-MBX-APIKEY": api_key}
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('binance').get(f"{url}?{query_string}&signature={signature}", headers=headers, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 logger.debug(f"Получена история ордеров для Binance: {len(data)} записей")
                 return data
             except requests.RequestException as e:
@@ -725,8 +1219,8 @@ class ExchangeAPI:
             method = "GET"
             request_path = f"/api/v5/trade/orders-history?instType={'SPOT' if category == 'spot' else 'FUTURES'}"
             body = ""
-            sign_str = timestamp + method + request_path + body
-            signature = hmac.new(api_secret.encode('utf-8'), sign_str.encode('utf-8'), hashlib.sha256).hexdigest()
+            sign_str = f"{timestamp}{method}{request_path}{body}".encode('utf-8')
+            signature = sign_hmac(api_secret, sign_str)
             headers = {
                 "OK-ACCESS-KEY": api_key,
                 "OK-ACCESS-SIGN": signature,
@@ -735,9 +1229,9 @@ class ExchangeAPI:
             }
             params = {"instType": "SPOT" if category == 'spot' else "FUTURES"}
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = get_session('okx').get(url, headers=headers, params=params, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
                     orders = [order for order in data['data'] if order['instId'] == symbol.replace('/', '-')]
                     logger.debug(f"Получена история ордеров для OKX: {len(orders)} записей")
@@ -790,9 +1284,9 @@ class ExchangeAPI:
         if exchange == 'bybit':
             url = f"https://api.bybit.com/v5/market/kline?category={'spot' if category == 'spot' else 'linear'}&symbol={symbol}&interval={api_interval}&limit={limit}"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('bybit').get(url, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['retCode'] == 0:
                     klines = data['result']['list']
                     logger.debug(f"Получено {len(klines)} свечей для Bybit ({category})")
@@ -813,9 +1307,9 @@ class ExchangeAPI:
             binance_interval = binance_interval_map.get(api_interval, api_interval)
             url = f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval={binance_interval}&limit={limit}" if category == 'spot' else f"https://fapi.binance.com/fapi/v1/klines?symbol={symbol}&interval={binance_interval}&limit={limit}"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('binance').get(url, timeout=10)
                 response.raise_for_status()
-                klines = response.json()
+                klines = orjson.loads(response.content)
                 logger.debug(f"Получено {len(klines)} свечей для Binance ({category})")
                 return klines
             except requests.RequestException as e:
@@ -831,9 +1325,9 @@ class ExchangeAPI:
             okx_interval = okx_interval_map.get(api_interval, api_interval)
             url = f"https://www.okx.com/api/v5/market/candles?instId={symbol.replace('/', '-')}&bar={okx_interval}&limit={limit}"
             try:
-                response = requests.get(url, timeout=10)
+                response = get_session('okx').get(url, timeout=10)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data['code'] == '0':
                     klines = data['data']
                     logger.debug(f"Получено {len(klines)} свечей для OKX ({category})")
@@ -846,4 +1340,4 @@ class ExchangeAPI:
                 raise ValueError(f"Failed to fetch klines from OKX: {str(e)}")
         else:
             logger.error(f"Биржа {exchange} не поддерживается")
-            raise NotImplementedError(f"Exchange {exchange} not supported")
\ No newline at end of file
+            raise NotImplementedError(f"Exchange {exchange} not supported")
@@ -0,0 +1,145 @@
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def user(django_db_setup, django_db_blocker):
+    """
+    Тестовый пользователь, общий для всей сессии.
+    """
+    from django.contrib.auth import get_user_model
+    with django_db_blocker.unblock():
+        return get_user_model().objects.create_user(username='testuser', password='testpass')
+
+
+@pytest.fixture(scope="session")
+def api_key(user, django_db_blocker):
+    """
+    API-ключ Bybit тестового пользователя, общий для всей сессии.
+    """
+    from bots.models import APIKey
+    with django_db_blocker.unblock():
+        return APIKey.objects.create(
+            user=user,
+            exchange='bybit',
+            api_key='test_api_key',
+            api_secret='test_api_secret'
+        )
+
+
+@pytest.fixture(scope="session")
+def bot_settings_kwargs():
+    """
+    Настройки бота RSI для тестов, общие для сессии и доступные только для чтения:
+    тесты строят свои данные распаковкой {**bot_settings_kwargs, ...}.
+    """
+    return MappingProxyType(dict(
+        signal_type='rsi',
+        signal_params={'period': 14, 'threshold': 30},
+        signal_interval='1h',
+        take_profit=2.0,
+        grid_orders=5,
+        grid_spacing=1.0,
+        grid_overlap=20.0,
+        martingale=1.5,
+        logarithmic_distribution=False,
+        partial_grid=False,
+        grid_follow=False,
+        stop_after_deals=False
+    ))
+
+
+def _create_bot(user, api_key, bot_settings_kwargs):
+    """
+    Создаёт активный бот order_grid с настройками RSI и возвращает его со связанными объектами.
+    """
+    from bots.models import Bot, BotSettings
+    # Настройки и позиция создаются сигналом post_save; запись в журнал из сигнала не нужна
+    with patch('bots.tasks.log_action.delay'):
+        bot = Bot.objects.create(
+            user=user,
+            name='Test Bot',
+            api_key=api_key,
+            trading_pair='BTCUSDT',
+            deposit=1000,
+            trade_mode='order_grid',
+            additional_settings={'base_quantity': 0.1},
+            status='active',
+            is_running=True
+        )
+    BotSettings.objects.filter(bot=bot).update(**bot_settings_kwargs)
+    return Bot.objects.select_related('api_key', 'settings', 'user').get(pk=bot.pk)
+
+
+@pytest.fixture
+def bot(db, user, api_key, bot_settings_kwargs):
+    """
+    Активный бот order_grid с настройками RSI; создаётся заново для каждого теста и откатывается после него.
+    """
+    return _create_bot(user, api_key, bot_settings_kwargs)
+
+
+@pytest.fixture(scope="module")
+def module_bot(django_db_setup, django_db_blocker, user, api_key, bot_settings_kwargs):
+    """
+    Бот, общий для тестов модуля, которые не изменяют его в БД; удаляется после модуля.
+    """
+    with django_db_blocker.unblock():
+        bot = _create_bot(user, api_key, bot_settings_kwargs)
+    yield bot
+    with django_db_blocker.unblock(), patch('bots.tasks.log_action.delay'):
+        bot.delete()
+
+
+@pytest.fixture(scope="session")
+def authed_client(user):
+    """
+    APIClient, аутентифицированный тестовым пользователем один раз на сессию.
+    Между тестами очищаются только cookies, состояние аутентификации сохраняется.
+    """
+    from rest_framework.test import APIClient
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def api_client(authed_client):
+    """
+    Аутентифицированный API-клиент сессии без cookies предыдущего теста.
+    """
+    yield authed_client
+    authed_client.cookies.clear()
+
+
+@pytest.fixture(scope="session")
+def api_request(user):
+    """
+    Запрос тестового пользователя для контекста сериализаторов; строится один раз, без прохода через клиент.
+    """
+    from rest_framework.test import APIRequestFactory
+    request = APIRequestFactory().get('/')
+    request.user = user
+    return request
+
+
+@pytest.fixture(scope="module")
+def shared_strategy(module_bot, django_db_blocker):
+    """
+    Стратегия бота модуля; строится один раз на модуль.
+    """
+    from bots.strategies import TradingStrategy
+    with django_db_blocker.unblock():
+        return TradingStrategy(module_bot)
+
+
+@pytest.fixture
+def strategy(shared_strategy):
+    """
+    Стратегия модуля со сброшенными данными прошлого теста (свечи, параметры инструмента, объёмы сетки).
+    Доступ к БД фикстура не открывает: он нужен только тестам с маркером django_db.
+    """
+    shared_strategy._reset_tick_cache()
+    return shared_strategy
@@ -265,7 +265,26 @@ CELERY_TASK_QUEUES = {
 # Назначение задач в очереди
 CELERY_TASK_ROUTES = {
     'bots.tasks.run_trading_strategy': {'queue': 'trading'},
+    'bots.tasks.run_trading_strategies_batch': {'queue': 'trading'},
+    'bots.tasks.dispatch_trading_batches': {'queue': 'trading'},
     'bots.tasks.log_action': {'queue': 'logging'},
+    'bots.tasks.flush_log_entries': {'queue': 'logging'},
+    'bots.strategies.stop_bot': {'queue': 'trading'},
+}
+
+# Периодический перенос буфера журнала (log_action) в БД
+LOG_BUFFER_ENABLED = True
+LOG_FLUSH_BATCH_SIZE = 500
+CELERY_BEAT_SCHEDULE = {
+    'flush-log-entries': {
+        'task': 'bots.tasks.flush_log_entries',
+        'schedule': 5.0,
+    },
+    # Пакетный режим итераций ботов (STRATEGY_BATCH_ENABLED); при выключенном режиме задача сразу завершается
+    'dispatch-trading-batches': {
+        'task': 'bots.tasks.dispatch_trading_batches',
+        'schedule': 60.0,
+    },
 }
 
 # Логирование
@@ -0,0 +1,37 @@
+# core/test_settings.py
+"""
+Настройки для запуска тестов: всё как в core.settings, но БД — SQLite в памяти,
+кэш в памяти процесса, задачи Celery выполняются сразу без брокера и быстрый хешер паролей.
+Тестам не нужен ни сервер БД, ни Redis.
+"""
+from .settings import *  # noqa: F401,F403
+
+# Тестовые объекты создаются без fsync и сетевых запросов к серверу БД
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Кэш своего процесса (у каждого воркера xdist свой): тесты не читают и не очищают Redis разработчика
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+    }
+}
+
+# Буфер журнала живёт в Redis; в тестах записи сразу идут в БД
+LOG_BUFFER_ENABLED = False
+
+# Задачи выполняются синхронно в процессе теста, брокер в памяти
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
+# PBKDF2 намеренно медленный; для тестовых пользователей достаточно MD5
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]